@@ -0,0 +1,26 @@
+"""add store voice interruptions setting
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("stores", sa.Column("voice_allow_interruptions", sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("stores", "voice_allow_interruptions")
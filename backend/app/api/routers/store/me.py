@@ -33,6 +33,7 @@ def me(current_store: Store = Depends(get_current_store_web)) -> StoreOut:
         allow_pickup=current_store.allow_pickup,
         allow_delivery=current_store.allow_delivery,
         min_order_amount=current_store.min_order_amount,
+        voice_allow_interruptions=current_store.voice_allow_interruptions,
         email=current_store.email,
         created_at=current_store.created_at,
     )
@@ -66,6 +67,7 @@ def update_me(
         allow_pickup=current_store.allow_pickup,
         allow_delivery=current_store.allow_delivery,
         min_order_amount=current_store.min_order_amount,
+        voice_allow_interruptions=current_store.voice_allow_interruptions,
         email=current_store.email,
         created_at=current_store.created_at,
     )
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import secrets
+
+from fastapi import APIRouter, Depends, Header
+
+from app.core.config import settings
+from app.core.errors import AppError
+from app.voice.drain import get_voice_drain
+
+
+def require_voice_admin(x_voice_admin_token: str | None = Header(default=None)) -> None:
+    expected = settings.voice_admin_token
+    if not expected or x_voice_admin_token is None or not secrets.compare_digest(x_voice_admin_token, expected):
+        raise AppError(status_code=403, code="forbidden", detail="Voice admin token required")
+
+
+router = APIRouter(prefix="/voice/admin", tags=["voice-admin"], dependencies=[Depends(require_voice_admin)])
+
+
+@router.post("/drain")
+async def start_drain() -> dict:
+    """Stop admitting voice sessions and drain the active ones (e.g. from a preStop hook)."""
+
+    drain = get_voice_drain()
+    drain.start()
+    return drain.status()
+
+
+@router.get("/drain")
+def drain_status() -> dict:
+    return get_voice_drain().status()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import uuid
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.routers.voice.admin import require_voice_admin
+
+from app.voice.cart import get_draft_cart_store
+from app.voice.context_window import context_window_stats
+from app.voice.db_executor import get_voice_db_executor
+from app.voice.endpointing import endpointing_stats
+from app.voice.fast_path import fast_path_stats
+from app.voice.interruptions import interruption_stats
+from app.voice.latency import turn_latency_stats
+from app.voice.llm_scheduler import get_llm_scheduler
+from app.voice.pool import get_voice_pipeline_pool
+from app.voice.resume import get_session_registry
+from app.voice.supervisor import get_session_supervisor
+from app.voice.tool_results import tool_result_stats
+from app.voice.transports import transport_guard_stats
+from app.voice.tts_cache import get_tts_phrase_cache
+from app.voice.vad import vad_stats
+from app.voice.workers import get_voice_worker_pool
+
+router = APIRouter(prefix="/voice/metrics", tags=["voice-metrics"], dependencies=[Depends(require_voice_admin)])
+
+
+@router.get("")
+async def voice_metrics() -> dict:
+    workers = get_voice_worker_pool()
+    if workers is not None:
+        return {"workers": await workers.collect("/voice/metrics")}
+    return {
+        "sessions": get_session_supervisor().stats(),
+        "resume": get_session_registry().stats(),
+        "guards": transport_guard_stats.as_dict(),
+        "pool": get_voice_pipeline_pool().stats().as_dict(),
+        "vad": vad_stats(),
+        "tts_cache": get_tts_phrase_cache().stats(),
+        "fast_path": fast_path_stats.as_dict(),
+        "db": get_voice_db_executor().stats(),
+        "carts": get_draft_cart_store().stats(),
+        "tool_results": tool_result_stats.as_dict(),
+        "context": context_window_stats.as_dict(),
+        "llm": get_llm_scheduler().stats(),
+        "interruptions": interruption_stats.as_dict(),
+        "endpointing": endpointing_stats.as_dict(),
+    }
+
+
+@router.get("/latency")
+async def voice_latency(store_id: uuid.UUID | None = Query(default=None)) -> dict:
+    """p50/p95/p99 per turn stage (ms), per store; `total` is time to first audio."""
+
+    workers = get_voice_worker_pool()
+    if workers is not None:
+        params = {"store_id": str(store_id)} if store_id is not None else None
+        return {"workers": await workers.collect("/voice/metrics/latency", params)}
+    return turn_latency_stats.as_dict(store_id)
@@ -112,7 +112,6 @@ def add_order_item(
         raise AppError(status_code=404, code="menu_item_not_found", detail="Menu item not found")
 
     item = order_service.create_order_item(db, order=order, menu_item=menu_item, quantity=payload.quantity)
-    order_service.recalc_totals(db, order=order)
     db.commit()
     db.refresh(item)
     return _order_item_out(item)
@@ -134,7 +133,6 @@ def remove_order_item(
         raise AppError(status_code=409, code="order_not_editable", detail="Order is not editable")
 
     order_service.remove_order_item(db, order=order, item_id=item_id)
-    order_service.recalc_totals(db, order=order)
     db.commit()
     return {"status": "ok"}
 
@@ -154,7 +152,6 @@ def finalize_order(
         raise AppError(status_code=409, code="order_not_editable", detail="Order is not editable")
 
     order.status = "submitted"
-    order_service.recalc_totals(db, order=order)
     db.commit()
     db.refresh(order)
     return _order_out(order)
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-import asyncio
 import uuid
 
+import httpx
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
@@ -10,16 +10,8 @@ from sqlalchemy.orm import Session
 from app.core.errors import AppError
 from app.db.session import get_db
 from app.models.user import User
-from app.voice import (
-    GEMINI_VOICE_TOOLS_SCHEMA,
-    VoiceToolContext,
-    build_system_prompt,
-    create_voice_pipeline_task,
-    create_voice_tool_handlers,
-    load_google_voice_config,
-    load_voice_runtime_config,
-)
-from app.voice.transports.daily import create_daily_transport
+from app.voice.session_runner import start_daily_session
+from app.voice.workers import get_voice_worker_pool
 
 try:
     from pipecat.pipeline.runner import PipelineRunner
@@ -39,7 +31,7 @@ class DailyStartRequest(BaseModel):
 
 @router.post("/daily/start")
 async def start_daily_call(payload: DailyStartRequest, db: Session = Depends(get_db)) -> dict:
-    if PipelineRunner is None:
+    if PipelineRunner is None and get_voice_worker_pool() is None:
         raise AppError(status_code=501, code="voice_unavailable", detail="Voice pipeline not available")
 
     user: User | None = None
@@ -47,30 +39,24 @@ async def start_daily_call(payload: DailyStartRequest, db: Session = Depends(get
         user = db.get(User, payload.user_id)
         if user is None or not user.is_active:
             raise AppError(status_code=404, code="user_not_found", detail="User not found")
-
-    runtime = load_voice_runtime_config()
-    google_config = load_google_voice_config()
-    system_prompt = build_system_prompt()
-
-    tool_context = VoiceToolContext(
-        db=db,
+    # Authentication only: the call opens its own short-lived DB sessions.
+    db.close()
+
+    workers = get_voice_worker_pool()
+    if workers is not None:
+        # Signalling only: the worker process joins the room and runs the call.
+        worker = workers.shard(store_id=payload.store_id, order_id=payload.order_id)
+        try:
+            await workers.start_daily_call(payload.model_dump(mode="json"), worker=worker)
+        except (httpx.HTTPError, OSError):
+            raise AppError(status_code=503, code="voice_unavailable", detail="Voice worker unavailable")
+        return {"status": "starting"}
+
+    await start_daily_session(
+        room_url=payload.room_url,
+        token=payload.token,
         store_id=payload.store_id,
         user_id=user.id if user else None,
         order_id=payload.order_id,
-        channel="phone",
     )
-    tool_handlers = create_voice_tool_handlers(tool_context)
-
-    transport = create_daily_transport(room_url=payload.room_url, token=payload.token)
-    task = create_voice_pipeline_task(
-        transport=transport,
-        runtime=runtime,
-        google_config=google_config,
-        system_prompt=system_prompt,
-        tool_schema=GEMINI_VOICE_TOOLS_SCHEMA,
-        tool_handlers=tool_handlers,
-    )
-
-    runner = PipelineRunner()
-    asyncio.create_task(runner.run(task))
     return {"status": "starting"}
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import uuid
 
-from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, Query, WebSocket
 from sqlalchemy.orm import Session
 
 from app.api.host_policy import get_host_policy
@@ -11,16 +11,8 @@ from app.core.security import decode_access_token
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.common import Audience, PrincipalType
-from app.voice import (
-    GEMINI_VOICE_TOOLS_SCHEMA,
-    VoiceToolContext,
-    build_system_prompt,
-    create_voice_pipeline_task,
-    create_voice_tool_handlers,
-    load_google_voice_config,
-    load_voice_runtime_config,
-)
-from app.voice.transports.websocket import create_websocket_transport
+from app.voice.session_runner import run_websocket_session
+from app.voice.workers import get_voice_worker_pool
 
 try:
     from pipecat.pipeline.runner import PipelineRunner
@@ -84,9 +76,11 @@ async def voice_ws(
     websocket: WebSocket,
     store_id: uuid.UUID = Query(...),
     order_id: uuid.UUID | None = Query(default=None),
+    # Client-chosen secret; reconnecting with it within the grace period resumes the session.
+    resume_token: str | None = Query(default=None, min_length=16, max_length=128, pattern=r"^[A-Za-z0-9_-]+$"),
     db: Session = Depends(get_db),
 ) -> None:
-    if PipelineRunner is None:
+    if PipelineRunner is None and get_voice_worker_pool() is None:
         await websocket.close(code=1011)
         return
 
@@ -96,37 +90,28 @@ async def voice_ws(
     except AppError:
         await websocket.close(code=1008)
         return
+    # Authentication only: the session opens its own short-lived DB sessions.
+    db.close()
 
     await websocket.accept()
 
-    runtime = load_voice_runtime_config()
-    google_config = load_google_voice_config()
-    system_prompt = build_system_prompt()
+    workers = get_voice_worker_pool()
+    if workers is not None:
+        # Signalling only: the session itself runs in a worker process.
+        worker = workers.shard(store_id=store_id, order_id=order_id, resume_token=resume_token)
+        query = {
+            "store_id": store_id,
+            "user_id": current_user.id,
+            "order_id": order_id,
+            "resume_token": resume_token,
+        }
+        await workers.proxy_websocket(websocket, worker=worker, query=query)
+        return
 
-    tool_context = VoiceToolContext(
-        db=db,
+    await run_websocket_session(
+        websocket,
         store_id=store_id,
         user_id=current_user.id,
         order_id=order_id,
-        channel="voice",
-    )
-    tool_handlers = create_voice_tool_handlers(tool_context)
-
-    transport = create_websocket_transport(websocket)
-    task = create_voice_pipeline_task(
-        transport=transport,
-        runtime=runtime,
-        google_config=google_config,
-        system_prompt=system_prompt,
-        tool_schema=GEMINI_VOICE_TOOLS_SCHEMA,
-        tool_handlers=tool_handlers,
+        resume_token=resume_token,
     )
-
-    runner = PipelineRunner()
-    try:
-        await runner.run(task)
-    except WebSocketDisconnect:
-        return
-    except Exception:
-        await websocket.close(code=1011)
-        return
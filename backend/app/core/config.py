@@ -28,6 +28,9 @@ class Settings(BaseSettings):
 
     cors_origins: str = "*"
 
+    # Order totals are maintained incrementally; verify mode cross-checks every write with a full recompute
+    order_totals_verify: bool = False
+
     # Voice pipeline (provider + runtime limits)
     voice_provider_stt: str = "google"
     voice_provider_tts: str = "google"
@@ -36,7 +39,98 @@ class Settings(BaseSettings):
 
     voice_ws_max_seconds: int = 900
     voice_ws_max_payload_kb: int = 256
+    voice_ws_idle_seconds: int = 30
     voice_audio_sample_rate_hz: int = 16000
+    voice_audio_out_sample_rate_hz: int = 24000
+    voice_tts_voice_id: str = "en-US-Chirp3-HD-Charon"
+    voice_tts_language: str = "en-US"
+    voice_audio_cache_dir: str = ".voice_cache"
+    voice_tts_cache_max_disk_mb: int = 256
+    voice_tts_cache_max_hot_mb: int = 16
+    voice_menu_index_ttl_seconds: int = 30
+
+    # Warm provider clients kept ready per API process
+    voice_pool_size: int = 2
+    voice_pool_max_idle_seconds: int = 600
+
+    # Run voice pipelines in this many worker processes (0 = inside the API process); the API only
+    # authenticates and relays. Sessions are sharded by "store" or by "session".
+    voice_worker_processes: int = 0
+    voice_worker_shard_by: str = "store"
+    voice_worker_socket_dir: str = ".voice_cache/workers"
+
+    # Session admission (0 disables a cap). Global/store caps queue up to the wait, then 429 / close 1013.
+    # The worker pool points its workers at one state directory so the caps and start rate are host-wide.
+    voice_max_sessions: int = 50
+    voice_max_sessions_per_store: int = 10
+    voice_max_sessions_per_user: int = 2
+    voice_session_starts_per_minute: float = 120.0
+    voice_session_start_burst: int = 20
+    voice_admission_queue_seconds: float = 3.0
+    voice_session_state_dir: str = ""
+
+    # Deploys: SIGTERM (or POST /voice/admin/drain) stops admitting sessions and gives active calls
+    # this long to finish before they are cut off. The admin endpoints are disabled without a token.
+    voice_drain_seconds: int = 120
+    voice_admin_token: str = ""
+
+    # Reconnect-and-resume: a dropped WebSocket that connected with a resume_token keeps its
+    # conversation, cart and provider clients this long for a reconnect to pick up (0 disables).
+    voice_resume_grace_seconds: int = 30
+
+    # Shared Silero VAD; a window of 0 disables cross-session batching. A batched frame that
+    # gets no answer within the timeout counts as silence.
+    voice_vad_batch_window_ms: int = 2
+    voice_vad_max_batch: int = 64
+    voice_vad_timeout_ms: int = 100
+    voice_vad_start_secs: float = 0.2
+    voice_vad_stop_secs: float = 0.8
+    voice_vad_min_volume: float = 0.6
+
+    # Adaptive end-of-turn: the VAD silence window follows the interim transcript within these bounds,
+    # and each store's default drifts toward the target rate of premature endpoints
+    voice_endpointing_enabled: bool = True
+    voice_endpointing_min_stop_secs: float = 0.3
+    voice_endpointing_max_stop_secs: float = 1.2
+    voice_endpointing_target_premature_rate: float = 0.05
+
+    # Deterministic parser for simple ordering turns; below the confidence floor the LLM decides.
+    # Keep the floor above 0.9 (containment matches) so only exact names and aliases skip the LLM.
+    voice_fast_path_enabled: bool = True
+    voice_fast_path_min_confidence: float = 1.0
+
+    # Voice tool DB calls run on a bounded thread pool, off the audio event loop
+    voice_db_max_workers: int = 8
+    voice_db_slow_call_ms: int = 250
+
+    # Draft carts live in memory and are written behind; the journal is replayed after a crash
+    voice_cart_journal_dir: str = ".voice_cache/carts"
+    voice_cart_checkpoint_seconds: int = 30
+
+    # Tool results reach the LLM as short line handles, integer cents and changed lines only
+    voice_compact_tool_results: bool = True
+
+    # LLM prompt budget; older turns are dropped past it, the system prompt and cart stay pinned
+    voice_llm_context_max_tokens: int = 4000
+    voice_llm_context_min_recent_messages: int = 6
+    voice_prompt_menu_max_tokens: int = 1500
+
+    # Process-wide LLM request budget, shared fairly between stores; 0 disables.
+    # Set a path to share the bucket between worker processes on one host.
+    voice_llm_requests_per_minute: float = 300.0
+    voice_llm_burst: int = 10
+    voice_llm_rate_limit_path: str = ""
+    voice_llm_slow_wait_ms: int = 1000
+
+    # Per-turn latency breakdown; percentiles cover the most recent samples per store and stage
+    voice_latency_window: int = 1000
+
+    # Barge-in: caller speech cuts off the bot's reply; stores can override it
+    voice_allow_interruptions: bool = False
+
+    # LLM text reaches TTS in clause/sentence chunks of at least this many characters
+    voice_tts_sentence_streaming: bool = True
+    voice_tts_min_chunk_chars: int = 20
 
     # Telephony / WebRTC providers
     telephony_provider: str = "daily"
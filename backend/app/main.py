@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -15,10 +17,34 @@ from app.api.routers.voice.sessions import router as voice_sessions_router
 from app.api.routers.voice.orders import router as voice_orders_router
 from app.api.routers.voice.ws import router as voice_ws_router
 from app.api.routers.voice.telephony import router as voice_telephony_router
+from app.api.routers.voice.metrics import router as voice_metrics_router
+from app.api.routers.voice.admin import router as voice_admin_router
 from app.core.config import settings
 from app.core.errors import AppError, app_error_handler
+from app.voice.drain import drain_on_signal, get_voice_drain
+from app.voice.runtime import voice_runtime
+from app.voice.workers import get_voice_worker_pool
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    workers = get_voice_worker_pool()
+    if workers is None:
+        async with voice_runtime():
+            with drain_on_signal():
+                yield
+        return
+
+    # Pipelines (and their warm pool, carts and DB executor) live in the worker processes.
+    await workers.start()
+    try:
+        with drain_on_signal():
+            yield
+    finally:
+        await workers.close()
 
-app = FastAPI(title=settings.app_name)
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 app.add_exception_handler(AppError, app_error_handler)
 
@@ -43,8 +69,19 @@ app.include_router(voice_sessions_router)
 app.include_router(voice_orders_router)
 app.include_router(voice_ws_router)
 app.include_router(voice_telephony_router)
+app.include_router(voice_metrics_router)
+app.include_router(voice_admin_router)
 
 
 @app.get("/health")
 def health() -> dict:
     return {"status": "ok"}
+
+
+@app.get("/ready")
+def ready() -> dict:
+    """Readiness for load balancers: fails once a drain has started so new calls go elsewhere."""
+
+    if get_voice_drain().draining:
+        raise AppError(status_code=503, code="draining", detail="Draining for shutdown")
+    return {"status": "ready"}
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import Boolean, ForeignKey, JSON, Numeric, String
+from sqlalchemy import Boolean, DateTime, ForeignKey, JSON, Numeric, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
+from app.core.time import utcnow_naive
 from app.db.base import Base
 
 
@@ -22,3 +24,5 @@ class MenuItem(Base):
     tags: Mapped[list[str] | None] = mapped_column(JSON, nullable=True)
     availability: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     modifiers: Mapped[dict[str, object] | None] = mapped_column(JSON, nullable=True)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), default=utcnow_naive, onupdate=utcnow_naive)
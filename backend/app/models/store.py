@@ -31,6 +31,8 @@ class Store(Base):
     allow_pickup: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     allow_delivery: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     min_order_amount: Mapped[Decimal | None] = mapped_column(Numeric(10, 2), nullable=True)
+    # Let callers talk over the voice assistant; None follows settings.voice_allow_interruptions
+    voice_allow_interruptions: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
 
     email: Mapped[str] = mapped_column(String(320), unique=True, index=True, nullable=False)
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
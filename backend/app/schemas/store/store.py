@@ -37,6 +37,7 @@ class StoreOut(BaseModel):
     allow_pickup: bool | None = None
     allow_delivery: bool | None = None
     min_order_amount: Decimal | None = None
+    voice_allow_interruptions: bool | None = None
     email: EmailStr
     created_at: datetime
 
@@ -54,3 +55,4 @@ class StoreUpdate(BaseModel):
     allow_pickup: bool | None = None
     allow_delivery: bool | None = None
     min_order_amount: Decimal | None = None
+    voice_allow_interruptions: bool | None = None
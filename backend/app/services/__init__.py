@@ -1,6 +1,15 @@
+from app.services import menu_index_service
 from app.services import menu_service
 from app.services import order_service
 from app.services import voice_session_service
+from app.services.menu_index_service import (
+    MenuIndex,
+    MenuIndexEntry,
+    get_menu_index,
+    invalidate_menu_index,
+    normalize_name,
+    peek_menu_index,
+)
 from app.services.menu_service import (
     create_menu,
     create_menu_item,
@@ -17,13 +26,18 @@ from app.services.menu_service import (
 from app.services.order_service import (
     create_draft_order,
     create_order_item,
+    delete_order_item,
     get_menu_item_for_store,
+    load_order_lines,
     recalc_totals,
     remove_order_item,
+    update_order_item_quantity,
+    verify_totals,
 )
 from app.services.voice_session_service import create_session, end_session, get_session
 
 __all__ = [
+    "menu_index_service",
     "menu_service",
     "order_service",
     "voice_session_service",
@@ -38,11 +52,21 @@ __all__ = [
     "create_menu_item",
     "update_menu_item",
     "delete_menu_item",
+    "MenuIndex",
+    "MenuIndexEntry",
+    "get_menu_index",
+    "invalidate_menu_index",
+    "normalize_name",
+    "peek_menu_index",
     "create_draft_order",
     "create_order_item",
     "get_menu_item_for_store",
     "remove_order_item",
+    "delete_order_item",
+    "update_order_item_quantity",
+    "load_order_lines",
     "recalc_totals",
+    "verify_totals",
     "create_session",
     "get_session",
     "end_session",
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+import unicodedata
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Callable
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.menu import Menu
+from app.models.menu_item import MenuItem
+
+_STOP_WORDS = frozenset({"a", "an", "the", "some", "of", "please", "order"})
+_FUZZY_MIN_SCORE = 0.5
+_FUZZY_MIN_MARGIN = 0.08
+_PENDING_INFO_KEY = "menu_index_invalidations"
+
+MenuSignature = tuple[tuple[uuid.UUID, int, int, datetime | None], ...]
+
+
+def _stem(token: str) -> str:
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("es") and token[:-2].endswith(("s", "x", "z", "ch", "sh")):
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def normalize_name(text: str) -> str:
+    """Lowercase, strip accents/punctuation, drop filler words and stem plurals."""
+
+    folded = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+    tokens = re.findall(r"[a-z0-9]+", folded.replace("'", ""))
+    return " ".join(_stem(token) for token in tokens if token not in _STOP_WORDS)
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class MenuIndexEntry:
+    menu_item_id: uuid.UUID
+    menu_id: uuid.UUID
+    name: str
+    price: Decimal
+    availability: bool
+
+
+@dataclass
+class MenuIndex:
+    store_id: uuid.UUID
+    version: MenuSignature
+    entries: dict[uuid.UUID, MenuIndexEntry] = field(default_factory=dict)
+    built_at: float = field(default_factory=time.monotonic)
+    _exact: dict[str, set[uuid.UUID]] = field(default_factory=dict, repr=False)
+    _tokens: dict[str, set[uuid.UUID]] = field(default_factory=dict, repr=False)
+    _grams: dict[str, set[uuid.UUID]] = field(default_factory=dict, repr=False)
+    _gram_sets: dict[uuid.UUID, list[set[str]]] = field(default_factory=dict, repr=False)
+
+    def add(self, entry: MenuIndexEntry, *, aliases: list[str] | None = None) -> None:
+        self.entries[entry.menu_item_id] = entry
+        for raw in [entry.name, *(aliases or [])]:
+            key = normalize_name(raw)
+            if not key:
+                continue
+            self._exact.setdefault(key, set()).add(entry.menu_item_id)
+            for token in key.split():
+                self._tokens.setdefault(token, set()).add(entry.menu_item_id)
+            grams = _trigrams(key)
+            self._gram_sets.setdefault(entry.menu_item_id, []).append(grams)
+            for gram in grams:
+                self._grams.setdefault(gram, set()).add(entry.menu_item_id)
+
+    def ends_with_item(self, text: str, *, max_words: int = 4) -> bool:
+        """True when the last words of `text` name a menu item exactly (name or alias)."""
+
+        tokens = normalize_name(text).split()
+        return any(" ".join(tokens[-n:]) in self._exact for n in range(1, min(max_words, len(tokens)) + 1))
+
+    def _pick(self, candidates: set[uuid.UUID]) -> MenuIndexEntry | None:
+        if len(candidates) == 1:
+            return self.entries[next(iter(candidates))]
+        available = [item_id for item_id in candidates if self.entries[item_id].availability]
+        if len(available) == 1:
+            return self.entries[available[0]]
+        return None
+
+    def lookup(self, name: str) -> MenuIndexEntry | None:
+        return self.match(name)[0]
+
+    def match(self, name: str) -> tuple[MenuIndexEntry | None, float]:
+        """Resolve `name` and report how confident the match is (1.0 exact, 0.9 containment, else fuzzy)."""
+
+        key = normalize_name(name)
+        if not key:
+            return None, 0.0
+
+        exact = self._exact.get(key)
+        if exact:
+            return self._scored(self._pick(exact), 1.0)
+
+        tokens = key.split()
+        containing = set.intersection(*(self._tokens.get(token, set()) for token in tokens))
+        if containing:
+            return self._scored(self._pick(containing), 0.9)
+
+        return self._fuzzy(key)
+
+    @staticmethod
+    def _scored(entry: MenuIndexEntry | None, score: float) -> tuple[MenuIndexEntry | None, float]:
+        return (entry, score) if entry is not None else (None, 0.0)
+
+    def _fuzzy(self, key: str) -> tuple[MenuIndexEntry | None, float]:
+        query = _trigrams(key)
+        candidates: set[uuid.UUID] = set()
+        for gram in query:
+            candidates |= self._grams.get(gram, set())
+
+        scored: list[tuple[float, uuid.UUID]] = []
+        for item_id in candidates:
+            best = max(2 * len(query & grams) / (len(query) + len(grams)) for grams in self._gram_sets[item_id])
+            scored.append((best, item_id))
+        if not scored:
+            return None, 0.0
+
+        scored.sort(reverse=True)
+        top_score, top_id = scored[0]
+        if top_score < _FUZZY_MIN_SCORE:
+            return None, 0.0
+        if len(scored) > 1 and top_score - scored[1][0] < _FUZZY_MIN_MARGIN:
+            return None, 0.0
+        return self.entries[top_id], top_score
+
+
+def _item_aliases(item: MenuItem) -> list[str]:
+    raw = (item.modifiers or {}).get("aliases")
+    if isinstance(raw, list):
+        return [alias for alias in raw if isinstance(alias, str)]
+    return []
+
+
+def load_menu_signature(db: Session, *, store_id: uuid.UUID) -> MenuSignature:
+    """
+    Per menu: id, version, item count and latest item edit. Item edits don't bump `Menu.version`,
+    so this is what tells a process that another one has changed the menu under its caches.
+    """
+
+    rows = db.execute(
+        select(Menu.id, Menu.version, func.count(MenuItem.id), func.max(MenuItem.updated_at))
+        .outerjoin(MenuItem, MenuItem.menu_id == Menu.id)
+        .where(Menu.store_id == store_id)
+        .group_by(Menu.id, Menu.version)
+        .order_by(Menu.id)
+    ).all()
+    return tuple((menu_id, version, count, updated_at) for menu_id, version, count, updated_at in rows)
+
+
+def build_menu_index(db: Session, *, store_id: uuid.UUID) -> MenuIndex:
+    version = load_menu_signature(db, store_id=store_id)
+    items = db.execute(
+        select(MenuItem).join(Menu, Menu.id == MenuItem.menu_id).where(Menu.store_id == store_id)
+    ).scalars().all()
+
+    index = MenuIndex(store_id=store_id, version=version)
+    for item in items:
+        index.add(
+            MenuIndexEntry(
+                menu_item_id=item.id,
+                menu_id=item.menu_id,
+                name=item.name,
+                price=item.price,
+                availability=item.availability,
+            ),
+            aliases=_item_aliases(item),
+        )
+    return index
+
+
+_lock = threading.Lock()
+_indexes: dict[uuid.UUID, MenuIndex] = {}
+
+
+def fresh_menu_index(store_id: uuid.UUID) -> MenuIndex | None:
+    """The cached index while it is within its TTL, else None; never touches the database."""
+
+    with _lock:
+        index = _indexes.get(store_id)
+    if index is not None and time.monotonic() - index.built_at < settings.voice_menu_index_ttl_seconds:
+        return index
+    return None
+
+
+def get_menu_index(db: Session, *, store_id: uuid.UUID) -> MenuIndex:
+    fresh = fresh_menu_index(store_id)
+    if fresh is not None:
+        return fresh
+    with _lock:
+        index = _indexes.get(store_id)
+    if index is not None:
+        if load_menu_signature(db, store_id=store_id) == index.version:
+            index.built_at = time.monotonic()
+            return index
+
+    index = build_menu_index(db, store_id=store_id)
+    with _lock:
+        _indexes[store_id] = index
+    return index
+
+
+def peek_menu_index(store_id: uuid.UUID) -> MenuIndex | None:
+    """The cached index, if any, without touching the database (may be slightly stale)."""
+
+    with _lock:
+        return _indexes.get(store_id)
+
+
+_invalidation_listeners: list[Callable[[uuid.UUID], None]] = []
+
+
+def add_invalidation_listener(listener: Callable[[uuid.UUID], None]) -> None:
+    """Call `listener(store_id)` whenever a store's menu changes, for caches derived from the menu."""
+
+    _invalidation_listeners.append(listener)
+
+
+def drop_menu_index(*, store_id: uuid.UUID) -> None:
+    with _lock:
+        _indexes.pop(store_id, None)
+    for listener in _invalidation_listeners:
+        listener(store_id)
+
+
+def invalidate_menu_index(db: Session, *, store_id: uuid.UUID) -> None:
+    """Drop the store's index now and again once the pending transaction commits."""
+
+    drop_menu_index(store_id=store_id)
+    db.info.setdefault(_PENDING_INFO_KEY, set()).add(store_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_committed(session: Session) -> None:
+    for store_id in session.info.pop(_PENDING_INFO_KEY, set()):
+        drop_menu_index(store_id=store_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_INFO_KEY, None)
@@ -8,6 +8,13 @@ from sqlalchemy.orm import Session
 from app.models.menu import Menu
 from app.models.menu_item import MenuItem
 from app.schemas.menu.menu import MenuCreate, MenuItemCreate, MenuItemUpdate, MenuUpdate
+from app.services.menu_index_service import invalidate_menu_index
+
+
+def _invalidate_for_menu(db: Session, *, menu_id: uuid.UUID) -> None:
+    menu = db.get(Menu, menu_id)
+    if menu is not None:
+        invalidate_menu_index(db, store_id=menu.store_id)
 
 
 def list_menus(db: Session, *, store_id: uuid.UUID) -> list[Menu]:
@@ -24,7 +31,7 @@ def get_menu_by_version(db: Session, *, store_id: uuid.UUID, version: int | None
         query = query.where(Menu.version == version)
         return db.execute(query).scalar_one_or_none()
 
-    query = query.where(Menu.active.is_(True)).order_by(Menu.updated_at.desc())
+    query = query.where(Menu.active.is_(True)).order_by(Menu.updated_at.desc()).limit(1)
     return db.execute(query).scalar_one_or_none()
 
 
@@ -39,6 +46,7 @@ def create_menu(db: Session, *, store_id: uuid.UUID, payload: MenuCreate) -> Men
         version=next_version,
     )
     db.add(menu)
+    invalidate_menu_index(db, store_id=store_id)
     return menu
 
 
@@ -53,11 +61,13 @@ def update_menu(db: Session, *, menu: Menu, payload: MenuUpdate) -> Menu:
 
     if touched:
         menu.version += 1
+        invalidate_menu_index(db, store_id=menu.store_id)
     return menu
 
 
 def delete_menu(db: Session, *, menu: Menu) -> None:
     db.delete(menu)
+    invalidate_menu_index(db, store_id=menu.store_id)
 
 
 def list_menu_items(db: Session, *, menu_id: uuid.UUID) -> list[MenuItem]:
@@ -79,6 +89,7 @@ def create_menu_item(db: Session, *, menu_id: uuid.UUID, payload: MenuItemCreate
         modifiers=payload.modifiers,
     )
     db.add(item)
+    _invalidate_for_menu(db, menu_id=menu_id)
     return item
 
 
@@ -95,8 +106,10 @@ def update_menu_item(db: Session, *, item: MenuItem, payload: MenuItemUpdate) ->
         item.availability = payload.availability
     if payload.modifiers is not None:
         item.modifiers = payload.modifiers
+    _invalidate_for_menu(db, menu_id=item.menu_id)
     return item
 
 
 def delete_menu_item(db: Session, *, item: MenuItem) -> None:
     db.delete(item)
+    _invalidate_for_menu(db, menu_id=item.menu_id)
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
+import logging
 import uuid
 from decimal import Decimal
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.models.menu import Menu
 from app.models.menu_item import MenuItem
 from app.models.order import Order
 from app.models.order_item import OrderItem
 from app.schemas.order.order import OrderCreate
 
+logger = logging.getLogger("orders")
+
 
 def get_menu_item_for_store(db: Session, *, store_id: uuid.UUID, item_id: uuid.UUID) -> MenuItem | None:
     return db.execute(
@@ -22,8 +26,9 @@ def get_menu_item_for_store(db: Session, *, store_id: uuid.UUID, item_id: uuid.U
     ).scalar_one_or_none()
 
 
-def create_draft_order(db: Session, *, payload: OrderCreate) -> Order:
+def create_draft_order(db: Session, *, payload: OrderCreate, order_id: uuid.UUID | None = None) -> Order:
     order = Order(
+        id=order_id or uuid.uuid4(),
         store_id=payload.store_id,
         user_id=payload.user_id,
         status="draft",
@@ -42,11 +47,23 @@ def create_draft_order(db: Session, *, payload: OrderCreate) -> Order:
             if menu_item is None:
                 continue
             create_order_item(db, order=order, menu_item=menu_item, quantity=item.quantity)
-        recalc_totals(db, order=order)
 
     return order
 
 
+def _set_totals(order: Order, subtotal: Decimal) -> None:
+    tax = Decimal("0.00")
+    order.subtotal = subtotal
+    order.tax = tax
+    order.total = subtotal + tax
+
+
+def _apply_line_delta(db: Session, *, order: Order, amount: Decimal) -> None:
+    _set_totals(order, (order.subtotal or Decimal("0.00")) + amount)
+    if settings.order_totals_verify:
+        verify_totals(db, order=order)
+
+
 def create_order_item(db: Session, *, order: Order, menu_item: MenuItem, quantity: int) -> OrderItem:
     item = OrderItem(
         order_id=order.id,
@@ -55,25 +72,62 @@ def create_order_item(db: Session, *, order: Order, menu_item: MenuItem, quantit
         price_snapshot=menu_item.price,
     )
     db.add(item)
+    _apply_line_delta(db, order=order, amount=item.price_snapshot * quantity)
+    return item
+
+
+def update_order_item_quantity(db: Session, *, order: Order, item: OrderItem, quantity: int) -> OrderItem:
+    delta = quantity - item.quantity
+    item.quantity = quantity
+    _apply_line_delta(db, order=order, amount=item.price_snapshot * delta)
     return item
 
 
+def delete_order_item(db: Session, *, order: Order, item: OrderItem) -> None:
+    db.delete(item)
+    _apply_line_delta(db, order=order, amount=-(item.price_snapshot * item.quantity))
+
+
 def remove_order_item(db: Session, *, order: Order, item_id: uuid.UUID) -> None:
     item = db.execute(
         select(OrderItem).where(OrderItem.order_id == order.id).where(OrderItem.id == item_id)
     ).scalar_one_or_none()
     if item is None:
         return
-    db.delete(item)
+    delete_order_item(db, order=order, item=item)
+
+
+def load_order_lines(db: Session, *, order: Order) -> list[tuple[OrderItem, str | None]]:
+    """Order items with their menu item names in one round trip (flushes pending changes first)."""
+
+    db.flush()
+    rows = db.execute(
+        select(OrderItem, MenuItem.name)
+        .outerjoin(MenuItem, MenuItem.id == OrderItem.menu_item_id)
+        .where(OrderItem.order_id == order.id)
+    ).all()
+    return [(item, name) for item, name in rows]
 
 
 def recalc_totals(db: Session, *, order: Order) -> Order:
-    items = db.execute(select(OrderItem).where(OrderItem.order_id == order.id)).scalars().all()
-    subtotal = sum((item.price_snapshot * item.quantity for item in items), Decimal("0.00"))
-    tax = Decimal("0.00")
-    total = subtotal + tax
+    """Full recompute from the order's items; write paths keep totals current incrementally."""
 
-    order.subtotal = subtotal
-    order.tax = tax
-    order.total = total
+    db.flush()
+    items = db.execute(select(OrderItem).where(OrderItem.order_id == order.id)).scalars().all()
+    _set_totals(order, sum((item.price_snapshot * item.quantity for item in items), Decimal("0.00")))
     return order
+
+
+def verify_totals(db: Session, *, order: Order) -> bool:
+    """Cross-check the incremental totals against a full recompute, correcting them on mismatch."""
+
+    expected = (order.subtotal, order.tax, order.total)
+    recalc_totals(db, order=order)
+    actual = (order.subtotal, order.tax, order.total)
+    if expected != actual:
+        logger.warning(
+            "order_totals_mismatch",
+            extra={"order_id": str(order.id), "incremental": [str(v) for v in expected], "recomputed": [str(v) for v in actual]},
+        )
+        return False
+    return True
@@ -1,31 +1,137 @@
-from app.voice.config import GoogleVoiceConfig, VoiceRuntimeConfig, load_google_voice_config, load_voice_runtime_config
-from app.voice.pipeline import ConversationLogger, LLMRateLimiter, create_voice_pipeline_task
-from app.voice.prompts import build_system_prompt
+from app.voice.cart import DraftCart, DraftCartStore, get_draft_cart_store
+from app.voice.config import (
+    GoogleVoiceConfig,
+    VoiceRuntimeConfig,
+    load_google_voice_config,
+    load_voice_runtime_config,
+    store_allows_interruptions,
+)
+from app.voice.context_window import ContextWindowProcessor, context_window_stats
+from app.voice.db_executor import VoiceDBExecutor, get_voice_db_executor
+from app.voice.drain import VoiceDrain, drain_on_signal, get_voice_drain
+from app.voice.endpointing import AdaptiveEndpointing, AdaptiveEndpointingProcessor, endpointing_stats
+from app.voice.fast_path import FastPathProcessor, fast_path_stats, parse_simple_intent
+from app.voice.greeting import GreetingAudio, GreetingPlayer, build_greeting_text, get_greeting_audio
+from app.voice.pipeline import (
+    ConversationLogger,
+    LLMRateLimiter,
+    VoiceServiceBundle,
+    create_voice_llm_context,
+    create_voice_pipeline_task,
+    create_voice_services,
+)
+from app.voice.pool import VoicePipelinePool, VoicePoolStats, get_voice_pipeline_pool
+from app.voice.prompts import CompiledPrompt, build_system_prompt, compile_store_prompt
 from app.voice.events import VoiceEvent, VoiceEventType, log_voice_event, new_voice_event
-from app.voice.guards import TokenBucket, ensure_max_duration
+from app.voice.guards import SessionWatch, SharedTokenBucket, TokenBucket, ensure_max_duration
+from app.voice.interruptions import BargeInTap, BargeInTracker, interruption_stats
+from app.voice.latency import LatencyTap, TurnLatencyTracker, turn_latency_stats
+from app.voice.llm_scheduler import LLMScheduler, LLMSchedulerProcessor, get_llm_scheduler
+from app.voice.resume import ParkedSession, SessionRegistry, get_session_registry
+from app.voice.runtime import voice_runtime
+from app.voice.session_runner import run_websocket_session, start_daily_session
+from app.voice.sentence_stream import SentenceChunker, SentenceStreamProcessor
+from app.voice.supervisor import SessionSupervisor, VoiceSession, get_session_supervisor
 from app.voice.tool_router import VoiceToolContext, VoiceToolRouter
-from app.voice.tools import GEMINI_VOICE_TOOLS_SCHEMA, create_voice_tool_handlers
-from app.voice.transports import create_daily_transport, create_websocket_transport
+from app.voice.tool_results import ToolResultEncoder, tool_result_stats
+from app.voice.tools import GEMINI_VOICE_TOOLS_SCHEMA, close_voice_tool_context, create_voice_tool_handlers
+from app.voice.tts_cache import CachedGoogleTTSService, TTSPhraseCache, get_tts_phrase_cache
+from app.voice.vad import SharedSileroVADAnalyzer, create_vad_analyzer, get_shared_silero_model
+from app.voice.transports import (
+    TransportGuard,
+    create_daily_transport,
+    create_websocket_transport,
+    session_watch,
+    transport_guard_stats,
+)
+from app.voice.workers import VoiceWorker, VoiceWorkerPool, get_voice_worker_pool, shard_for
 
 __all__ = [
     "GoogleVoiceConfig",
     "VoiceRuntimeConfig",
     "load_google_voice_config",
     "load_voice_runtime_config",
+    "store_allows_interruptions",
     "ConversationLogger",
     "LLMRateLimiter",
+    "BargeInTap",
+    "BargeInTracker",
+    "interruption_stats",
+    "LatencyTap",
+    "TurnLatencyTracker",
+    "turn_latency_stats",
+    "LLMScheduler",
+    "LLMSchedulerProcessor",
+    "get_llm_scheduler",
+    "create_voice_llm_context",
     "create_voice_pipeline_task",
+    "VoiceServiceBundle",
+    "create_voice_services",
+    "VoicePipelinePool",
+    "VoicePoolStats",
+    "get_voice_pipeline_pool",
     "build_system_prompt",
+    "compile_store_prompt",
+    "CompiledPrompt",
+    "ContextWindowProcessor",
+    "context_window_stats",
+    "VoiceDBExecutor",
+    "get_voice_db_executor",
+    "VoiceDrain",
+    "drain_on_signal",
+    "get_voice_drain",
+    "AdaptiveEndpointing",
+    "AdaptiveEndpointingProcessor",
+    "endpointing_stats",
+    "FastPathProcessor",
+    "fast_path_stats",
+    "parse_simple_intent",
+    "GreetingAudio",
+    "GreetingPlayer",
+    "build_greeting_text",
+    "get_greeting_audio",
+    "ParkedSession",
+    "SessionRegistry",
+    "get_session_registry",
+    "voice_runtime",
+    "run_websocket_session",
+    "start_daily_session",
+    "SentenceChunker",
+    "SentenceStreamProcessor",
+    "SessionSupervisor",
+    "VoiceSession",
+    "get_session_supervisor",
     "VoiceToolContext",
     "VoiceToolRouter",
+    "ToolResultEncoder",
+    "tool_result_stats",
     "GEMINI_VOICE_TOOLS_SCHEMA",
     "create_voice_tool_handlers",
+    "close_voice_tool_context",
+    "DraftCart",
+    "DraftCartStore",
+    "get_draft_cart_store",
     "create_websocket_transport",
     "create_daily_transport",
+    "TransportGuard",
+    "session_watch",
+    "transport_guard_stats",
+    "VoiceWorker",
+    "VoiceWorkerPool",
+    "get_voice_worker_pool",
+    "shard_for",
+    "CachedGoogleTTSService",
+    "TTSPhraseCache",
+    "get_tts_phrase_cache",
+    "SharedSileroVADAnalyzer",
+    "create_vad_analyzer",
+    "get_shared_silero_model",
     "VoiceEvent",
     "VoiceEventType",
     "new_voice_event",
     "log_voice_event",
     "TokenBucket",
+    "SharedTokenBucket",
     "ensure_max_duration",
+    "SessionWatch",
 ]
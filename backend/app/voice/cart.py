@@ -0,0 +1,475 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import fcntl
+import json
+import logging
+import threading
+import uuid
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.schemas.order.order import OrderCreate
+from app.services import order_service
+
+logger = logging.getLogger("voice.cart")
+
+
+@dataclass
+class CartLine:
+    line_id: uuid.UUID
+    menu_item_id: uuid.UUID
+    name: str
+    unit_price: Decimal
+    quantity: int
+
+    @property
+    def total(self) -> Decimal:
+        return self.unit_price * self.quantity
+
+    def as_record(self) -> dict[str, Any]:
+        return {
+            "line_id": str(self.line_id),
+            "menu_item_id": str(self.menu_item_id),
+            "name": self.name,
+            "unit_price": str(self.unit_price),
+            "quantity": self.quantity,
+        }
+
+    @classmethod
+    def from_record(cls, record: dict[str, Any]) -> CartLine:
+        return cls(
+            line_id=uuid.UUID(record["line_id"]),
+            menu_item_id=uuid.UUID(record["menu_item_id"]),
+            name=record["name"],
+            unit_price=Decimal(record["unit_price"]),
+            quantity=int(record["quantity"]),
+        )
+
+
+class CartBusyError(RuntimeError):
+    """The order's journal is locked by another live session (e.g. in another worker)."""
+
+
+class CartJournal:
+    """Append-only JSONL log of one cart's mutations, locked while the cart is live."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        try:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError as exc:
+            self._file.close()
+            raise CartBusyError(f"cart journal {path.name} is held by another session") from exc
+
+    def append(self, *records: dict[str, Any]) -> None:
+        self._file.write("".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records))
+        self._file.flush()
+
+    def rewrite(self, records: list[dict[str, Any]]) -> None:
+        self._file.seek(0)
+        self._file.truncate()
+        for record in records:
+            self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def close(self, *, delete: bool) -> None:
+        if delete:
+            self.path.unlink(missing_ok=True)
+        self._file.close()
+
+
+@dataclass
+class DraftCart:
+    """A voice session's order, served from memory and written to the database behind the conversation."""
+
+    order_id: uuid.UUID
+    store_id: uuid.UUID
+    user_id: uuid.UUID | None
+    channel: str
+    status: str = "draft"
+    lines: dict[uuid.UUID, CartLine] = field(default_factory=dict)
+    subtotal: Decimal = Decimal("0.00")
+    version: int = 0
+    persisted_version: int = -1
+    journal: CartJournal | None = field(default=None, repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+    _persist_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _pending: list[dict[str, Any]] | None = field(default=None, repr=False)
+
+    @property
+    def dirty(self) -> bool:
+        return self.version != self.persisted_version
+
+    def _log(self, record: dict[str, Any]) -> None:
+        self.version += 1
+        if self._pending is not None:
+            self._pending.append(record)
+        elif self.journal is not None:
+            self.journal.append(record)
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Apply several mutations atomically with respect to checkpoints, journaled in one write."""
+
+        with self._lock:
+            self._pending = []
+            try:
+                yield self
+            finally:
+                pending, self._pending = self._pending, None
+                if pending and self.journal is not None:
+                    self.journal.append(*pending)
+
+    def snapshot_record(self) -> dict[str, Any]:
+        return {
+            "op": "open",
+            "order_id": str(self.order_id),
+            "store_id": str(self.store_id),
+            "user_id": str(self.user_id) if self.user_id else None,
+            "channel": self.channel,
+            "status": self.status,
+            "lines": [line.as_record() for line in self.lines.values()],
+        }
+
+    def add_line(self, *, menu_item_id: uuid.UUID, name: str, unit_price: Decimal, quantity: int) -> CartLine:
+        with self._lock:
+            line = CartLine(
+                line_id=uuid.uuid4(), menu_item_id=menu_item_id, name=name, unit_price=unit_price, quantity=quantity
+            )
+            self.lines[line.line_id] = line
+            self.subtotal += line.total
+            self._log({"op": "add", **line.as_record()})
+            return line
+
+    def set_quantity(self, line_id: uuid.UUID, quantity: int) -> None:
+        with self._lock:
+            line = self.lines[line_id]
+            self.subtotal += line.unit_price * (quantity - line.quantity)
+            line.quantity = quantity
+            self._log({"op": "qty", "line_id": str(line_id), "quantity": quantity})
+
+    def remove_line(self, line_id: uuid.UUID) -> CartLine:
+        with self._lock:
+            line = self.lines.pop(line_id)
+            self.subtotal -= line.total
+            self._log({"op": "remove", "line_id": str(line_id)})
+            return line
+
+    def set_status(self, status: str) -> None:
+        with self._lock:
+            self.status = status
+            self._log({"op": "status", "status": status})
+
+    def find_line(
+        self,
+        *,
+        line_id: uuid.UUID | None = None,
+        menu_item_id: uuid.UUID | None = None,
+        exclude: set[uuid.UUID] = frozenset(),
+    ) -> CartLine | None:
+        with self._lock:
+            if line_id is not None and line_id in self.lines and line_id not in exclude:
+                return self.lines[line_id]
+            if menu_item_id is not None:
+                for line in self.lines.values():
+                    if line.menu_item_id == menu_item_id and line.line_id not in exclude:
+                        return line
+            return None
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            tax = Decimal("0.00")
+            return {
+                "order_id": self.order_id,
+                "status": self.status,
+                "subtotal": self.subtotal,
+                "tax": tax,
+                "total": self.subtotal + tax,
+                "items": [
+                    {
+                        "order_item_id": line.line_id,
+                        "menu_item_id": line.menu_item_id,
+                        "name": line.name,
+                        "quantity": line.quantity,
+                        "line_total": line.total,
+                    }
+                    for line in self.lines.values()
+                ],
+            }
+
+
+def _apply(cart: DraftCart, record: dict[str, Any]) -> None:
+    op = record["op"]
+    if op == "add":
+        line = CartLine.from_record(record)
+        cart.lines[line.line_id] = line
+    elif op == "qty":
+        line = cart.lines.get(uuid.UUID(record["line_id"]))
+        if line is not None:
+            line.quantity = int(record["quantity"])
+    elif op == "remove":
+        cart.lines.pop(uuid.UUID(record["line_id"]), None)
+    elif op == "status":
+        cart.status = record["status"]
+
+
+def replay_journal(path: Path) -> DraftCart | None:
+    """Rebuild a cart from its journal; None if the file is empty or unreadable."""
+
+    cart: DraftCart | None = None
+    with open(path, encoding="utf-8") as f:
+        for raw in f:
+            try:
+                record = json.loads(raw)
+            except json.JSONDecodeError:
+                # A torn final write from a crash; everything before it is intact.
+                break
+            if record.get("op") == "open":
+                cart = DraftCart(
+                    order_id=uuid.UUID(record["order_id"]),
+                    store_id=uuid.UUID(record["store_id"]),
+                    user_id=uuid.UUID(record["user_id"]) if record.get("user_id") else None,
+                    channel=record["channel"],
+                    status=record.get("status", "draft"),
+                    lines={line.line_id: line for line in map(CartLine.from_record, record["lines"])},
+                )
+            elif cart is not None:
+                _apply(cart, record)
+    if cart is not None:
+        cart.subtotal = sum((line.total for line in cart.lines.values()), Decimal("0.00"))
+    return cart
+
+
+def persist_cart(db: Session, cart: DraftCart) -> int:
+    """
+    Sync `orders`/`order_items` to the cart in one batch and return the cart version written.
+
+    Idempotent, so replaying a journal that was already persisted is safe. The caller marks the
+    version persisted once the transaction commits.
+    """
+
+    with cart._lock:
+        version = cart.version
+        status = cart.status
+        lines = [CartLine(**vars(line)) for line in cart.lines.values()]
+
+    order = db.get(Order, cart.order_id)
+    if order is None:
+        payload = OrderCreate(store_id=cart.store_id, user_id=cart.user_id, channel=cart.channel, notes=None, items=[])
+        order = order_service.create_draft_order(db, payload=payload, order_id=cart.order_id)
+
+    existing = {
+        item.id: item for item in db.execute(select(OrderItem).where(OrderItem.order_id == order.id)).scalars()
+    }
+    for line in lines:
+        row = existing.pop(line.line_id, None)
+        if row is None:
+            db.add(
+                OrderItem(
+                    id=line.line_id,
+                    order_id=order.id,
+                    menu_item_id=line.menu_item_id,
+                    quantity=line.quantity,
+                    price_snapshot=line.unit_price,
+                )
+            )
+        elif row.quantity != line.quantity:
+            row.quantity = line.quantity
+    for row in existing.values():
+        db.delete(row)
+
+    order.status = status
+    order_service.recalc_totals(db, order=order)
+    db.flush()
+    return version
+
+
+def load_cart(db: Session, *, order_id: uuid.UUID) -> DraftCart | None:
+    order = db.get(Order, order_id)
+    if order is None:
+        return None
+    cart = DraftCart(
+        order_id=order.id,
+        store_id=order.store_id,
+        user_id=order.user_id,
+        channel=order.channel,
+        status=order.status,
+        subtotal=order.subtotal,
+    )
+    for item, name in order_service.load_order_lines(db, order=order):
+        cart.lines[item.id] = CartLine(
+            line_id=item.id,
+            menu_item_id=item.menu_item_id,
+            name=name or "Unknown item",
+            unit_price=item.price_snapshot,
+            quantity=item.quantity,
+        )
+    cart.persisted_version = cart.version
+    return cart
+
+
+class DraftCartStore:
+    """Live carts in this process, their journals, and the periodic write-behind checkpoint."""
+
+    def __init__(self, *, journal_dir: Path, checkpoint_seconds: float) -> None:
+        self._journal_dir = journal_dir
+        self._checkpoint_seconds = checkpoint_seconds
+        self._lock = threading.Lock()
+        self._carts: dict[uuid.UUID, DraftCart] = {}
+        self._checkpoint_task: asyncio.Task | None = None
+        self.checkpoints = 0
+        self.checkpoint_failures = 0
+        self.replayed = 0
+
+    def _journal_path(self, order_id: uuid.UUID) -> Path:
+        return self._journal_dir / f"{order_id}.jsonl"
+
+    def track(self, cart: DraftCart) -> DraftCart:
+        """Make `cart` live in this process; CartBusyError if another session still holds its journal."""
+
+        cart.journal = CartJournal(self._journal_path(cart.order_id))
+        cart.journal.rewrite([cart.snapshot_record()])
+        with self._lock:
+            self._carts[cart.order_id] = cart
+        return cart
+
+    def open(self, *, store_id: uuid.UUID, user_id: uuid.UUID | None, channel: str) -> DraftCart:
+        return self.track(DraftCart(order_id=uuid.uuid4(), store_id=store_id, user_id=user_id, channel=channel))
+
+    def mark_persisted(self, cart: DraftCart, version: int) -> None:
+        with cart._lock:
+            cart.persisted_version = version
+            if cart.journal is not None and not cart.dirty:
+                # The database now holds everything the journal recorded.
+                cart.journal.rewrite([cart.snapshot_record()])
+
+    def release(self, cart: DraftCart) -> None:
+        with self._lock:
+            self._carts.pop(cart.order_id, None)
+        if cart.journal is not None:
+            cart.journal.close(delete=not cart.dirty)
+            cart.journal = None
+
+    def dirty_carts(self) -> list[DraftCart]:
+        with self._lock:
+            return [cart for cart in self._carts.values() if cart.dirty]
+
+    def write_behind(self, cart: DraftCart, session_factory: Callable[[], Session]) -> None:
+        """Persist `cart` in its own transaction; concurrent writers for one cart are serialized."""
+
+        with cart._persist_lock:
+            if not cart.dirty:
+                return
+            db = session_factory()
+            try:
+                version = persist_cart(db, cart)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+            self.mark_persisted(cart, version)
+
+    def checkpoint(self, session_factory: Callable[[], Session]) -> int:
+        """Persist every dirty cart; returns how many were written."""
+
+        written = 0
+        for cart in self.dirty_carts():
+            try:
+                self.write_behind(cart, session_factory)
+            except Exception:
+                self.checkpoint_failures += 1
+                logger.exception("voice_cart_checkpoint_failed", extra={"order_id": str(cart.order_id)})
+                continue
+            written += 1
+        self.checkpoints += 1
+        return written
+
+    def replay(self, session_factory: Callable[[], Session]) -> int:
+        """Persist carts left behind by a crashed worker; journals still locked by a live worker are skipped."""
+
+        if not self._journal_dir.exists():
+            return 0
+        replayed = 0
+        for path in sorted(self._journal_dir.glob("*.jsonl")):
+            try:
+                with open(path, "a", encoding="utf-8") as f:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    cart = replay_journal(path)
+                    if cart is not None:
+                        db = session_factory()
+                        try:
+                            persist_cart(db, cart)
+                            db.commit()
+                        finally:
+                            db.close()
+                    path.unlink(missing_ok=True)
+            except BlockingIOError:
+                continue
+            except Exception:
+                logger.exception("voice_cart_replay_failed", extra={"path": str(path)})
+                continue
+            replayed += 1
+        self.replayed += replayed
+        return replayed
+
+    async def _checkpoint_loop(self, run: Callable[..., Any], session_factory: Callable[[], Session]) -> None:
+        while True:
+            await asyncio.sleep(self._checkpoint_seconds)
+            try:
+                await run("cart_checkpoint", self.checkpoint, session_factory)
+            except Exception:
+                logger.exception("voice_cart_checkpoint_loop_failed")
+
+    async def start(self, run: Callable[..., Any], session_factory: Callable[[], Session]) -> None:
+        """Replay crash journals, then checkpoint dirty carts every `checkpoint_seconds`."""
+
+        replayed = await run("cart_replay", self.replay, session_factory)
+        if replayed:
+            logger.info("voice_cart_journals_replayed", extra={"count": replayed})
+        if self._checkpoint_seconds > 0 and self._checkpoint_task is None:
+            self._checkpoint_task = asyncio.get_running_loop().create_task(self._checkpoint_loop(run, session_factory))
+
+    async def close(self) -> None:
+        if self._checkpoint_task is not None:
+            self._checkpoint_task.cancel()
+            self._checkpoint_task = None
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            carts = list(self._carts.values())
+        return {
+            "live": len(carts),
+            "dirty": sum(1 for cart in carts if cart.dirty),
+            "checkpoints": self.checkpoints,
+            "checkpoint_failures": self.checkpoint_failures,
+            "replayed": self.replayed,
+        }
+
+
+_store: DraftCartStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_draft_cart_store() -> DraftCartStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DraftCartStore(
+                journal_dir=Path(settings.voice_cart_journal_dir),
+                checkpoint_seconds=settings.voice_cart_checkpoint_seconds,
+            )
+        return _store
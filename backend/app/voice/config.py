@@ -4,6 +4,7 @@ import os
 from dataclasses import dataclass
 
 from app.core.config import settings
+from app.models.store import Store
 
 
 @dataclass(frozen=True)
@@ -13,8 +14,12 @@ class VoiceRuntimeConfig:
     llm_provider: str
     llm_model: str
     audio_sample_rate_hz: int
+    audio_out_sample_rate_hz: int
+    tts_voice_id: str
+    tts_language: str
     ws_max_seconds: int
     ws_max_payload_kb: int
+    ws_idle_seconds: int
 
 
 @dataclass(frozen=True)
@@ -30,8 +35,12 @@ def load_voice_runtime_config() -> VoiceRuntimeConfig:
         llm_provider=settings.voice_provider_llm,
         llm_model=settings.voice_llm_model,
         audio_sample_rate_hz=settings.voice_audio_sample_rate_hz,
+        audio_out_sample_rate_hz=settings.voice_audio_out_sample_rate_hz,
+        tts_voice_id=settings.voice_tts_voice_id,
+        tts_language=settings.voice_tts_language,
         ws_max_seconds=settings.voice_ws_max_seconds,
         ws_max_payload_kb=settings.voice_ws_max_payload_kb,
+        ws_idle_seconds=settings.voice_ws_idle_seconds,
     )
 
 
@@ -39,3 +48,9 @@ def load_google_voice_config() -> GoogleVoiceConfig:
     api_key = (os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY") or "").strip()
     credentials_path = (os.getenv("GOOGLE_APPLICATION_CREDENTIALS") or "").strip()
     return GoogleVoiceConfig(api_key=api_key, credentials_path=credentials_path)
+
+
+def store_allows_interruptions(store: Store | None) -> bool:
+    if store is not None and store.voice_allow_interruptions is not None:
+        return store.voice_allow_interruptions
+    return settings.voice_allow_interruptions
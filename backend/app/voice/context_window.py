@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.voice.tool_results import estimate_tokens, to_cents
+from app.voice.tool_router import VoiceToolContext
+
+try:
+    from pipecat.frames.frames import LLMContextFrame
+    from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+except ImportError:  # pragma: no cover - optional dependency in tests
+    LLMContextFrame = None
+    FrameDirection = None
+    FrameProcessor = object
+
+logger = logging.getLogger("voice.context")
+
+TRIMMED_NOTE = "(Earlier conversation trimmed. The current order is noted on the latest user message.)"
+# Prefix of the one-line order note carried by the latest user message only.
+ORDER_NOTE_PREFIX = "[Order state] "
+
+
+@dataclass
+class ContextWindowStats:
+    turns: int = 0
+    trimmed_turns: int = 0
+    prompt_tokens_total: int = 0
+    uncompacted_prompt_tokens_total: int = 0
+    max_prompt_tokens: int = 0
+    last_prompt_tokens: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, *, prompt_tokens: int, trimmed: bool, uncompacted_prompt_tokens: int | None = None) -> None:
+        with self._lock:
+            self.turns += 1
+            self.trimmed_turns += int(trimmed)
+            self.prompt_tokens_total += prompt_tokens
+            self.uncompacted_prompt_tokens_total += prompt_tokens if uncompacted_prompt_tokens is None else uncompacted_prompt_tokens
+            self.max_prompt_tokens = max(self.max_prompt_tokens, prompt_tokens)
+            self.last_prompt_tokens = prompt_tokens
+
+    def as_dict(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "turns": self.turns,
+                "trimmed_turns": self.trimmed_turns,
+                "avg_prompt_tokens": round(self.prompt_tokens_total / self.turns, 1) if self.turns else 0.0,
+                # Same turns as if every tool result in the prompt had been sent uncompacted.
+                "avg_uncompacted_prompt_tokens": (
+                    round(self.uncompacted_prompt_tokens_total / self.turns, 1) if self.turns else 0.0
+                ),
+                "compaction_saved_ratio": (
+                    round(1 - self.prompt_tokens_total / self.uncompacted_prompt_tokens_total, 4)
+                    if self.uncompacted_prompt_tokens_total
+                    else 0.0
+                ),
+                "max_prompt_tokens": self.max_prompt_tokens,
+                "last_prompt_tokens": self.last_prompt_tokens,
+            }
+
+
+context_window_stats = ContextWindowStats()
+
+
+def _role(message: Any) -> str | None:
+    return message.get("role") if isinstance(message, dict) else None
+
+
+def cart_state_text(context: VoiceToolContext) -> str:
+    cart = context.cart
+    if cart is None:
+        return "Current order: empty."
+    summary = cart.summary()
+    if not summary["items"]:
+        return "Current order: empty."
+    lines = ", ".join(
+        f"{item['quantity']}x {item['name']} ({context.results.handle(item['order_item_id'])})"
+        for item in summary["items"]
+    )
+    return f"Current order ({summary['status']}): {lines}. Total: {to_cents(summary['total'])} cents."
+
+
+def strip_order_note(text: str) -> str:
+    if text.startswith(ORDER_NOTE_PREFIX):
+        return text.split("\n", 1)[1] if "\n" in text else ""
+    return text
+
+
+def _with_order_note(messages: list[Any], note: str) -> list[Any]:
+    """
+    Strip earlier order notes and put `note` on the latest user message.
+
+    The cart changes every turn; kept out of the system prompt and older turns, it leaves the
+    prompt prefix byte-identical from one request to the next.
+    """
+
+    noted = []
+    for message in messages:
+        if _role(message) == "user" and isinstance(message.get("content"), str):
+            stripped = strip_order_note(message["content"])
+            if stripped != message["content"]:
+                message = {**message, "content": stripped}
+        noted.append(message)
+    for i in range(len(noted) - 1, -1, -1):
+        if _role(noted[i]) == "user" and isinstance(noted[i].get("content"), str):
+            noted[i] = {**noted[i], "content": f"{ORDER_NOTE_PREFIX}{note}\n{noted[i]['content']}"}
+            break
+    return noted
+
+
+def trim_messages(messages: list[Any], *, max_tokens: int, min_recent: int) -> tuple[list[Any], bool]:
+    """
+    Drop the oldest turns after the leading system message until the prompt fits `max_tokens`.
+
+    Cuts only land on a user message, so a tool call is never separated from its result, and
+    the last `min_recent` messages are always kept. The system message notes that a cut happened.
+    """
+
+    if estimate_tokens(messages) <= max_tokens:
+        return messages, False
+
+    head = messages[:1] if messages and _role(messages[0]) == "system" else []
+    body = messages[len(head) :]
+
+    cut = 0
+    limit = max(0, len(body) - min_recent)
+    for i in range(1, limit + 1):
+        if i < len(body) and _role(body[i]) == "user":
+            cut = i
+            if estimate_tokens(head + body[i:]) <= max_tokens:
+                break
+    if cut == 0:
+        return messages, False
+    return [_with_trimmed_note(head[0] if head else None)] + body[cut:], True
+
+
+def _with_trimmed_note(system: dict[str, Any] | None) -> dict[str, Any]:
+    # On the system message, not a user turn of its own: that would put two user turns in a row.
+    content = system.get("content", "") if system else ""
+    if TRIMMED_NOTE in content:
+        return system
+    return {"role": "system", "content": f"{content}\n\n{TRIMMED_NOTE}" if content else TRIMMED_NOTE}
+
+
+class ContextWindowProcessor(FrameProcessor):
+    """
+    Just before the LLM: pin the system prompt, note the cart state, and keep the prompt within budget.
+
+    The follow-up inference after a function call reaches the LLM UPSTREAM from the assistant
+    aggregator; a second instance with `upstream=True` between the two handles those requests.
+    """
+
+    def __init__(
+        self,
+        *,
+        system_prompt: str,
+        tool_context: VoiceToolContext | None,
+        max_tokens: int,
+        min_recent_messages: int,
+        stats: ContextWindowStats = context_window_stats,
+        upstream: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._upstream = upstream
+        self._system_prompt = system_prompt
+        self._tool_context = tool_context
+        self._max_tokens = max_tokens
+        self._min_recent = min_recent_messages
+        self._stats = stats
+
+    def _pinned_system_message(self) -> dict[str, str]:
+        return {"role": "system", "content": self._system_prompt}
+
+    def manage(self, llm_context: Any) -> int:
+        messages = list(llm_context.get_messages())
+        if messages and _role(messages[0]) == "system":
+            # Once trimmed, the conversation stays trimmed; keep the note on the re-pinned prompt.
+            was_trimmed = TRIMMED_NOTE in str(messages[0].get("content", ""))
+            pinned = self._pinned_system_message()
+            messages[0] = _with_trimmed_note(pinned) if was_trimmed else pinned
+        else:
+            messages.insert(0, self._pinned_system_message())
+
+        messages, trimmed = trim_messages(messages, max_tokens=self._max_tokens, min_recent=self._min_recent)
+        if self._tool_context is not None:
+            messages = _with_order_note(messages, cart_state_text(self._tool_context))
+        llm_context.set_messages(messages)
+
+        prompt_tokens = estimate_tokens(messages)
+        uncompacted_tokens = prompt_tokens
+        if self._tool_context is not None:
+            # Each tool message is one encoded result; trimming drops the oldest ones first.
+            tool_messages = sum(1 for message in messages if _role(message) == "tool")
+            uncompacted_tokens += self._tool_context.results.saved_tokens(tool_messages)
+        self._stats.record(prompt_tokens=prompt_tokens, trimmed=trimmed, uncompacted_prompt_tokens=uncompacted_tokens)
+        logger.info(
+            "voice_llm_prompt",
+            extra={
+                "prompt_tokens": prompt_tokens,
+                "uncompacted_prompt_tokens": uncompacted_tokens,
+                "messages": len(messages),
+                "trimmed": trimmed,
+            },
+        )
+        return prompt_tokens
+
+    async def process_frame(self, frame: Any, direction: Any) -> None:
+        await super().process_frame(frame, direction)
+        managed = FrameDirection.UPSTREAM if self._upstream else FrameDirection.DOWNSTREAM
+        if isinstance(frame, LLMContextFrame) and direction == managed:
+            self.manage(frame.context)
+        await self.push_frame(frame, direction)
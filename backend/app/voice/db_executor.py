@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger("voice.db")
+
+T = TypeVar("T")
+
+
+@dataclass
+class DBCallStats:
+    calls: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    queue_wait_ms_total: float = 0.0
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.calls, 2) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "avg_queue_wait_ms": round(self.queue_wait_ms_total / self.calls, 2) if self.calls else 0.0,
+        }
+
+
+class VoiceDBExecutor:
+    """Bounded thread pool for the voice tool layer's blocking SQLAlchemy work."""
+
+    def __init__(self, *, max_workers: int, slow_call_ms: float) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="voice-db")
+        self._slow_call_ms = slow_call_ms
+        self._lock = threading.Lock()
+        self._stats: dict[str, DBCallStats] = {}
+
+    def record(self, name: str, *, elapsed_ms: float, queue_wait_ms: float = 0.0, failed: bool = False) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(name, DBCallStats())
+            stats.calls += 1
+            stats.errors += int(failed)
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.queue_wait_ms_total += queue_wait_ms
+        if elapsed_ms >= self._slow_call_ms:
+            logger.warning(
+                "voice_db_slow_call",
+                extra={"call": name, "elapsed_ms": round(elapsed_ms, 2), "queue_wait_ms": round(queue_wait_ms, 2)},
+            )
+
+    async def run(self, name: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run `fn` on the pool and time it; the event loop keeps pumping audio meanwhile."""
+
+        submitted = time.perf_counter()
+
+        def call() -> T:
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                finished = time.perf_counter()
+                self.record(
+                    name,
+                    elapsed_ms=(finished - started) * 1000,
+                    queue_wait_ms=(started - submitted) * 1000,
+                    failed=failed,
+                )
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in sorted(self._stats.items())}
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_executor: VoiceDBExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_voice_db_executor() -> VoiceDBExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = VoiceDBExecutor(
+                max_workers=settings.voice_db_max_workers,
+                slow_call_ms=settings.voice_db_slow_call_ms,
+            )
+        return _executor
+
+
+def shutdown_voice_db_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
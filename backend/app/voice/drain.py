@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.core.config import settings
+from app.core.time import utcnow_naive
+from app.db.session import SessionLocal
+from app.voice.cart import get_draft_cart_store
+from app.voice.db_executor import get_voice_db_executor
+from app.voice.resume import get_session_registry
+from app.voice.supervisor import get_session_supervisor
+from app.voice.workers import get_voice_worker_pool
+
+logger = logging.getLogger("voice.drain")
+
+
+class VoiceDrain:
+    """
+    Drain mode for deploys: refuse new voice sessions, let active ones finish until the deadline,
+    then persist every draft cart. Once started it can't be undone; the process is on its way out.
+    """
+
+    def __init__(self, *, deadline_seconds: float) -> None:
+        self._deadline_seconds = deadline_seconds
+        self._task: asyncio.Task | None = None
+        self._started_at = None
+        self._result: dict[str, object] = {}
+
+    @property
+    def draining(self) -> bool:
+        return self._task is not None
+
+    @property
+    def finished(self) -> bool:
+        return self._task is not None and self._task.done()
+
+    def start(self) -> asyncio.Task:
+        """Begin draining (idempotent); the returned task completes when the drain has finished."""
+
+        if self._task is None:
+            self._started_at = utcnow_naive()
+            logger.info("voice_drain_started", extra={"deadline_seconds": self._deadline_seconds})
+            self._task = asyncio.create_task(self._drain())
+        return self._task
+
+    async def _drain(self) -> None:
+        try:
+            workers = get_voice_worker_pool()
+            if workers is not None:
+                self._result = {"workers": await workers.drain(deadline_seconds=self._deadline_seconds)}
+            else:
+                cut_off = await get_session_supervisor().drain(deadline_seconds=self._deadline_seconds)
+                # Nobody can reconnect to this process any more.
+                await get_session_registry().close()
+                carts = get_draft_cart_store()
+                persisted = await get_voice_db_executor().run("cart_checkpoint", carts.checkpoint, SessionLocal)
+                self._result = {"cut_off": cut_off, "carts_persisted": persisted}
+        except Exception:
+            # Shutdown goes ahead regardless; the runtime's own checkpoint on exit still runs.
+            logger.exception("voice_drain_failed")
+            return
+        logger.info("voice_drain_finished", extra=self._result)
+
+    def status(self) -> dict[str, object]:
+        status: dict[str, object] = {
+            "draining": self.draining,
+            "finished": self.finished,
+            "started_at": self._started_at.isoformat() if self._started_at else None,
+            "deadline_seconds": self._deadline_seconds,
+            **self._result,
+        }
+        if get_voice_worker_pool() is None:
+            status["active_sessions"] = len(get_session_supervisor().sessions())
+        return status
+
+
+_drain: VoiceDrain | None = None
+
+
+def get_voice_drain() -> VoiceDrain:
+    global _drain
+    if _drain is None:
+        _drain = VoiceDrain(deadline_seconds=settings.voice_drain_seconds)
+    return _drain
+
+
+@contextmanager
+def drain_on_signal(signum: int = signal.SIGTERM) -> Iterator[None]:
+    """
+    While active, `signum` starts a drain and only hands the signal on to the previous handler
+    (uvicorn's graceful shutdown) once it has finished; a second signal hands it on at once.
+
+    Uvicorn closes open WebSockets as soon as it starts shutting down, so calls have to be drained
+    before it sees the signal. Enter from the lifespan, on the event loop's thread.
+    """
+
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    loop = asyncio.get_running_loop()
+    previous = signal.getsignal(signum)
+    signalled = False
+    handed_on = False
+
+    def hand_on() -> None:
+        nonlocal handed_on
+        if handed_on:
+            return
+        handed_on = True
+        signal.signal(signum, previous)
+        if callable(previous):
+            previous(signum, None)
+        elif previous == signal.SIG_DFL:
+            signal.raise_signal(signum)
+
+    def begin() -> None:
+        nonlocal signalled
+        if signalled:
+            hand_on()
+            return
+        signalled = True
+        # The drain may already be running (admin endpoint); either way shut down once it is done.
+        get_voice_drain().start().add_done_callback(lambda _: hand_on())
+
+    def handler(_signum: int, _frame: object) -> None:
+        loop.call_soon_threadsafe(begin)
+
+    signal.signal(signum, handler)
+    try:
+        yield
+    finally:
+        if signal.getsignal(signum) is handler:
+            signal.signal(signum, previous)
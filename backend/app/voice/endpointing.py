@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.config import settings
+from app.services import menu_index_service
+from app.services.menu_index_service import MenuIndex
+from app.voice.fast_path import is_wrap_up_phrase
+
+try:
+    from pipecat.frames.frames import (
+        BotStartedSpeakingFrame,
+        InterimTranscriptionFrame,
+        TranscriptionFrame,
+        VADUserStartedSpeakingFrame,
+        VADUserStoppedSpeakingFrame,
+    )
+    from pipecat.processors.frame_processor import FrameProcessor
+except ImportError:  # pragma: no cover - optional dependency in tests
+    BotStartedSpeakingFrame = None
+    InterimTranscriptionFrame = None
+    TranscriptionFrame = None
+    VADUserStartedSpeakingFrame = None
+    VADUserStoppedSpeakingFrame = None
+    FrameProcessor = object
+
+logger = logging.getLogger("voice.endpointing")
+
+_DEFAULT_KEY = "default"
+# Speech resuming this soon after an endpoint, before the bot answered, means we cut the caller off.
+_RESUME_WINDOW_SECONDS = 1.0
+_LEARN_EVERY = 20
+_LEARN_STEP_SECONDS = 0.05
+
+_TRAILING_WORDS = frozenset({
+    "and", "or", "with", "without", "plus", "also", "a", "an", "the", "some", "of", "to", "for", "no", "extra",
+    "uh", "um", "er", "like", "want", "get", "have", "i", "i'd", "i'll", "can", "could", "maybe",
+    "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten", "dozen", "large", "small", "medium",
+})
+_CLOSING_WORDS = frozenset({"please", "thanks", "thank", "thx"})
+
+COMPLETE = "complete"
+INCOMPLETE = "incomplete"
+NEUTRAL = "neutral"
+
+
+def classify_partial(text: str, index: MenuIndex | None) -> str:
+    """
+    Guess whether an interim transcript is a finished turn.
+
+    Ends in a menu item, a closing word or "that's it" -> complete; ends in a number, a
+    connective ("and", "with") or a filler -> incomplete; anything else -> neutral.
+    """
+
+    words = re.findall(r"[a-z0-9']+", text.lower())
+    if not words:
+        return NEUTRAL
+    if index is not None and index.ends_with_item(text):
+        return COMPLETE
+    if words[-1] in _TRAILING_WORDS or words[-1].isdigit():
+        return INCOMPLETE
+    if text.rstrip().endswith("?") or words[-1] in _CLOSING_WORDS or is_wrap_up_phrase(text):
+        return COMPLETE
+    return NEUTRAL
+
+
+@dataclass
+class StoreEndpointing:
+    stop_secs: float
+    endpoints: int = 0
+    premature: int = 0
+    saved_ms_total: float = 0.0
+    window_endpoints: int = 0
+    window_premature: int = 0
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "stop_secs": round(self.stop_secs, 3),
+            "endpoints": self.endpoints,
+            "premature_rate": round(self.premature / self.endpoints, 4) if self.endpoints else 0.0,
+            "avg_saved_ms": round(self.saved_ms_total / self.endpoints, 1) if self.endpoints else 0.0,
+        }
+
+
+class EndpointingStats:
+    """
+    Per-store endpointing outcomes, and the per-store default silence window learned from them.
+
+    Every `_LEARN_EVERY` endpoints a store's default moves one step: up when callers were cut off
+    more often than the target rate, down when well under it.
+    """
+
+    def __init__(self, *, baseline_secs: float, min_secs: float, max_secs: float, target_premature_rate: float) -> None:
+        self._baseline = baseline_secs
+        self._min = min_secs
+        self._max = max_secs
+        self._target = target_premature_rate
+        self._lock = threading.Lock()
+        self._stores: dict[str, StoreEndpointing] = {}
+
+    def _store(self, store_id: uuid.UUID | None) -> StoreEndpointing:
+        key = str(store_id) if store_id is not None else _DEFAULT_KEY
+        return self._stores.setdefault(key, StoreEndpointing(stop_secs=self._baseline))
+
+    def default_stop_secs(self, store_id: uuid.UUID | None) -> float:
+        with self._lock:
+            return self._store(store_id).stop_secs
+
+    def bounds(self) -> tuple[float, float]:
+        return self._min, self._max
+
+    def record_endpoint(self, store_id: uuid.UUID | None, *, stop_secs: float) -> None:
+        with self._lock:
+            store = self._store(store_id)
+            store.endpoints += 1
+            store.window_endpoints += 1
+            store.saved_ms_total += (self._baseline - stop_secs) * 1000
+            if store.window_endpoints < _LEARN_EVERY:
+                return
+            rate = store.window_premature / store.window_endpoints
+            if rate > self._target:
+                store.stop_secs = min(self._max, store.stop_secs + _LEARN_STEP_SECONDS)
+            elif rate < self._target / 2:
+                store.stop_secs = max(self._min, store.stop_secs - _LEARN_STEP_SECONDS)
+            store.window_endpoints = store.window_premature = 0
+        logger.info("voice_endpointing_learned", extra={"store_id": str(store_id), "stop_secs": store.stop_secs})
+
+    def record_premature(self, store_id: uuid.UUID | None) -> None:
+        with self._lock:
+            store = self._store(store_id)
+            store.premature += 1
+            store.window_premature += 1
+
+    def as_dict(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "baseline_stop_secs": self._baseline,
+                "stores": {key: store.as_dict() for key, store in sorted(self._stores.items())},
+            }
+
+
+endpointing_stats = EndpointingStats(
+    baseline_secs=settings.voice_vad_stop_secs,
+    min_secs=settings.voice_endpointing_min_stop_secs,
+    max_secs=settings.voice_endpointing_max_stop_secs,
+    target_premature_rate=settings.voice_endpointing_target_premature_rate,
+)
+
+
+class AdaptiveEndpointing:
+    """Drives one session's VAD silence window (`stop_secs`) from what the caller has said so far."""
+
+    def __init__(
+        self,
+        *,
+        vad_analyzer: Any,
+        store_id: uuid.UUID | None,
+        stats: EndpointingStats = endpointing_stats,
+    ) -> None:
+        self._vad = vad_analyzer
+        self._store_id = store_id
+        self._stats = stats
+        self._default = stats.default_stop_secs(store_id)
+        self._stopped_at: float | None = None
+        self._apply(self._default)
+
+    @property
+    def stop_secs(self) -> float:
+        return self._vad.params.stop_secs
+
+    def _apply(self, stop_secs: float) -> None:
+        if self._vad.params.stop_secs != stop_secs:
+            self._vad.set_params(self._vad.params.model_copy(update={"stop_secs": stop_secs}))
+
+    def transcript(self, text: str, index: MenuIndex | None) -> str:
+        kind = classify_partial(text, index)
+        low, high = self._stats.bounds()
+        self._apply({COMPLETE: low, INCOMPLETE: high}.get(kind, self._default))
+        return kind
+
+    def user_started(self) -> None:
+        if self._stopped_at is not None and time.monotonic() - self._stopped_at <= _RESUME_WINDOW_SECONDS:
+            self._stats.record_premature(self._store_id)
+        self._stopped_at = None
+        self._apply(self._default)
+
+    def user_stopped(self) -> None:
+        self._stopped_at = time.monotonic()
+        self._stats.record_endpoint(self._store_id, stop_secs=self.stop_secs)
+
+    def bot_started(self) -> None:
+        self._stopped_at = None
+
+
+class AdaptiveEndpointingProcessor(FrameProcessor):
+    """After STT: retune the VAD silence window on every transcript and learn from endpoint outcomes."""
+
+    def __init__(self, *, endpointing: AdaptiveEndpointing, store_id: uuid.UUID | None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._endpointing = endpointing
+        self._store_id = store_id
+
+    def observe(self, frame: Any) -> None:
+        if isinstance(frame, (InterimTranscriptionFrame, TranscriptionFrame)):
+            index = menu_index_service.peek_menu_index(self._store_id) if self._store_id is not None else None
+            self._endpointing.transcript(frame.text, index)
+        elif isinstance(frame, VADUserStartedSpeakingFrame):
+            self._endpointing.user_started()
+        elif isinstance(frame, VADUserStoppedSpeakingFrame):
+            self._endpointing.user_stopped()
+        elif isinstance(frame, BotStartedSpeakingFrame):
+            self._endpointing.bot_started()
+
+    async def process_frame(self, frame: Any, direction: Any) -> None:
+        await super().process_frame(frame, direction)
+        self.observe(frame)
+        await self.push_frame(frame, direction)
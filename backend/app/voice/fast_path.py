@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any
+
+from app.services.menu_index_service import MenuIndex, MenuIndexEntry
+from app.voice.cart import CartBusyError
+from app.voice.tool_router import VoiceToolContext, VoiceToolRouter
+from app.voice.tools import run_tool_call
+
+try:
+    from pipecat.frames.frames import LLMContextFrame, LLMTextFrame, TTSSpeakFrame
+    from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+except ImportError:  # pragma: no cover - optional dependency in tests
+    LLMContextFrame = None
+    LLMTextFrame = None
+    TTSSpeakFrame = None
+    FrameDirection = None
+    FrameProcessor = object
+
+_NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+}
+_CHECKOUT_PHRASES = (
+    "checkout", "check out", "place my order", "place the order", "submit my order", "submit the order",
+)
+_DONE_PHRASES = (
+    "that's all", "that's it", "that is all", "that is it", "nothing else", "i'm done", "that will be all",
+    "no that's all", "no that's it", "no that is all", "no that is it",
+)
+_REMOVE_PREFIXES = ("remove", "delete", "take off", "take out", "cancel", "drop")
+_ADD_PREFIXES = (
+    "i'd like", "i would like", "i want", "i'll have", "i will have", "i'll take", "can i get", "can i have",
+    "could i get", "could i have", "give me", "get me", "let me get", "let me have", "add", "and", "also",
+)
+_FILLER_PREFIXES = ("yes", "yeah", "yep", "ok", "okay", "sure", "um", "uh", "so")
+_FILLER_SUFFIXES = ("please", "thanks", "thank you")
+# Anything customised or conditional goes to the LLM.
+_COMPLEX_WORDS = frozenset({"without", "with", "extra", "instead", "change", "but", "not", "don't", "only", "make", "if", "no"})
+_QUESTION_PREFIXES = ("what", "how", "do you", "does", "is", "are", "which", "can you", "could you")
+# Only exact names and aliases; a containment match ("coke" -> "Diet Coke") is a guess the LLM should make.
+_EXACT_MATCH = 1.0
+
+
+@dataclass(frozen=True)
+class FastLine:
+    entry: MenuIndexEntry
+    quantity: int
+    # False when the caller named no number ("remove the coke"), so `quantity` is the default of 1.
+    quantity_stated: bool = True
+
+
+@dataclass(frozen=True)
+class FastIntent:
+    kind: str  # "add", "remove", "done", "checkout"
+    lines: tuple[FastLine, ...]
+    confidence: float
+
+
+def _clean(text: str) -> str:
+    text = text.lower().replace("’", "'")
+    text = re.sub(r"[^a-z0-9' ]+", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+
+    changed = True
+    while changed and text:
+        changed = False
+        for prefix in _FILLER_PREFIXES:
+            if text == prefix:
+                return ""
+            if text.startswith(prefix + " "):
+                text = text[len(prefix) + 1 :]
+                changed = True
+        for suffix in _FILLER_SUFFIXES:
+            if text.endswith(" " + suffix):
+                text = text[: -len(suffix) - 1]
+                changed = True
+    return text
+
+
+def _strip_prefix(text: str, prefixes: tuple[str, ...]) -> tuple[str, bool]:
+    for prefix in prefixes:
+        if text == prefix:
+            return "", True
+        if text.startswith(prefix + " "):
+            return text[len(prefix) + 1 :], True
+    return text, False
+
+
+def _parse_line(segment: str, index: MenuIndex) -> tuple[FastLine, float] | None:
+    tokens = segment.split()
+    quantity = 1
+    stated = True
+    if tokens and tokens[0].isdigit():
+        quantity = int(tokens[0])
+        tokens = tokens[1:]
+    elif tokens and tokens[0] in _NUMBER_WORDS:
+        quantity = _NUMBER_WORDS[tokens[0]]
+        tokens = tokens[1:]
+    else:
+        stated = False
+    if not tokens or quantity <= 0:
+        return None
+
+    entry, score = index.match(" ".join(tokens))
+    if entry is None or score < _EXACT_MATCH:
+        return None
+    return FastLine(entry=entry, quantity=quantity, quantity_stated=stated), score
+
+
+def _parse_chunk(chunk: str, index: MenuIndex) -> tuple[list[FastLine], float] | None:
+    # "fish and chips" may be one item; only split on conjunctions when the whole isn't one.
+    whole = _parse_line(chunk, index)
+    if whole is not None:
+        return [whole[0]], whole[1]
+
+    parts = [part for part in re.split(r"\s*\b(?:and|plus)\b\s*", chunk) if part]
+    parsed = [_parse_line(part, index) for part in parts]
+    if len(parts) > 1 and all(parsed):
+        return [line for line, _ in parsed], min(score for _, score in parsed)
+    return None
+
+
+def _parse_lines(text: str, index: MenuIndex) -> tuple[list[FastLine], float] | None:
+    chunks = [chunk.strip() for chunk in re.split(r"\s*\b(?:also)\b\s*", text) if chunk.strip()]
+    if not chunks:
+        return None
+
+    lines: list[FastLine] = []
+    confidence = 1.0
+    for chunk in chunks:
+        parsed = _parse_chunk(chunk, index)
+        if parsed is None:
+            return None
+        lines.extend(parsed[0])
+        confidence = min(confidence, parsed[1])
+    return lines, confidence
+
+
+def is_wrap_up_phrase(text: str) -> bool:
+    """True for "that's all" / "checkout" style turns, i.e. the caller is finishing the order."""
+
+    cleaned = _clean(text)
+    if cleaned.startswith("i'd like to "):
+        cleaned = cleaned[len("i'd like to ") :]
+    return cleaned in _DONE_PHRASES or cleaned in _CHECKOUT_PHRASES
+
+
+def parse_simple_intent(text: str, index: MenuIndex) -> FastIntent | None:
+    """Parse short, unambiguous ordering turns; anything else returns None and goes to the LLM."""
+
+    if "?" in text:
+        return None
+    cleaned = _clean(text)
+    if not cleaned or cleaned.startswith(_QUESTION_PREFIXES):
+        return None
+
+    if cleaned in _CHECKOUT_PHRASES or cleaned in {f"i'd like to {p}" for p in _CHECKOUT_PHRASES}:
+        return FastIntent(kind="checkout", lines=(), confidence=1.0)
+    if cleaned in _DONE_PHRASES:
+        return FastIntent(kind="done", lines=(), confidence=1.0)
+
+    if _COMPLEX_WORDS.intersection(cleaned.split()):
+        return None
+
+    remainder, is_remove = _strip_prefix(cleaned, _REMOVE_PREFIXES)
+    kind = "remove"
+    if not is_remove:
+        remainder, _ = _strip_prefix(cleaned, _ADD_PREFIXES)
+        kind = "add"
+
+    parsed = _parse_lines(remainder, index)
+    if parsed is None:
+        return None
+    lines, confidence = parsed
+    return FastIntent(kind=kind, lines=tuple(lines), confidence=confidence)
+
+
+def _money(value: Decimal) -> str:
+    return f"${value:.2f}"
+
+
+def _describe(lines: list[tuple[str, int]]) -> str:
+    parts = [f"{quantity} {name}" for name, quantity in lines]
+    if len(parts) > 1:
+        return ", ".join(parts[:-1]) + f" and {parts[-1]}"
+    return parts[0] if parts else "nothing"
+
+
+def execute_fast_intent(intent: FastIntent, router: VoiceToolRouter) -> str | None:
+    """Apply `intent` through the tool router and return the reply to speak, or None to defer to the LLM."""
+
+    if intent.kind == "add":
+        result = router.add_items(
+            items=[{"menu_item_id": line.entry.menu_item_id, "quantity": line.quantity} for line in intent.lines]
+        )
+        if not result.get("ok") or result.get("not_found"):
+            return None
+        added = _describe([(line.entry.name, line.quantity) for line in intent.lines])
+        return f"Added {added}. Anything else?"
+
+    if intent.kind == "remove":
+        order = router.get_summary().get("order")
+        in_cart: dict[Any, list[dict[str, Any]]] = {}
+        for item in order["items"] if order else []:
+            in_cart.setdefault(item["menu_item_id"], []).append(item)
+        changes: list[dict[str, Any]] = []
+        removed: list[tuple[str, int]] = []
+        for line in intent.lines:
+            items = in_cart.pop(line.entry.menu_item_id, [])
+            if not items:
+                return None
+            if not line.quantity_stated:
+                # "remove the fries" drops every fries line.
+                changes.extend({"order_item_id": item["order_item_id"], "quantity": 0} for item in items)
+                removed.append((line.entry.name, sum(item["quantity"] for item in items)))
+                continue
+            # "remove one fries" takes one off; which line to take it from is the LLM's call.
+            if len(items) > 1 or line.quantity > items[0]["quantity"]:
+                return None
+            item = items[0]
+            changes.append({"order_item_id": item["order_item_id"], "quantity": item["quantity"] - line.quantity})
+            removed.append((line.entry.name, line.quantity))
+        result = router.update_quantities(items=changes)
+        if not result.get("ok") or result.get("not_found"):
+            return None
+        return f"Removed {_describe(removed)}. Anything else?"
+
+    if intent.kind == "done":
+        order = router.get_summary().get("order")
+        if not order or not order["items"]:
+            return None
+        items = _describe([(item["name"], item["quantity"]) for item in order["items"]])
+        return f"You have {items}, for a total of {_money(order['total'])}. Would you like to check out?"
+
+    if intent.kind == "checkout":
+        result = router.checkout()
+        if not result.get("ok"):
+            return None
+        return f"Your order is submitted. The total is {_money(result['order']['total'])}. Thank you!"
+
+    return None
+
+
+@dataclass
+class FastPathStats:
+    turns: int = 0
+    fast_turns: int = 0
+    fast_ms_total: float = 0.0
+    llm_turns: int = 0
+    llm_ms_total: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_fast(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.turns += 1
+            self.fast_turns += 1
+            self.fast_ms_total += elapsed_ms
+
+    def record_llm_forwarded(self) -> None:
+        with self._lock:
+            self.turns += 1
+
+    def record_llm_latency(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.llm_turns += 1
+            self.llm_ms_total += elapsed_ms
+
+    def as_dict(self) -> dict[str, object]:
+        with self._lock:
+            avg_fast = self.fast_ms_total / self.fast_turns if self.fast_turns else 0.0
+            avg_llm = self.llm_ms_total / self.llm_turns if self.llm_turns else 0.0
+            return {
+                "turns": self.turns,
+                "fast_turns": self.fast_turns,
+                "fast_fraction": round(self.fast_turns / self.turns, 4) if self.turns else 0.0,
+                "avg_fast_ms": round(avg_fast, 2),
+                "avg_llm_first_token_ms": round(avg_llm, 2),
+                "estimated_saved_ms": round(max(avg_llm - avg_fast, 0.0) * self.fast_turns, 2),
+            }
+
+
+fast_path_stats = FastPathStats()
+
+
+class LLMFirstTokenTimer(FrameProcessor):
+    """Sits after the LLM and times context-to-first-token for turns the fast path deferred."""
+
+    def __init__(self, *, stats: FastPathStats, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._stats = stats
+        self._started_at: float | None = None
+
+    def mark_started(self) -> None:
+        self._started_at = time.perf_counter()
+
+    async def process_frame(self, frame: Any, direction: Any) -> None:
+        await super().process_frame(frame, direction)
+        if self._started_at is not None and isinstance(frame, LLMTextFrame):
+            self._stats.record_llm_latency((time.perf_counter() - self._started_at) * 1000)
+            self._started_at = None
+        await self.push_frame(frame, direction)
+
+
+class FastPathProcessor(FrameProcessor):
+    """Between the user aggregator and the LLM: answer simple turns directly through the tool router."""
+
+    def __init__(
+        self,
+        *,
+        context: VoiceToolContext,
+        timer: LLMFirstTokenTimer,
+        min_confidence: float,
+        stats: FastPathStats = fast_path_stats,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._context = context
+        self._timer = timer
+        self._min_confidence = min_confidence
+        self._stats = stats
+
+    def _last_user_text(self, llm_context: Any) -> str | None:
+        messages = llm_context.get_messages()
+        if not messages:
+            return None
+        last = messages[-1]
+        if not isinstance(last, dict) or last.get("role") != "user" or not isinstance(last.get("content"), str):
+            return None
+        return last["content"]
+
+    def _try_fast_path(self, router: VoiceToolRouter, *, text: str) -> str | None:
+        index = router.menu_index()
+        intent = parse_simple_intent(text, index)
+        if intent is None or intent.confidence < self._min_confidence:
+            return None
+        try:
+            return execute_fast_intent(intent, router)
+        except CartBusyError:
+            # Let the LLM turn surface the tool error to the caller.
+            return None
+
+    async def process_frame(self, frame: Any, direction: Any) -> None:
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, LLMContextFrame) and direction == FrameDirection.DOWNSTREAM:
+            started = time.perf_counter()
+            text = self._last_user_text(frame.context)
+            reply = None
+            if text is not None:
+                reply = await run_tool_call(self._context, "fast_path", self._try_fast_path, text=text)
+            if reply is not None:
+                frame.context.add_message({"role": "assistant", "content": reply})
+                await self.push_frame(TTSSpeakFrame(text=reply, append_to_context=False))
+                self._stats.record_fast((time.perf_counter() - started) * 1000)
+                return
+            self._stats.record_llm_forwarded()
+            self._timer.mark_started()
+
+        await self.push_frame(frame, direction)
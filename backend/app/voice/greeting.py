@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+from app.voice.config import GoogleVoiceConfig, VoiceRuntimeConfig
+
+try:
+    from google.cloud import texttospeech_v1
+    from google.oauth2 import service_account
+except ImportError:  # pragma: no cover - installed with pipecat-ai[google]
+    texttospeech_v1 = None
+    service_account = None
+
+try:
+    from pipecat.frames.frames import OutputAudioRawFrame, StartFrame
+    from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+except ImportError:  # pragma: no cover - optional dependency in tests
+    OutputAudioRawFrame = None
+    StartFrame = None
+    FrameDirection = None
+    FrameProcessor = object
+
+logger = logging.getLogger("voice.greeting")
+
+GREETING_PROMPT = "Greet me and ask what I want to order."
+_WAV_HEADER_BYTES = 44
+
+
+@dataclass(frozen=True)
+class GreetingAudio:
+    text: str
+    audio: bytes
+    sample_rate: int
+
+
+def build_greeting_text(store_name: str | None) -> str:
+    if store_name:
+        return f"Hi, thanks for calling {store_name}! What can I get for you today?"
+    return "Hi, thanks for calling! What can I get for you today?"
+
+
+def greeting_cache_path(*, store_id: uuid.UUID, voice_id: str, sample_rate: int, text: str) -> Path:
+    digest = hashlib.sha256(f"{voice_id}|{sample_rate}|{text}".encode("utf-8")).hexdigest()[:16]
+    return Path(settings.voice_audio_cache_dir) / "greetings" / str(store_id) / f"{digest}.pcm"
+
+
+async def render_greeting_audio(
+    *,
+    text: str,
+    runtime: VoiceRuntimeConfig,
+    google_config: GoogleVoiceConfig,
+) -> bytes:
+    """Synthesize `text` once as raw 16-bit mono PCM at the pipeline output rate."""
+
+    if texttospeech_v1 is None:
+        raise RuntimeError("google-cloud-texttospeech is required to render greetings")
+
+    credentials = service_account.Credentials.from_service_account_file(google_config.credentials_path)
+    client = texttospeech_v1.TextToSpeechAsyncClient(credentials=credentials)
+    response = await client.synthesize_speech(
+        request=texttospeech_v1.SynthesizeSpeechRequest(
+            input=texttospeech_v1.SynthesisInput(text=text),
+            voice=texttospeech_v1.VoiceSelectionParams(
+                language_code=runtime.tts_language,
+                name=runtime.tts_voice_id,
+            ),
+            audio_config=texttospeech_v1.AudioConfig(
+                audio_encoding=texttospeech_v1.AudioEncoding.LINEAR16,
+                sample_rate_hertz=runtime.audio_out_sample_rate_hz,
+            ),
+        )
+    )
+    return response.audio_content[_WAV_HEADER_BYTES:]
+
+
+def _write_atomic(path: Path, audio: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(audio)
+    os.replace(tmp_path, path)
+
+
+_memory: dict[Path, GreetingAudio] = {}
+_rendering: set[Path] = set()
+
+
+async def _render_and_store(
+    *,
+    path: Path,
+    text: str,
+    runtime: VoiceRuntimeConfig,
+    google_config: GoogleVoiceConfig,
+) -> None:
+    try:
+        audio = await render_greeting_audio(text=text, runtime=runtime, google_config=google_config)
+        await asyncio.to_thread(_write_atomic, path, audio)
+        _memory[path] = GreetingAudio(text=text, audio=audio, sample_rate=runtime.audio_out_sample_rate_hz)
+    except Exception:
+        logger.exception("voice_greeting_render_failed", extra={"path": str(path)})
+    finally:
+        _rendering.discard(path)
+
+
+async def get_greeting_audio(
+    *,
+    store_id: uuid.UUID,
+    store_name: str | None,
+    runtime: VoiceRuntimeConfig,
+    google_config: GoogleVoiceConfig,
+) -> GreetingAudio | None:
+    """
+    Return the store's pre-rendered greeting, or None if it is not on disk yet.
+
+    A miss schedules a background render so the next session for the store hits the cache;
+    the caller falls back to an LLM-generated greeting for this session.
+    """
+
+    text = build_greeting_text(store_name)
+    path = greeting_cache_path(
+        store_id=store_id,
+        voice_id=runtime.tts_voice_id,
+        sample_rate=runtime.audio_out_sample_rate_hz,
+        text=text,
+    )
+
+    cached = _memory.get(path)
+    if cached is not None:
+        return cached
+
+    if await asyncio.to_thread(path.exists):
+        audio = await asyncio.to_thread(path.read_bytes)
+        greeting = GreetingAudio(text=text, audio=audio, sample_rate=runtime.audio_out_sample_rate_hz)
+        _memory[path] = greeting
+        return greeting
+
+    if path not in _rendering and google_config.credentials_path:
+        _rendering.add(path)
+        asyncio.get_running_loop().create_task(
+            _render_and_store(path=path, text=text, runtime=runtime, google_config=google_config)
+        )
+    return None
+
+
+def greeting_audio_chunks(greeting: GreetingAudio, *, chunk_ms: int = 100) -> list[bytes]:
+    chunk_bytes = int(greeting.sample_rate * chunk_ms / 1000) * 2
+    return [greeting.audio[i : i + chunk_bytes] for i in range(0, len(greeting.audio), chunk_bytes)]
+
+
+class GreetingPlayer(FrameProcessor):
+    """
+    Right after TTS: plays the pre-rendered greeting once the pipeline starts.
+
+    Injected here rather than queued at the head of the pipeline, where the audio would run
+    through the input transport and STT as if the caller had said it.
+    """
+
+    def __init__(self, *, greeting: GreetingAudio, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._greeting = greeting
+
+    async def process_frame(self, frame: Any, direction: Any) -> None:
+        await super().process_frame(frame, direction)
+        await self.push_frame(frame, direction)
+
+        if isinstance(frame, StartFrame):
+            for chunk in greeting_audio_chunks(self._greeting):
+                await self.push_frame(
+                    OutputAudioRawFrame(audio=chunk, sample_rate=self._greeting.sample_rate, num_channels=1),
+                    FrameDirection.DOWNSTREAM,
+                )
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+import fcntl
+import json
+import os
 import time
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Callable, TypeVar
 
 from app.core.time import utcnow_naive
 
+T = TypeVar("T")
+
 
 @dataclass
 class TokenBucket:
@@ -20,17 +27,126 @@ class TokenBucket:
         if self.last_refill is None:
             self.last_refill = time.monotonic()
 
-    def allow(self, cost: float = 1.0) -> bool:
+    def _refill(self) -> None:
         now = time.monotonic()
         elapsed = now - (self.last_refill or now)
         refill = elapsed * self.refill_per_second
         self.tokens = min(self.capacity, (self.tokens or 0.0) + refill)
         self.last_refill = now
+
+    def allow(self, cost: float = 1.0) -> bool:
+        self._refill()
         if (self.tokens or 0.0) < cost:
             return False
         self.tokens = (self.tokens or 0.0) - cost
         return True
 
+    def wait_time(self, cost: float = 1.0) -> float:
+        """Seconds until `cost` tokens are available; 0 if they already are."""
+
+        self._refill()
+        missing = cost - (self.tokens or 0.0)
+        if missing <= 0:
+            return 0.0
+        return missing / self.refill_per_second if self.refill_per_second > 0 else float("inf")
+
+    def take(self, cost: float = 1.0) -> float:
+        """Take `cost` tokens and return 0 when available; otherwise take nothing and return the wait."""
+
+        # Base-class calls only: SharedTokenBucket runs this whole method under one file lock.
+        wait = TokenBucket.wait_time(self, cost)
+        if wait == 0:
+            self.tokens = (self.tokens or 0.0) - cost
+        return wait
+
+    async def take_async(self, cost: float = 1.0) -> float:
+        return self.take(cost)
+
+
+@dataclass
+class SharedTokenBucket(TokenBucket):
+    """
+    TokenBucket whose state lives in a small flock-guarded file, so worker processes on one host share it.
+
+    time.monotonic() is system-wide on Linux, so refill timestamps are comparable across processes.
+    """
+
+    path: str = ""
+
+    def _locked(self, fn: Callable[[], T]) -> T:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a+", encoding="utf-8") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                raw = handle.read()
+                if raw:
+                    state = json.loads(raw)
+                    self.tokens = float(state["tokens"])
+                    self.last_refill = float(state["last_refill"])
+                result = fn()
+                handle.seek(0)
+                handle.truncate()
+                handle.write(json.dumps({"tokens": self.tokens, "last_refill": self.last_refill}))
+                handle.flush()
+                return result
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def allow(self, cost: float = 1.0) -> bool:
+        return self._locked(lambda: TokenBucket.allow(self, cost))
+
+    def wait_time(self, cost: float = 1.0) -> float:
+        return self._locked(lambda: TokenBucket.wait_time(self, cost))
+
+    def take(self, cost: float = 1.0) -> float:
+        return self._locked(lambda: TokenBucket.take(self, cost))
+
+    async def take_async(self, cost: float = 1.0) -> float:
+        # flock and file I/O block; keep them off the event loop.
+        return await asyncio.to_thread(self.take, cost)
+
 
 def ensure_max_duration(*, started_at: datetime, max_seconds: int) -> bool:
     return (utcnow_naive() - started_at).total_seconds() <= max_seconds
+
+
+MAX_DURATION = "max_duration"
+PAYLOAD_TOO_LARGE = "payload_too_large"
+IDLE = "idle"
+
+
+@dataclass
+class SessionWatch:
+    """
+    Per-session transport limits: total duration, size of one inbound audio frame, and time since
+    the last inbound audio. Clients stream audio (silence included) continuously, so a gap of
+    `idle_seconds` means the peer stalled or vanished without closing. A limit of 0 disables it.
+    """
+
+    max_seconds: int
+    max_payload_bytes: int
+    idle_seconds: int
+    started_at: datetime | None = None
+    last_audio: float | None = None
+
+    def start(self) -> None:
+        self.started_at = utcnow_naive()
+        self.last_audio = time.monotonic()
+
+    def audio(self, size: int) -> str | None:
+        """Note an inbound audio frame of `size` bytes; returns the violated limit, if any."""
+
+        self.last_audio = time.monotonic()
+        if self.max_payload_bytes and size > self.max_payload_bytes:
+            return PAYLOAD_TOO_LARGE
+        return None
+
+    def check(self) -> str | None:
+        if self.started_at is None:
+            return None
+        if self.max_seconds and not ensure_max_duration(started_at=self.started_at, max_seconds=self.max_seconds):
+            return MAX_DURATION
+        if self.idle_seconds and time.monotonic() - (self.last_audio or 0.0) > self.idle_seconds:
+            return IDLE
+        return None
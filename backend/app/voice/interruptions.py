@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+try:
+    from pipecat.frames.frames import (
+        BotStartedSpeakingFrame,
+        BotStoppedSpeakingFrame,
+        InterruptionFrame,
+        OutputAudioRawFrame,
+    )
+    from pipecat.processors.frame_processor import FrameProcessor
+except ImportError:  # pragma: no cover - optional dependency in tests
+    BotStartedSpeakingFrame = None
+    BotStoppedSpeakingFrame = None
+    InterruptionFrame = None
+    OutputAudioRawFrame = None
+    FrameProcessor = object
+
+logger = logging.getLogger("voice.interruptions")
+
+_DEFAULT_KEY = "default"
+
+
+def audio_seconds(frame: Any) -> float:
+    """Duration of a 16-bit PCM audio frame."""
+
+    bytes_per_second = frame.sample_rate * frame.num_channels * 2
+    return len(frame.audio) / bytes_per_second if bytes_per_second else 0.0
+
+
+@dataclass
+class _StoreInterruptions:
+    utterances: int = 0
+    interruptions: int = 0
+    interrupted_audio_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "utterances": self.utterances,
+            "interruptions": self.interruptions,
+            "interruption_rate": round(self.interruptions / self.utterances, 4) if self.utterances else 0.0,
+            "interrupted_audio_seconds": round(self.interrupted_audio_seconds, 2),
+            # Each cut second is a second the caller didn't have to wait before their next turn.
+            "avg_latency_saved_ms": (
+                round(self.interrupted_audio_seconds * 1000 / self.interruptions, 1) if self.interruptions else 0.0
+            ),
+        }
+
+
+@dataclass
+class InterruptionStats:
+    _stores: dict[str, _StoreInterruptions] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_utterance(self, store_id: uuid.UUID | None) -> None:
+        with self._lock:
+            self._stores.setdefault(str(store_id or _DEFAULT_KEY), _StoreInterruptions()).utterances += 1
+
+    def record_interruption(self, store_id: uuid.UUID | None, *, cut_seconds: float) -> None:
+        with self._lock:
+            stats = self._stores.setdefault(str(store_id or _DEFAULT_KEY), _StoreInterruptions())
+            stats.interruptions += 1
+            stats.interrupted_audio_seconds += cut_seconds
+
+    def as_dict(self) -> dict[str, object]:
+        with self._lock:
+            totals = _StoreInterruptions()
+            for stats in self._stores.values():
+                totals.utterances += stats.utterances
+                totals.interruptions += stats.interruptions
+                totals.interrupted_audio_seconds += stats.interrupted_audio_seconds
+            return {
+                **totals.as_dict(),
+                "stores": {key: stats.as_dict() for key, stats in sorted(self._stores.items())},
+            }
+
+
+interruption_stats = InterruptionStats()
+
+
+class BargeInTracker:
+    """
+    Follows one session's bot utterances to measure how much audio barge-ins cut off.
+
+    Reply audio produced so far minus the time it has been playing is what an interruption flushes.
+    """
+
+    def __init__(self, *, store_id: uuid.UUID | None, stats: InterruptionStats = interruption_stats) -> None:
+        self._store_id = store_id
+        self._stats = stats
+        self._generated = 0.0
+        self._speaking_since: float | None = None
+
+    def audio_generated(self, seconds: float) -> None:
+        self._generated += seconds
+
+    def bot_started(self) -> None:
+        self._speaking_since = time.monotonic()
+        self._stats.record_utterance(self._store_id)
+
+    def bot_stopped(self) -> None:
+        self._speaking_since = None
+        self._generated = 0.0
+
+    def interrupted(self) -> float | None:
+        """User speech cut the bot off; returns the seconds of reply audio that were dropped."""
+
+        if self._speaking_since is None and not self._generated:
+            return None
+        played = time.monotonic() - self._speaking_since if self._speaking_since is not None else 0.0
+        cut = max(0.0, self._generated - played)
+        self._stats.record_interruption(self._store_id, cut_seconds=cut)
+        logger.info(
+            "voice_barge_in",
+            extra={
+                "store_id": str(self._store_id) if self._store_id else None,
+                "played_seconds": round(played, 2),
+                "cut_seconds": round(cut, 2),
+            },
+        )
+        self._speaking_since = None
+        self._generated = 0.0
+        return cut
+
+
+class BargeInTap(FrameProcessor):
+    """Pass-through probe: after TTS ("tts") it counts reply audio, after the transport ("output") playback and barge-ins."""
+
+    def __init__(self, *, tracker: BargeInTracker, position: str, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._tracker = tracker
+        self._position = position
+
+    def observe(self, frame: Any) -> None:
+        if self._position == "tts":
+            # TTS audio and the pre-rendered greeting alike.
+            if isinstance(frame, OutputAudioRawFrame):
+                self._tracker.audio_generated(audio_seconds(frame))
+        elif self._position == "output":
+            if isinstance(frame, BotStartedSpeakingFrame):
+                self._tracker.bot_started()
+            elif isinstance(frame, BotStoppedSpeakingFrame):
+                self._tracker.bot_stopped()
+            elif isinstance(frame, InterruptionFrame):
+                self._tracker.interrupted()
+
+    async def process_frame(self, frame: Any, direction: Any) -> None:
+        await super().process_frame(frame, direction)
+        self.observe(frame)
+        await self.push_frame(frame, direction)
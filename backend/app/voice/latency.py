@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any
+
+from app.core.config import settings
+
+try:
+    from pipecat.frames.frames import (
+        BotStartedSpeakingFrame,
+        FunctionCallInProgressFrame,
+        FunctionCallResultFrame,
+        InterruptionFrame,
+        LLMTextFrame,
+        MetricsFrame,
+        TranscriptionFrame,
+        TTSAudioRawFrame,
+        UserStoppedSpeakingFrame,
+        VADUserStoppedSpeakingFrame,
+    )
+    from pipecat.metrics.metrics import TTFBMetricsData
+    from pipecat.processors.frame_processor import FrameProcessor
+except ImportError:  # pragma: no cover - optional dependency in tests
+    BotStartedSpeakingFrame = None
+    FunctionCallInProgressFrame = None
+    FunctionCallResultFrame = None
+    InterruptionFrame = None
+    LLMTextFrame = None
+    MetricsFrame = None
+    TranscriptionFrame = None
+    TTSAudioRawFrame = None
+    UserStoppedSpeakingFrame = None
+    VADUserStoppedSpeakingFrame = None
+    TTFBMetricsData = None
+    FrameProcessor = object
+
+logger = logging.getLogger("voice.latency")
+
+_DEFAULT_KEY = "default"
+_PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, -(-len(sorted_samples) * pct // 100))
+    return sorted_samples[int(rank) - 1]
+
+
+class TurnLatencyStats:
+    """Rolling per-store, per-stage latency samples; percentiles are computed on read."""
+
+    def __init__(self, *, window: int) -> None:
+        self._window = max(1, window)
+        self._lock = threading.Lock()
+        self._samples: dict[str, dict[str, deque[float]]] = {}
+
+    def record(self, store_id: uuid.UUID | None, stages: dict[str, float]) -> None:
+        key = str(store_id) if store_id is not None else _DEFAULT_KEY
+        with self._lock:
+            store = self._samples.setdefault(key, {})
+            for stage, value in stages.items():
+                store.setdefault(stage, deque(maxlen=self._window)).append(value)
+
+    def as_dict(self, store_id: uuid.UUID | None = None) -> dict[str, object]:
+        with self._lock:
+            if store_id is not None:
+                selected = {str(store_id): self._samples.get(str(store_id), {})}
+            else:
+                selected = self._samples
+            snapshot = {key: {stage: sorted(values) for stage, values in stages.items()} for key, stages in selected.items()}
+
+        return {
+            key: {
+                stage: {
+                    "count": len(values),
+                    **{f"p{pct}_ms": round(percentile(values, pct), 2) for pct in _PERCENTILES},
+                }
+                for stage, values in sorted(stages.items())
+            }
+            for key, stages in sorted(snapshot.items())
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+turn_latency_stats = TurnLatencyStats(window=settings.voice_latency_window)
+
+
+class TurnLatencyTracker:
+    """
+    Timestamps one session's turns, from the caller going quiet to the bot's first audio out.
+
+    Stage names: stt (VAD stop -> final transcript), llm_first_token, tool (summed tool time),
+    tts_first_audio (previous mark -> first TTS audio), output (TTS audio -> transport playing)
+    and total (time to first audio).
+    """
+
+    def __init__(self, *, store_id: uuid.UUID | None, stats: TurnLatencyStats = turn_latency_stats) -> None:
+        self._store_id = store_id
+        self._stats = stats
+        self._marks: dict[str, float] = {}
+        self._tool_started: float | None = None
+        self._tool_ms = 0.0
+        self._tool_calls = 0
+
+    @property
+    def in_turn(self) -> bool:
+        return "vad_stop" in self._marks
+
+    def _now(self) -> float:
+        return time.perf_counter()
+
+    def user_stopped(self) -> None:
+        # The caller may pause mid-utterance; restart the turn until the bot starts answering.
+        if any(mark in self._marks for mark in ("llm_first_token", "tts_first_audio")):
+            return
+        self._marks = {"vad_stop": self._now()}
+        self._tool_started = None
+        self._tool_ms = 0.0
+        self._tool_calls = 0
+
+    def interrupted(self) -> None:
+        """A barge-in abandoned the reply in progress; the caller's next turn starts fresh."""
+
+        self._marks = {}
+
+    def mark(self, event: str) -> None:
+        if self.in_turn:
+            self._marks.setdefault(event, self._now())
+
+    def tool_started(self) -> None:
+        if self.in_turn:
+            self._tool_started = self._now()
+
+    def tool_finished(self) -> None:
+        if self.in_turn and self._tool_started is not None:
+            now = self._now()
+            self._tool_ms += (now - self._tool_started) * 1000
+            self._tool_calls += 1
+            self._tool_started = None
+            self._marks["tool_end"] = now
+
+    def stages(self) -> dict[str, float]:
+        marks = self._marks
+        stages: dict[str, float] = {}
+
+        def between(name: str, start: float | None, end: float | None) -> None:
+            if start is not None and end is not None:
+                stages[name] = round(max(0.0, (end - start) * 1000), 2)
+
+        vad_stop = marks.get("vad_stop")
+        heard = marks.get("stt_final", vad_stop)
+        between("stt", vad_stop, marks.get("stt_final"))
+        between("llm_first_token", heard, marks.get("llm_first_token"))
+        if self._tool_calls:
+            stages["tool"] = round(self._tool_ms, 2)
+        tts = marks.get("tts_first_audio")
+        if tts is not None:
+            earlier = [
+                t for name, t in marks.items() if name in ("stt_final", "llm_first_token", "tool_end") and t <= tts
+            ]
+            between("tts_first_audio", max(earlier, default=vad_stop), tts)
+        between("output", tts, marks.get("output"))
+        between("total", vad_stop, marks.get("output"))
+        return stages
+
+    def bot_started(self) -> dict[str, float] | None:
+        """The transport started playing: close the turn, record and log its breakdown."""
+
+        if not self.in_turn:
+            return None
+        self.mark("output")
+        stages = self.stages()
+        self._stats.record(self._store_id, stages)
+        logger.info(
+            "voice_turn_latency",
+            extra={"store_id": str(self._store_id) if self._store_id else None, "tool_calls": self._tool_calls, **stages},
+        )
+        self._marks = {}
+        return stages
+
+    def record_ttfb(self, processor: str, seconds: float) -> None:
+        """TTFB reported by a pipecat service's MetricsFrame, e.g. "ttfb.GoogleLLMService"."""
+
+        name = re.sub(r"#\d+$", "", processor)
+        self._stats.record(self._store_id, {f"ttfb.{name}": round(seconds * 1000, 2)})
+
+
+class LatencyTap(FrameProcessor):
+    """
+    Pass-through probe placed at one point in the pipeline; marks the turn events visible there.
+
+    `position` is one of "input", "stt", "llm", "tts" or "output".
+    """
+
+    def __init__(self, *, tracker: TurnLatencyTracker, position: str, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._tracker = tracker
+        self._position = position
+
+    def observe(self, frame: Any) -> None:
+        tracker = self._tracker
+        if self._position == "input":
+            if isinstance(frame, (VADUserStoppedSpeakingFrame, UserStoppedSpeakingFrame)):
+                tracker.user_stopped()
+            elif isinstance(frame, InterruptionFrame):
+                tracker.interrupted()
+        elif self._position == "stt":
+            if isinstance(frame, TranscriptionFrame):
+                tracker.mark("stt_final")
+        elif self._position == "llm":
+            if isinstance(frame, LLMTextFrame):
+                tracker.mark("llm_first_token")
+            elif isinstance(frame, FunctionCallInProgressFrame):
+                tracker.tool_started()
+            elif isinstance(frame, FunctionCallResultFrame):
+                tracker.tool_finished()
+        elif self._position == "tts":
+            if isinstance(frame, TTSAudioRawFrame):
+                tracker.mark("tts_first_audio")
+        elif self._position == "output":
+            if isinstance(frame, BotStartedSpeakingFrame):
+                tracker.bot_started()
+            elif isinstance(frame, MetricsFrame):
+                for data in frame.data:
+                    if isinstance(data, TTFBMetricsData) and data.value:
+                        tracker.record_ttfb(data.processor, data.value)
+
+    async def process_frame(self, frame: Any, direction: Any) -> None:
+        await super().process_frame(frame, direction)
+        self.observe(frame)
+        await self.push_frame(frame, direction)
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.config import settings
+from app.voice.context_window import strip_order_note
+from app.voice.fast_path import is_wrap_up_phrase
+from app.voice.guards import SharedTokenBucket, TokenBucket
+from app.voice.tool_router import VoiceToolContext
+
+try:
+    from pipecat.frames.frames import LLMContextFrame, LLMRunFrame
+    from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+except ImportError:  # pragma: no cover - optional dependency in tests
+    LLMContextFrame = None
+    LLMRunFrame = None
+    FrameDirection = None
+    FrameProcessor = object
+
+logger = logging.getLogger("voice.llm_scheduler")
+
+_DEFAULT_KEY = "default"
+
+
+@dataclass
+class LLMWaitStats:
+    requests: int = 0
+    priority_requests: int = 0
+    wait_ms_total: float = 0.0
+    max_wait_ms: float = 0.0
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "requests": self.requests,
+            "priority_requests": self.priority_requests,
+            "avg_wait_ms": round(self.wait_ms_total / self.requests, 2) if self.requests else 0.0,
+            "max_wait_ms": round(self.max_wait_ms, 2),
+        }
+
+
+@dataclass
+class _Waiter:
+    future: asyncio.Future
+    priority: bool
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class LLMScheduler:
+    """
+    Process-wide gate in front of every LLM request, backed by one token bucket.
+
+    When the bucket is empty, requests queue per store and are granted round-robin across
+    stores, so one busy store can't starve the rest; checkout turns jump the queue.
+    """
+
+    def __init__(self, *, bucket: TokenBucket | None, slow_wait_ms: float) -> None:
+        self._bucket = bucket
+        self._slow_wait_ms = slow_wait_ms
+        self._queues: dict[str, deque[_Waiter]] = {}
+        self._pump: asyncio.Task | None = None
+        self._stats: dict[str, LLMWaitStats] = {}
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _record(self, key: str, waiter: _Waiter) -> None:
+        wait_ms = (time.perf_counter() - waiter.enqueued_at) * 1000
+        stats = self._stats.setdefault(key, LLMWaitStats())
+        stats.requests += 1
+        stats.priority_requests += int(waiter.priority)
+        stats.wait_ms_total += wait_ms
+        stats.max_wait_ms = max(stats.max_wait_ms, wait_ms)
+        if wait_ms >= self._slow_wait_ms:
+            logger.warning(
+                "voice_llm_slow_wait",
+                extra={"store_id": key, "wait_ms": round(wait_ms, 2), "priority": waiter.priority, "queued": self.queued},
+            )
+
+    def _next(self) -> tuple[str, _Waiter] | None:
+        # Stores rotate to the back after each grant, so dict order is the round-robin order.
+        for key, queue in self._queues.items():
+            for waiter in queue:
+                if waiter.priority:
+                    queue.remove(waiter)
+                    return key, waiter
+        for key, queue in self._queues.items():
+            return key, queue.popleft()
+        return None
+
+    def _prune(self) -> None:
+        for queue in self._queues.values():
+            for waiter in [w for w in queue if w.future.done()]:
+                queue.remove(waiter)
+        self._queues = {key: queue for key, queue in self._queues.items() if queue}
+
+    async def _dispatch(self) -> None:
+        # One pump per scheduler; it exits once the queues are empty and acquire() restarts it.
+        while True:
+            self._prune()
+            if not self._queues:
+                return
+            if self._bucket is not None:
+                delay = await self._bucket.take_async()
+                if delay > 0:
+                    await asyncio.sleep(max(delay, 0.001))
+                    continue
+                self._prune()
+                if not self._queues:
+                    # Everyone gave up while the bucket was consulted; the token goes unused.
+                    return
+            key, waiter = self._next()
+            queue = self._queues.pop(key)
+            if queue:
+                self._queues[key] = queue
+            self._record(key, waiter)
+            waiter.future.set_result(None)
+
+    async def acquire(self, store_id: uuid.UUID | None, *, priority: bool = False) -> None:
+        """Wait for this store's turn at the LLM; granted on the next loop pass while the bucket has tokens."""
+
+        key = str(store_id) if store_id is not None else _DEFAULT_KEY
+        waiter = _Waiter(future=asyncio.get_running_loop().create_future(), priority=priority)
+        self._queues.setdefault(key, deque()).append(waiter)
+        if self._pump is None or self._pump.done():
+            self._pump = asyncio.get_running_loop().create_task(self._dispatch())
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            queue = self._queues.get(key)
+            if queue is not None and waiter in queue:
+                queue.remove(waiter)
+            raise
+
+    def stats(self) -> dict[str, object]:
+        totals = LLMWaitStats()
+        for stats in self._stats.values():
+            totals.requests += stats.requests
+            totals.priority_requests += stats.priority_requests
+            totals.wait_ms_total += stats.wait_ms_total
+            totals.max_wait_ms = max(totals.max_wait_ms, stats.max_wait_ms)
+        return {
+            **totals.as_dict(),
+            "queued": self.queued,
+            "stores": {key: stats.as_dict() for key, stats in sorted(self._stats.items())},
+        }
+
+
+def _create_scheduler() -> LLMScheduler:
+    rpm = settings.voice_llm_requests_per_minute
+    bucket: TokenBucket | None = None
+    if rpm > 0:
+        capacity = max(1, settings.voice_llm_burst)
+        if settings.voice_llm_rate_limit_path:
+            bucket = SharedTokenBucket(
+                capacity=capacity, refill_per_second=rpm / 60.0, path=settings.voice_llm_rate_limit_path
+            )
+        else:
+            bucket = TokenBucket(capacity=capacity, refill_per_second=rpm / 60.0)
+    return LLMScheduler(bucket=bucket, slow_wait_ms=settings.voice_llm_slow_wait_ms)
+
+
+_scheduler: LLMScheduler | None = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = _create_scheduler()
+    return _scheduler
+
+
+def _last_user_text(llm_context: Any) -> str:
+    for message in reversed(llm_context.get_messages()):
+        if isinstance(message, dict) and message.get("role") == "user":
+            content = message.get("content")
+            return strip_order_note(content) if isinstance(content, str) else ""
+    return ""
+
+
+def is_checkout_turn(tool_context: VoiceToolContext | None, llm_context: Any | None) -> bool:
+    """A non-empty cart that the caller is wrapping up, or that was just submitted."""
+
+    cart = tool_context.cart if tool_context is not None else None
+    if cart is None or not cart.lines:
+        return False
+    if cart.status != "draft":
+        return True
+    return llm_context is not None and is_wrap_up_phrase(_last_user_text(llm_context))
+
+
+class LLMSchedulerProcessor(FrameProcessor):
+    """
+    Holds each LLM request (LLMContextFrame/LLMRunFrame) until the shared scheduler admits it.
+
+    User turns reach the LLM downstream; the follow-up inference after a function call is pushed
+    UPSTREAM by the assistant aggregator, so a second instance with `upstream=True` sits between
+    the LLM and that aggregator to gate it too.
+    """
+
+    def __init__(
+        self,
+        *,
+        tool_context: VoiceToolContext | None,
+        scheduler: LLMScheduler | None = None,
+        upstream: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._tool_context = tool_context
+        self._scheduler = scheduler or get_llm_scheduler()
+        self._upstream = upstream
+
+    async def process_frame(self, frame: Any, direction: Any) -> None:
+        await super().process_frame(frame, direction)
+        gated = FrameDirection.UPSTREAM if self._upstream else FrameDirection.DOWNSTREAM
+        if direction == gated and isinstance(frame, (LLMContextFrame, LLMRunFrame)):
+            llm_context = frame.context if isinstance(frame, LLMContextFrame) else None
+            await self._scheduler.acquire(
+                self._tool_context.store_id if self._tool_context is not None else None,
+                priority=is_checkout_turn(self._tool_context, llm_context),
+            )
+        await self.push_frame(frame, direction)
@@ -2,9 +2,24 @@ from __future__ import annotations
 
 import asyncio
 import time
+from dataclasses import dataclass, field
 from typing import Any, Awaitable, Callable
 
+from app.core.config import settings
 from app.voice.config import GoogleVoiceConfig, VoiceRuntimeConfig
+from app.voice.context_window import ContextWindowProcessor
+from app.voice.endpointing import AdaptiveEndpointing, AdaptiveEndpointingProcessor
+from app.voice.fast_path import FastPathProcessor, LLMFirstTokenTimer, fast_path_stats
+from app.voice.greeting import GREETING_PROMPT, GreetingAudio, GreetingPlayer
+from app.voice.guards import TokenBucket
+from app.voice.interruptions import BargeInTap, BargeInTracker
+from app.voice.latency import LatencyTap, TurnLatencyTracker
+from app.voice.llm_scheduler import LLMSchedulerProcessor
+from app.voice.sentence_stream import SentenceStreamProcessor
+from app.voice.tool_router import VoiceToolContext
+from app.voice.transports.guard import TransportGuard, session_watch
+from app.voice.tts_cache import CachedGoogleTTSService, get_tts_phrase_cache
+from app.voice.vad import create_vad_analyzer
 
 try:
     from pipecat.adapters.schemas.tools_schema import AdapterType, ToolsSchema
@@ -16,7 +31,6 @@ try:
     from pipecat.processors.filters.stt_mute_filter import STTMuteConfig, STTMuteFilter, STTMuteStrategy
     from pipecat.services.google.llm import GoogleLLMService
     from pipecat.services.google.stt import GoogleSTTService
-    from pipecat.services.google.tts import GoogleTTSService
 except ImportError:  # pragma: no cover - optional dependency during Phase 2.1
     AdapterType = None
     ToolsSchema = None
@@ -32,7 +46,6 @@ except ImportError:  # pragma: no cover - optional dependency during Phase 2.1
     STTMuteStrategy = None
     GoogleLLMService = None
     GoogleSTTService = None
-    GoogleTTSService = None
 
 
 class ConversationLogger:
@@ -48,36 +61,39 @@ class ConversationLogger:
 
 
 class LLMRateLimiter:
+    """
+    Per-pipeline pacing of downstream LLMRunFrames, kept for existing callers.
+
+    New pipelines are gated by the process-wide LLMSchedulerProcessor instead.
+    """
+
     def __init__(self, *, max_requests_per_minute: float) -> None:
         if max_requests_per_minute <= 0:
             raise ValueError("max_requests_per_minute must be > 0")
-        self._interval_secs = 60.0 / float(max_requests_per_minute)
-        self._next_allowed_time = 0.0
+        self._bucket = TokenBucket(capacity=1, refill_per_second=max_requests_per_minute / 60.0)
 
     async def process(self, frame: Any, direction: Any, push: Callable[[Any, Any], Awaitable[None]]) -> None:
         is_llm_run = frame.__class__.__name__ == "LLMRunFrame"
         if is_llm_run and str(direction).lower().endswith("downstream"):
-            now = time.monotonic()
-            sleep_for = self._next_allowed_time - now
-            if sleep_for > 0:
-                await asyncio.sleep(sleep_for)
-            self._next_allowed_time = max(self._next_allowed_time, time.monotonic()) + self._interval_secs
+            while (wait := await self._bucket.take_async()) > 0:
+                await asyncio.sleep(wait)
         await push(frame, direction)
 
 
-def create_voice_pipeline_task(
-    *,
-    transport: Any,
-    runtime: VoiceRuntimeConfig,
-    google_config: GoogleVoiceConfig,
-    system_prompt: str,
-    tool_schema: Any,
-    tool_handlers: dict[str, Callable[[Any], Awaitable[Any]]] | None = None,
-    max_rpm: float = 5.0,
-    enable_metrics: bool = True,
-) -> Any:
+@dataclass
+class VoiceServiceBundle:
+    """Provider services and VAD analyzer for exactly one session (a resumed session keeps its own); never shared."""
+
+    stt: Any
+    tts: Any
+    llm: Any
+    vad_analyzer: Any
+    created_at: float = field(default_factory=time.monotonic)
+
+
+def create_voice_services(*, runtime: VoiceRuntimeConfig, google_config: GoogleVoiceConfig) -> VoiceServiceBundle:
     """
-    Build a pipecat PipelineTask for a single voice session.
+    Construct authenticated provider clients and a loaded VAD analyzer.
 
     Providers are selected via `runtime`; only Google providers are wired in Phase 2.1.
     """
@@ -93,31 +109,161 @@ def create_voice_pipeline_task(
     if Pipeline is None:
         raise RuntimeError("pipecat is required for voice pipeline")
 
-    stt = GoogleSTTService(credentials_path=google_config.credentials_path)
-    tts = GoogleTTSService(credentials_path=google_config.credentials_path)
-    llm = GoogleLLMService(api_key=google_config.api_key, model=runtime.llm_model)
+    return VoiceServiceBundle(
+        stt=GoogleSTTService(credentials_path=google_config.credentials_path),
+        tts=CachedGoogleTTSService(
+            cache=get_tts_phrase_cache(),
+            credentials_path=google_config.credentials_path,
+            voice_id=runtime.tts_voice_id,
+            # The pipeline's SentenceStreamProcessor already hands TTS speakable chunks.
+            aggregate_sentences=not settings.voice_tts_sentence_streaming,
+        ),
+        llm=GoogleLLMService(api_key=google_config.api_key, model=runtime.llm_model),
+        vad_analyzer=create_vad_analyzer(),
+    )
+
+
+def create_voice_llm_context(*, system_prompt: str, tool_schema: Any) -> Any:
+    """A fresh conversation context; it outlives the pipeline when a dropped session is parked for resume."""
+
+    tools = ToolsSchema(standard_tools=[], custom_tools={AdapterType.GEMINI: tool_schema})
+    return LLMContext(messages=[{"role": "system", "content": system_prompt}], tools=tools)
+
+
+def create_voice_pipeline_task(
+    *,
+    transport: Any,
+    runtime: VoiceRuntimeConfig,
+    google_config: GoogleVoiceConfig,
+    system_prompt: str,
+    tool_schema: Any,
+    tool_handlers: dict[str, Callable[[Any], Awaitable[Any]]] | None = None,
+    tool_context: VoiceToolContext | None = None,
+    services: VoiceServiceBundle | None = None,
+    greeting: GreetingAudio | None = None,
+    allow_interruptions: bool = False,
+    guard: TransportGuard | None = None,
+    llm_context: Any | None = None,
+    resumed: bool = False,
+    enable_metrics: bool = True,
+) -> Any:
+    """
+    Build a pipecat PipelineTask for a single voice session.
+
+    Pass `services` (e.g. from the warm pool) to skip provider construction on connect,
+    and `greeting` to play pre-rendered audio instead of waiting on an LLM + TTS round trip.
+    With `tool_context`, simple ordering turns are answered by the fast path without the LLM.
+    With `allow_interruptions`, caller speech cancels the reply in flight (LLM, TTS and queued audio).
+    `guard` enforces the session's duration, frame-size and idle limits; one is built from `runtime` if omitted.
+    Pass the `llm_context` of a parked session with `resumed=True` to carry on its conversation without a greeting.
+    """
+
+    if services is None:
+        services = create_voice_services(runtime=runtime, google_config=google_config)
+
+    stt = services.stt
+    tts = services.tts
+    llm = services.llm
 
     if tool_handlers:
         for name, handler in tool_handlers.items():
             llm.register_function(name, handler)
 
-    tools = ToolsSchema(standard_tools=[], custom_tools={AdapterType.GEMINI: tool_schema})
-    context = LLMContext(messages=[{"role": "system", "content": system_prompt}], tools=tools)
+    context = llm_context if llm_context is not None else create_voice_llm_context(
+        system_prompt=system_prompt, tool_schema=tool_schema
+    )
     context_aggregators = LLMContextAggregatorPair(context)
 
-    stt_mute = STTMuteFilter(config=STTMuteConfig(strategies={STTMuteStrategy.ALWAYS}))
-    #rate_limiter = LLMRateLimiter(max_requests_per_minute=max_rpm)
+    # Barge-in only needs the caller muted while a tool call is running; otherwise mute while the bot talks.
+    mute_strategy = STTMuteStrategy.FUNCTION_CALL if allow_interruptions else STTMuteStrategy.ALWAYS
+    stt_mute = STTMuteFilter(config=STTMuteConfig(strategies={mute_strategy}))
+
+    fast_path: list[Any] = []
+    llm_timer: list[Any] = []
+    if tool_context is not None and settings.voice_fast_path_enabled:
+        timer = LLMFirstTokenTimer(stats=fast_path_stats)
+        fast_path = [
+            FastPathProcessor(
+                context=tool_context,
+                timer=timer,
+                min_confidence=settings.voice_fast_path_min_confidence,
+            )
+        ]
+        llm_timer = [timer]
+
+    window_params = dict(
+        system_prompt=system_prompt,
+        tool_context=tool_context,
+        max_tokens=settings.voice_llm_context_max_tokens,
+        min_recent_messages=settings.voice_llm_context_min_recent_messages,
+    )
+    context_window = ContextWindowProcessor(**window_params)
+    # Follow-ups after a function call travel upstream and never pass `context_window`.
+    followup_context_window = ContextWindowProcessor(**window_params, upstream=True)
+
+    # Every session's LLM requests share one process-wide budget, including the upstream
+    # follow-up the assistant aggregator sends after a function call.
+    llm_scheduler = LLMSchedulerProcessor(tool_context=tool_context)
+    llm_followup_scheduler = LLMSchedulerProcessor(tool_context=tool_context, upstream=True)
+
+    endpointing: list[Any] = []
+    if settings.voice_endpointing_enabled and services.vad_analyzer is not None:
+        store_id = tool_context.store_id if tool_context else None
+        endpointing = [
+            AdaptiveEndpointingProcessor(
+                endpointing=AdaptiveEndpointing(vad_analyzer=services.vad_analyzer, store_id=store_id),
+                store_id=store_id,
+            )
+        ]
+
+    if guard is None:
+        guard = TransportGuard(watch=session_watch(runtime), store_id=tool_context.store_id if tool_context else None)
+
+    greeting_player: list[Any] = []
+    if not resumed and greeting is not None and greeting.sample_rate == runtime.audio_out_sample_rate_hz:
+        greeting_player = [GreetingPlayer(greeting=greeting)]
+
+    sentence_stream: list[Any] = []
+    if settings.voice_tts_sentence_streaming:
+        sentence_stream = [SentenceStreamProcessor(min_chars=settings.voice_tts_min_chunk_chars)]
+
+    # Per-turn latency breakdown, from probes between the stages.
+    latency = TurnLatencyTracker(store_id=tool_context.store_id if tool_context else None) if enable_metrics else None
+
+    barge_in = BargeInTracker(store_id=tool_context.store_id if tool_context else None) if allow_interruptions else None
+
+    def tap(position: str) -> list[Any]:
+        taps: list[Any] = []
+        if latency is not None:
+            taps.append(LatencyTap(tracker=latency, position=position))
+        if barge_in is not None and position in ("tts", "output"):
+            taps.append(BargeInTap(tracker=barge_in, position=position))
+        return taps
 
     processors = [
         transport.input(),
+        guard,
+        *tap("input"),
         stt,
+        *tap("stt"),
+        *endpointing,
         stt_mute,
         context_aggregators.user(),
-        #rate_limiter,
+        *fast_path,
+        context_window,
+        llm_scheduler,
         llm,
+        llm_followup_scheduler,
+        followup_context_window,
+        *llm_timer,
+        *tap("llm"),
+        *sentence_stream,
         tts,
+        *greeting_player,
+        *tap("tts"),
         context_aggregators.assistant(),
         transport.output(),
+        *tap("output"),
     ]
 
     pipeline = Pipeline(processors)
@@ -125,7 +271,9 @@ def create_voice_pipeline_task(
     task = PipelineTask(
         pipeline,
         params=PipelineParams(
-            allow_interruptions=False,
+            allow_interruptions=allow_interruptions,
+            audio_in_sample_rate=runtime.audio_sample_rate_hz,
+            audio_out_sample_rate=runtime.audio_out_sample_rate_hz,
             enable_metrics=enable_metrics,
             enable_usage_metrics=enable_metrics,
         ),
@@ -133,10 +281,27 @@ def create_voice_pipeline_task(
 
     @task.event_handler("on_pipeline_started")
     async def on_pipeline_started(task: PipelineTask, frame: Any):
+        if resumed:
+            # The caller is mid-conversation; wait for them to speak.
+            return
+
+        if greeting_player:
+            # Seed the context with the greeting the caller hears (GreetingPlayer), without running the LLM.
+            await task.queue_frames([
+                LLMMessagesAppendFrame(
+                    messages=[
+                        {"role": "user", "content": GREETING_PROMPT},
+                        {"role": "assistant", "content": greeting.text},
+                    ],
+                    run_llm=False,
+                ),
+            ])
+            return
+
         await task.queue_frames([
             LLMMessagesAppendFrame(messages=[{
                 "role": "user",
-                "content": "Greet me and ask what I want to order.",
+                "content": GREETING_PROMPT,
             }]),
             LLMRunFrame(),
         ])
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from app.core.config import settings
+from app.voice.config import GoogleVoiceConfig, VoiceRuntimeConfig, load_google_voice_config, load_voice_runtime_config
+from app.voice.pipeline import VoiceServiceBundle, create_voice_services
+
+logger = logging.getLogger("voice.pool")
+
+
+@dataclass
+class VoicePoolStats:
+    target_size: int
+    idle: int
+    hits: int
+    misses: int
+    refill_failures: int
+    last_build_ms: float | None
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "target_size": self.target_size,
+            "idle": self.idle,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "refill_failures": self.refill_failures,
+            "last_build_ms": self.last_build_ms,
+        }
+
+
+class VoicePipelinePool:
+    """Keep `size` pre-built service bundles ready and refill them in the background."""
+
+    def __init__(
+        self,
+        *,
+        runtime: VoiceRuntimeConfig,
+        google_config: GoogleVoiceConfig,
+        size: int,
+        max_idle_seconds: float,
+    ) -> None:
+        self._runtime = runtime
+        self._google_config = google_config
+        self._size = max(0, size)
+        self._max_idle_seconds = max_idle_seconds
+        self._idle: deque[VoiceServiceBundle] = deque()
+        self._refill_task: asyncio.Task | None = None
+        self._hits = 0
+        self._misses = 0
+        self._refill_failures = 0
+        self._last_build_ms: float | None = None
+
+    async def _build(self) -> VoiceServiceBundle:
+        # Provider clients load credentials and open channels synchronously; keep that off the loop.
+        started = time.perf_counter()
+        bundle = await asyncio.to_thread(
+            create_voice_services, runtime=self._runtime, google_config=self._google_config
+        )
+        self._last_build_ms = round((time.perf_counter() - started) * 1000, 2)
+        return bundle
+
+    def _evict_stale(self) -> None:
+        now = time.monotonic()
+        while self._idle and now - self._idle[0].created_at > self._max_idle_seconds:
+            self._idle.popleft()
+
+    async def _refill(self) -> None:
+        while len(self._idle) < self._size:
+            try:
+                self._idle.append(await self._build())
+            except Exception:
+                self._refill_failures += 1
+                logger.exception("voice_pool_refill_failed")
+                return
+
+    def schedule_refill(self) -> None:
+        if self._size == 0:
+            return
+        if self._refill_task is not None and not self._refill_task.done():
+            return
+        self._refill_task = asyncio.get_running_loop().create_task(self._refill())
+
+    def start(self) -> None:
+        """Begin warming the pool; a no-op until provider credentials are configured."""
+
+        if not self._google_config.api_key or not self._google_config.credentials_path:
+            return
+        self.schedule_refill()
+
+    async def acquire(self) -> VoiceServiceBundle:
+        self._evict_stale()
+        if self._idle:
+            self._hits += 1
+            bundle = self._idle.popleft()
+        else:
+            self._misses += 1
+            bundle = await self._build()
+        self.schedule_refill()
+        return bundle
+
+    async def close(self) -> None:
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+        self._idle.clear()
+
+    def stats(self) -> VoicePoolStats:
+        return VoicePoolStats(
+            target_size=self._size,
+            idle=len(self._idle),
+            hits=self._hits,
+            misses=self._misses,
+            refill_failures=self._refill_failures,
+            last_build_ms=self._last_build_ms,
+        )
+
+
+_pool: VoicePipelinePool | None = None
+
+
+def get_voice_pipeline_pool() -> VoicePipelinePool:
+    global _pool
+    if _pool is None:
+        _pool = VoicePipelinePool(
+            runtime=load_voice_runtime_config(),
+            google_config=load_google_voice_config(),
+            size=settings.voice_pool_size,
+            max_idle_seconds=settings.voice_pool_max_idle_seconds,
+        )
+    return _pool
@@ -1,7 +1,21 @@
 from __future__ import annotations
 
+import hashlib
+import logging
+import threading
+import uuid
+from dataclasses import dataclass
 from typing import Iterable
 
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.menu_item import MenuItem
+from app.services import menu_index_service, menu_service
+from app.voice.tool_results import estimate_tokens
+
+logger = logging.getLogger("voice.prompts")
+
 
 def build_system_prompt(menu_lines: Iterable[str] | None = None) -> str:
     menu_text = ""
@@ -14,6 +28,7 @@ Keep responses short (1-2 sentences).
 
 Rules:
 - Never claim you added/removed items unless a tool confirms it.
+- When the user orders or changes several items at once, use add_items, remove_items or update_quantities in a single call.
 - If the user says something unclear, ask a short clarification question.
 - When the user is done, ask if they want to checkout.
 """.strip()
@@ -22,3 +37,139 @@ Rules:
         prompt = f"{prompt}\n\nMenu:\n{menu_text}"
 
     return prompt
+
+
+_MAX_MODIFIER_OPTIONS = 4
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    text: str
+    store_id: uuid.UUID
+    menu_id: uuid.UUID | None
+    menu_version: int | None
+    menu_signature: menu_index_service.MenuSignature
+    prefix_hash: str
+    tokens: int
+
+
+def _modifier_text(modifiers: dict[str, object] | None) -> str:
+    parts = []
+    for key, value in sorted((modifiers or {}).items()):
+        if key == "aliases":
+            continue
+        if isinstance(value, dict):
+            value = list(value)
+        if isinstance(value, list):
+            options = [str(option) for option in value]
+            shown = "/".join(options[:_MAX_MODIFIER_OPTIONS])
+            if len(options) > _MAX_MODIFIER_OPTIONS:
+                shown += f"/+{len(options) - _MAX_MODIFIER_OPTIONS}"
+            parts.append(f"{key}: {shown}")
+        elif value is not None:
+            parts.append(f"{key}: {value}")
+    return "; ".join(parts)
+
+
+def render_menu_lines(items: Iterable[MenuItem], *, max_tokens: int, with_modifiers: bool = True) -> list[str]:
+    """
+    Compact menu grouped by first tag, one line per item, sold-out items listed separately.
+
+    Output is deterministic for a given menu so the prompt prefix stays byte-stable.
+    """
+
+    groups: dict[str, list[MenuItem]] = {}
+    sold_out: list[str] = []
+    for item in items:
+        if not item.availability:
+            sold_out.append(item.name)
+            continue
+        group = (item.tags or ["Other"])[0]
+        groups.setdefault(str(group).title(), []).append(item)
+
+    lines: list[str] = []
+    for group in sorted(groups):
+        lines.append(f"{group}:")
+        for item in sorted(groups[group], key=lambda i: i.name.lower()):
+            line = f"- {item.name} ${item.price:.2f}"
+            modifiers = _modifier_text(item.modifiers) if with_modifiers else ""
+            if modifiers:
+                line += f" ({modifiers})"
+            lines.append(line)
+    if sold_out:
+        lines.append("Sold out today: " + ", ".join(sorted(sold_out, key=str.lower)))
+
+    if estimate_tokens("\n".join(lines)) <= max_tokens:
+        return lines
+    if with_modifiers:
+        return render_menu_lines(items, max_tokens=max_tokens, with_modifiers=False)
+
+    kept: list[str] = []
+    for i, line in enumerate(lines):
+        if estimate_tokens("\n".join(kept + [line])) > max_tokens:
+            kept.append(f"...and {len(lines) - i} more lines; use the tools to look items up by name.")
+            break
+        kept.append(line)
+    return kept
+
+
+_lock = threading.Lock()
+_compiled: dict[uuid.UUID, CompiledPrompt] = {}
+
+
+def _drop_compiled(store_id: uuid.UUID) -> None:
+    with _lock:
+        _compiled.pop(store_id, None)
+
+
+menu_index_service.add_invalidation_listener(_drop_compiled)
+
+
+def compile_store_prompt(db: Session, *, store_id: uuid.UUID) -> CompiledPrompt:
+    """
+    System prompt for a store with its active menu, cached until the store's menu signature changes.
+
+    The prompt only depends on the menu, so every session of a store sends a byte-identical
+    prefix (per-turn state such as the cart rides on the latest user message instead). That is
+    what lets provider-side implicit prefix caching apply; no explicit context cache is created.
+    `prefix_hash` is logged so the stability can be checked.
+    """
+
+    with _lock:
+        cached = _compiled.get(store_id)
+    # While the menu index is fresh its signature is as current as a query would be.
+    index = menu_index_service.fresh_menu_index(store_id)
+    if cached is not None and index is not None and index.version == cached.menu_signature:
+        return cached
+
+    # Item edits (possibly from another process) don't bump the menu version; the signature sees them.
+    signature = menu_index_service.load_menu_signature(db, store_id=store_id)
+    if cached is not None and cached.menu_signature == signature:
+        return cached
+
+    menu = menu_service.get_menu_by_version(db, store_id=store_id, version=None)
+    menu_id = menu.id if menu else None
+    menu_version = menu.version if menu else None
+
+    menu_lines = None
+    if menu is not None:
+        items = menu_service.list_menu_items(db, menu_id=menu.id)
+        menu_lines = render_menu_lines(items, max_tokens=settings.voice_prompt_menu_max_tokens)
+
+    text = build_system_prompt(menu_lines)
+    compiled = CompiledPrompt(
+        text=text,
+        store_id=store_id,
+        menu_id=menu_id,
+        menu_version=menu_version,
+        menu_signature=signature,
+        prefix_hash=hashlib.sha256(text.encode("utf-8")).hexdigest()[:16],
+        tokens=estimate_tokens(text),
+    )
+    with _lock:
+        _compiled[store_id] = compiled
+    logger.info(
+        "voice_prompt_compiled",
+        extra={"store_id": str(store_id), "menu_version": menu_version, "tokens": compiled.tokens, "prefix": compiled.prefix_hash},
+    )
+    return compiled
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from app.core.config import settings
+from app.voice.pipeline import VoiceServiceBundle
+from app.voice.tool_router import VoiceToolContext
+from app.voice.tools import close_voice_tool_context
+
+logger = logging.getLogger("voice.resume")
+
+# How long a reconnect waits for the session it supersedes to park and release its slot.
+_SUPERSEDE_WAIT_SECONDS = 2.0
+_SUPERSEDE_POLL_SECONDS = 0.05
+
+
+@dataclass
+class ParkedSession:
+    """What a dropped session needs to carry on: its conversation, cart and warm provider clients."""
+
+    store_id: uuid.UUID
+    user_id: uuid.UUID | None
+    tool_context: VoiceToolContext
+    services: VoiceServiceBundle
+    llm_context: Any
+    system_prompt: str
+    allow_interruptions: bool
+    parked_at: float = field(default_factory=time.monotonic)
+
+
+class SessionRegistry:
+    """
+    Dropped WebSocket sessions, parked under the client's resume token for `grace_seconds`.
+
+    A reconnect that presents the token (as the same user, for the same store) claims the parked
+    state and rebuilds only the pipeline around it. Unclaimed sessions expire and are closed like
+    any finished session, writing their cart behind.
+    """
+
+    def __init__(
+        self,
+        *,
+        grace_seconds: float,
+        close: Callable[[VoiceToolContext], Awaitable[None]] = close_voice_tool_context,
+    ) -> None:
+        self._grace_seconds = grace_seconds
+        self._close = close
+        self._parked: dict[str, tuple[ParkedSession, asyncio.TimerHandle]] = {}
+        self._active: dict[str, tuple[Any, uuid.UUID, uuid.UUID | None]] = {}
+        self._closing: set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        self._resumed = 0
+        self._expired = 0
+        self._misses = 0
+        self._gap_ms_total = 0.0
+
+    def activate(self, token: str, task: Any, *, store_id: uuid.UUID, user_id: uuid.UUID | None) -> None:
+        """Track the running PipelineTask for `token`, so a reconnect by its owner can supersede it."""
+
+        self._active[token] = (task, store_id, user_id)
+
+    def deactivate(self, token: str, task: Any) -> None:
+        active = self._active.get(token)
+        if active is not None and active[0] is task:
+            del self._active[token]
+
+    def park(self, token: str, parked: ParkedSession) -> bool:
+        """Hold `parked` for the grace period; False (caller closes it) when resume is disabled."""
+
+        if self._grace_seconds <= 0:
+            return False
+        previous = self._parked.pop(token, None)
+        if previous is not None:
+            previous[1].cancel()
+            self._schedule_close(previous[0])
+        handle = asyncio.get_running_loop().call_later(self._grace_seconds, self._expire, token)
+        self._parked[token] = (parked, handle)
+        logger.info("voice_session_parked", extra={"store_id": str(parked.store_id)})
+        return True
+
+    async def claim(self, token: str, *, store_id: uuid.UUID, user_id: uuid.UUID | None) -> ParkedSession | None:
+        """Take over the session parked under `token`, or None when there is nothing to resume."""
+
+        active = self._active.get(token)
+        if active is not None and active[1:] == (store_id, user_id):
+            # The old socket is dead but its pipeline hasn't noticed yet; end it so it parks now.
+            await active[0].cancel()
+            give_up_at = time.monotonic() + _SUPERSEDE_WAIT_SECONDS
+            while token in self._active and time.monotonic() < give_up_at:
+                await asyncio.sleep(_SUPERSEDE_POLL_SECONDS)
+
+        entry = self._parked.get(token)
+        if entry is None:
+            with self._lock:
+                self._misses += 1
+            return None
+        parked, handle = entry
+        if parked.store_id != store_id or parked.user_id != user_id:
+            logger.warning("voice_resume_mismatch", extra={"store_id": str(store_id)})
+            with self._lock:
+                self._misses += 1
+            return None
+
+        del self._parked[token]
+        handle.cancel()
+        gap_ms = (time.monotonic() - parked.parked_at) * 1000
+        with self._lock:
+            self._resumed += 1
+            self._gap_ms_total += gap_ms
+        logger.info("voice_session_resumed", extra={"store_id": str(store_id), "gap_ms": round(gap_ms, 1)})
+        return parked
+
+    def _schedule_close(self, parked: ParkedSession) -> None:
+        task = asyncio.get_running_loop().create_task(self._close(parked.tool_context))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _expire(self, token: str) -> None:
+        entry = self._parked.pop(token, None)
+        if entry is None:
+            return
+        with self._lock:
+            self._expired += 1
+        logger.info("voice_session_expired", extra={"store_id": str(entry[0].store_id)})
+        self._schedule_close(entry[0])
+
+    async def close(self) -> None:
+        """Close every parked session now (drain / shutdown)."""
+
+        for token in list(self._parked):
+            parked, handle = self._parked.pop(token)
+            handle.cancel()
+            self._schedule_close(parked)
+        await asyncio.gather(*self._closing, return_exceptions=True)
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "grace_seconds": self._grace_seconds,
+                "parked": len(self._parked),
+                "resumed": self._resumed,
+                "expired": self._expired,
+                "misses": self._misses,
+                "avg_reconnect_gap_ms": round(self._gap_ms_total / self._resumed, 1) if self._resumed else 0.0,
+            }
+
+
+_registry: SessionRegistry | None = None
+
+
+def get_session_registry() -> SessionRegistry:
+    global _registry
+    if _registry is None:
+        _registry = SessionRegistry(grace_seconds=settings.voice_resume_grace_seconds)
+    return _registry
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.db.session import SessionLocal
+from app.voice.cart import get_draft_cart_store
+from app.voice.db_executor import get_voice_db_executor, shutdown_voice_db_executor
+from app.voice.pool import get_voice_pipeline_pool
+from app.voice.resume import get_session_registry
+
+
+@asynccontextmanager
+async def voice_runtime() -> AsyncIterator[None]:
+    """Process-wide voice state for whichever process runs pipelines: warm pool, draft carts, DB pool."""
+
+    pool = get_voice_pipeline_pool()
+    pool.start()
+    carts = get_draft_cart_store()
+    await carts.start(get_voice_db_executor().run, SessionLocal)
+    try:
+        yield
+    finally:
+        # Parked sessions write their carts behind before the final checkpoint.
+        await get_session_registry().close()
+        await carts.close()
+        await get_voice_db_executor().run("cart_checkpoint", carts.checkpoint, SessionLocal)
+        await pool.close()
+        shutdown_voice_db_executor()
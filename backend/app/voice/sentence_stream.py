@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import re
+from typing import Any
+
+try:
+    from pipecat.frames.frames import InterruptionFrame, LLMFullResponseEndFrame, LLMFullResponseStartFrame, LLMTextFrame
+    from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+except ImportError:  # pragma: no cover - optional dependency in tests
+    InterruptionFrame = None
+    LLMFullResponseEndFrame = None
+    LLMFullResponseStartFrame = None
+    LLMTextFrame = None
+    FrameDirection = None
+    FrameProcessor = object
+
+# A boundary only counts once the next character has arrived, so "$8." + "50" is never split.
+_SENTENCE_END = re.compile(r"[.!?](?:[\"')\]]*)\s")
+_CLAUSE_END = re.compile(r"[,;:—](?:[\"')\]]*)\s")
+
+
+class SentenceChunker:
+    """
+    Cuts a streamed LLM reply into speakable chunks of at least `min_chars`.
+
+    The first chunk of a reply may end at a clause boundary, so audio starts as early as possible;
+    later chunks end at sentence boundaries, which keeps prosody natural while they synthesize
+    ahead of playback. Chunks concatenate back to exactly the streamed text.
+    """
+
+    def __init__(self, *, min_chars: int) -> None:
+        self._min_chars = max(1, min_chars)
+        self._buffer = ""
+        self._emitted = 0
+
+    def _cut(self) -> int | None:
+        patterns = (_SENTENCE_END, _CLAUSE_END) if self._emitted == 0 else (_SENTENCE_END,)
+        ends = [
+            match.end()
+            for pattern in patterns
+            for match in pattern.finditer(self._buffer)
+            if match.end() >= self._min_chars
+        ]
+        return min(ends, default=None)
+
+    def feed(self, text: str) -> list[str]:
+        self._buffer += text
+        chunks: list[str] = []
+        while (end := self._cut()) is not None:
+            chunks.append(self._buffer[:end])
+            self._buffer = self._buffer[end:]
+            self._emitted += 1
+        return chunks
+
+    def flush(self) -> str | None:
+        text, self._buffer, self._emitted = self._buffer, "", 0
+        return text if text.strip() else None
+
+    def reset(self) -> None:
+        self._buffer = ""
+        self._emitted = 0
+
+
+class SentenceStreamProcessor(FrameProcessor):
+    """
+    Between the LLM and TTS: forwards the token stream as sentence/clause-sized LLMTextFrames.
+
+    TTS runs with its own sentence aggregation off and synthesizes each chunk as it arrives; its
+    audio queues at the output transport, so chunk N+1 is synthesized while chunk N plays.
+    """
+
+    def __init__(self, *, min_chars: int, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._chunker = SentenceChunker(min_chars=min_chars)
+
+    async def _flush(self) -> None:
+        text = self._chunker.flush()
+        if text is not None:
+            await self.push_frame(LLMTextFrame(text=text), FrameDirection.DOWNSTREAM)
+
+    async def process_frame(self, frame: Any, direction: Any) -> None:
+        await super().process_frame(frame, direction)
+        if direction != FrameDirection.DOWNSTREAM:
+            await self.push_frame(frame, direction)
+            return
+
+        if isinstance(frame, LLMTextFrame):
+            for chunk in self._chunker.feed(frame.text):
+                await self.push_frame(LLMTextFrame(text=chunk), direction)
+            return
+        if isinstance(frame, LLMFullResponseStartFrame):
+            self._chunker.reset()
+        elif isinstance(frame, LLMFullResponseEndFrame):
+            await self._flush()
+        elif isinstance(frame, InterruptionFrame):
+            self._chunker.reset()
+        await self.push_frame(frame, direction)
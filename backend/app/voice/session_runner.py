@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import WebSocket, WebSocketDisconnect
+from starlette.websockets import WebSocketState
+
+from app.core.errors import AppError
+from app.db.session import SessionLocal
+from app.models.store import Store
+from app.services import get_menu_index
+from app.voice.config import load_google_voice_config, load_voice_runtime_config, store_allows_interruptions
+from app.voice.greeting import GreetingAudio, get_greeting_audio
+from app.voice.pipeline import create_voice_llm_context, create_voice_pipeline_task
+from app.voice.pool import get_voice_pipeline_pool
+from app.voice.prompts import compile_store_prompt
+from app.voice.resume import ParkedSession, get_session_registry
+from app.voice.supervisor import (
+    DRAINING,
+    WS_CLOSE_SERVICE_RESTART,
+    WS_CLOSE_TRY_AGAIN_LATER,
+    VoiceSession,
+    get_session_supervisor,
+)
+from app.voice.tool_router import VoiceToolContext
+from app.voice.tools import GEMINI_VOICE_TOOLS_SCHEMA, close_voice_tool_context, create_voice_tool_handlers
+from app.voice.transports import TransportGuard, create_daily_transport, create_websocket_transport, session_watch
+from app.voice.transports.guard import WS_CLOSE_CODES
+
+try:
+    from pipecat.pipeline.runner import PipelineRunner
+except ImportError:  # pragma: no cover - optional dependency in tests
+    PipelineRunner = None
+
+logger = logging.getLogger("voice.sessions")
+
+# Daily calls run detached from the request that started them; keep them referenced until done.
+_background_calls: set[asyncio.Task] = set()
+
+
+@dataclass
+class _SessionSetup:
+    system_prompt: str
+    greeting: GreetingAudio | None
+    allow_interruptions: bool
+
+
+async def _prepare(*, store_id: uuid.UUID) -> _SessionSetup:
+    runtime = load_voice_runtime_config()
+    # Tool calls open their own short-lived sessions; don't pin a pooled connection for the call.
+    db = SessionLocal()
+    try:
+        system_prompt = compile_store_prompt(db, store_id=store_id).text
+        # Warm the menu index for the fast path and end-of-turn detection while we hold a session.
+        get_menu_index(db, store_id=store_id)
+        store = db.get(Store, store_id)
+        store_name = store.name if store else None
+        allow_interruptions = store_allows_interruptions(store)
+    finally:
+        db.close()
+    greeting = await get_greeting_audio(
+        store_id=store_id,
+        store_name=store_name,
+        runtime=runtime,
+        google_config=load_google_voice_config(),
+    )
+    return _SessionSetup(system_prompt=system_prompt, greeting=greeting, allow_interruptions=allow_interruptions)
+
+
+def _create_task(
+    *,
+    transport: Any,
+    services: Any,
+    setup: _SessionSetup,
+    tool_context: VoiceToolContext,
+    guard: TransportGuard | None = None,
+    llm_context: Any | None = None,
+    resumed: bool = False,
+) -> Any:
+    return create_voice_pipeline_task(
+        transport=transport,
+        runtime=load_voice_runtime_config(),
+        google_config=load_google_voice_config(),
+        system_prompt=setup.system_prompt,
+        tool_schema=GEMINI_VOICE_TOOLS_SCHEMA,
+        tool_handlers=create_voice_tool_handlers(tool_context),
+        tool_context=tool_context,
+        services=services,
+        greeting=setup.greeting,
+        allow_interruptions=setup.allow_interruptions,
+        guard=guard,
+        llm_context=llm_context,
+        resumed=resumed,
+    )
+
+
+async def run_websocket_session(
+    websocket: WebSocket,
+    *,
+    store_id: uuid.UUID,
+    user_id: uuid.UUID | None,
+    order_id: uuid.UUID | None,
+    resume_token: str | None = None,
+) -> None:
+    """
+    Run a voice session over an accepted WebSocket until the caller hangs up.
+
+    With a `resume_token`, a dropped connection parks the session for a grace period and a
+    reconnect presenting the same token carries on its conversation and cart.
+    """
+
+    supervisor = get_session_supervisor()
+    registry = get_session_registry()
+    # Claim first: a stale pipeline for the same token is ended (and frees its slot) before admission.
+    parked = await registry.claim(resume_token, store_id=store_id, user_id=user_id) if resume_token else None
+    try:
+        session = await supervisor.admit(store_id=store_id, user_id=user_id, channel="voice")
+    except AppError as exc:
+        if parked is not None and (supervisor.draining or not registry.park(resume_token, parked)):
+            await close_voice_tool_context(parked.tool_context)
+        code = WS_CLOSE_SERVICE_RESTART if exc.code == DRAINING else WS_CLOSE_TRY_AGAIN_LATER
+        await websocket.close(code=code, reason=exc.code)
+        return
+
+    if parked is not None:
+        tool_context = parked.tool_context
+    else:
+        tool_context = VoiceToolContext(
+            session_factory=SessionLocal,
+            store_id=store_id,
+            user_id=user_id,
+            order_id=order_id,
+            channel="voice",
+        )
+    guard = TransportGuard(watch=session_watch(load_voice_runtime_config()), store_id=store_id)
+    task = None
+    kept = False
+    try:
+        if parked is not None:
+            setup = _SessionSetup(
+                system_prompt=parked.system_prompt,
+                greeting=None,
+                allow_interruptions=parked.allow_interruptions,
+            )
+            services, llm_context = parked.services, parked.llm_context
+        else:
+            setup = await _prepare(store_id=store_id)
+            services = await get_voice_pipeline_pool().acquire()
+            llm_context = create_voice_llm_context(
+                system_prompt=setup.system_prompt, tool_schema=GEMINI_VOICE_TOOLS_SCHEMA
+            )
+        transport = create_websocket_transport(websocket, vad_analyzer=services.vad_analyzer)
+        task = _create_task(
+            transport=transport,
+            services=services,
+            setup=setup,
+            tool_context=tool_context,
+            guard=guard,
+            llm_context=llm_context,
+            resumed=parked is not None,
+        )
+
+        @transport.event_handler("on_client_disconnected")
+        async def on_client_disconnected(_transport: Any, _client: Any) -> None:
+            # Free provider streams now rather than when the idle guard fires.
+            await task.cancel()
+
+        supervisor.attach(session, task)
+        if resume_token:
+            registry.activate(resume_token, task, store_id=store_id, user_id=user_id)
+        await PipelineRunner().run(task)
+
+        if guard.reason is not None:
+            if websocket.application_state == WebSocketState.CONNECTED:
+                await websocket.close(code=WS_CLOSE_CODES[guard.reason], reason=guard.reason)
+        elif resume_token and not supervisor.draining:
+            kept = registry.park(
+                resume_token,
+                ParkedSession(
+                    store_id=store_id,
+                    user_id=user_id,
+                    tool_context=tool_context,
+                    services=services,
+                    llm_context=llm_context,
+                    system_prompt=setup.system_prompt,
+                    allow_interruptions=setup.allow_interruptions,
+                ),
+            )
+    except WebSocketDisconnect:
+        return
+    except Exception:
+        logger.exception("voice_ws_session_failed", extra={"store_id": str(store_id)})
+        await websocket.close(code=1011)
+        return
+    finally:
+        if not kept:
+            await close_voice_tool_context(tool_context)
+        await supervisor.release(session)
+        if resume_token:
+            registry.deactivate(resume_token, task)
+
+
+async def _run_call(task: Any, tool_context: VoiceToolContext, session: VoiceSession) -> None:
+    try:
+        await PipelineRunner().run(task)
+    finally:
+        await close_voice_tool_context(tool_context)
+        await get_session_supervisor().release(session)
+
+
+async def start_daily_session(
+    *,
+    room_url: str,
+    token: str,
+    store_id: uuid.UUID,
+    user_id: uuid.UUID | None,
+    order_id: uuid.UUID | None,
+) -> None:
+    """
+    Join a Daily room and run the call in the background; returns once the pipeline is built.
+
+    Raises AppError(429) when the supervisor has no room for another session.
+    """
+
+    supervisor = get_session_supervisor()
+    session = await supervisor.admit(store_id=store_id, user_id=user_id, channel="phone")
+
+    tool_context = VoiceToolContext(
+        session_factory=SessionLocal,
+        store_id=store_id,
+        user_id=user_id,
+        order_id=order_id,
+        channel="phone",
+    )
+    try:
+        setup = await _prepare(store_id=store_id)
+        services = await get_voice_pipeline_pool().acquire()
+        task = _create_task(
+            transport=create_daily_transport(room_url=room_url, token=token, vad_analyzer=services.vad_analyzer),
+            services=services,
+            setup=setup,
+            tool_context=tool_context,
+        )
+    except Exception:
+        await close_voice_tool_context(tool_context)
+        await supervisor.release(session)
+        raise
+    supervisor.attach(session, task)
+    call = asyncio.create_task(_run_call(task, tool_context, session))
+    _background_calls.add(call)
+    call.add_done_callback(_background_calls.discard)
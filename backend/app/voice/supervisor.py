@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from app.core.config import settings
+from app.core.errors import AppError
+from app.voice.guards import SharedTokenBucket, TokenBucket
+
+logger = logging.getLogger("voice.supervisor")
+
+# WebSocket close codes for "Try Again Later" and "Service Restart" (RFC 6455 registry).
+WS_CLOSE_TRY_AGAIN_LATER = 1013
+WS_CLOSE_SERVICE_RESTART = 1012
+
+CAPACITY = "voice_capacity"
+STORE_BUSY = "voice_store_busy"
+USER_BUSY = "voice_user_busy"
+RATE_LIMITED = "voice_rate_limited"
+DRAINING = "voice_draining"
+
+_DETAILS = {
+    CAPACITY: "Voice ordering is at capacity, please try again shortly",
+    STORE_BUSY: "This store has too many voice sessions right now",
+    USER_BUSY: "You already have the maximum number of voice sessions open",
+    RATE_LIMITED: "Too many voice sessions are starting right now",
+    DRAINING: "Voice ordering is restarting, please call again in a moment",
+}
+
+SESSION_LEDGER_FILE = "sessions.json"
+SESSION_STARTS_FILE = "session_starts.bucket"
+# Slots freed by other worker processes don't wake this one; queued admissions re-check this often.
+_LEDGER_POLL_SECONDS = 0.25
+
+# (store_id, user_id) of each active session, as strings so ledger entries compare directly.
+ActiveSessions = list[tuple[str, str | None]]
+
+
+@dataclass
+class VoiceSession:
+    store_id: uuid.UUID
+    user_id: uuid.UUID | None
+    channel: str
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+    started_at: float = field(default_factory=time.monotonic)
+    task: Any = field(default=None, repr=False)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@dataclass
+class SessionLedger:
+    """
+    Active sessions of every worker process on the host, in a flock-guarded JSON file, so the
+    global, per-store and per-user caps hold across workers. Entries of dead processes are dropped.
+    """
+
+    path: str
+
+    def _locked(self, fn: Callable[[list[dict[str, Any]]], Any]) -> Any:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a+", encoding="utf-8") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                raw = handle.read()
+                entries = [entry for entry in json.loads(raw) if _process_alive(entry["pid"])] if raw else []
+                result = fn(entries)
+                handle.seek(0)
+                handle.truncate()
+                handle.write(json.dumps(entries))
+                handle.flush()
+                return result
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def claim(self, session: VoiceSession, blocker: Callable[[ActiveSessions], str | None]) -> str | None:
+        """Record `session` unless `blocker` objects to the host's active sessions; returns the objection."""
+
+        def run(entries: list[dict[str, Any]]) -> str | None:
+            reason = blocker([(entry["store_id"], entry["user_id"]) for entry in entries])
+            if reason is None:
+                entries.append(
+                    {
+                        "id": str(session.id),
+                        "store_id": str(session.store_id),
+                        "user_id": str(session.user_id) if session.user_id is not None else None,
+                        "pid": os.getpid(),
+                    }
+                )
+            return reason
+
+        return self._locked(run)
+
+    def release(self, session_id: uuid.UUID) -> None:
+        def run(entries: list[dict[str, Any]]) -> None:
+            entries[:] = [entry for entry in entries if entry["id"] != str(session_id)]
+
+        self._locked(run)
+
+
+class SessionSupervisor:
+    """
+    Registry of running voice sessions and the admission gate in front of them.
+
+    Global and per-store caps queue a new session for up to `queue_seconds` waiting for a slot;
+    the per-user cap rejects immediately. Session starts are also paced by a TokenBucket so a
+    burst of calls can't open every provider stream at once. A cap of 0 disables it.
+
+    With `state_dir` set (worker processes), the caps are checked against a SessionLedger and the
+    start rate against a SharedTokenBucket in that directory, so they hold for the whole host.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_sessions: int,
+        max_per_store: int,
+        max_per_user: int,
+        starts_per_minute: float,
+        start_burst: int,
+        queue_seconds: float,
+        state_dir: str = "",
+    ) -> None:
+        self._max_sessions = max_sessions
+        self._max_per_store = max_per_store
+        self._max_per_user = max_per_user
+        self._queue_seconds = queue_seconds
+        self._ledger = SessionLedger(path=os.path.join(state_dir, SESSION_LEDGER_FILE)) if state_dir else None
+        self._starts: TokenBucket | None = None
+        if starts_per_minute > 0:
+            capacity, refill = max(1, start_burst), starts_per_minute / 60.0
+            if state_dir:
+                self._starts = SharedTokenBucket(
+                    capacity=capacity, refill_per_second=refill, path=os.path.join(state_dir, SESSION_STARTS_FILE)
+                )
+            else:
+                self._starts = TokenBucket(capacity=capacity, refill_per_second=refill)
+        self._sessions: dict[uuid.UUID, VoiceSession] = {}
+        self._changed = asyncio.Condition()
+        self._queued = 0
+        self._admitted = 0
+        self._queued_total = 0
+        self._rejected: Counter[str] = Counter()
+        self._draining = False
+
+    @property
+    def draining(self) -> bool:
+        return self._draining
+
+    def _blocker(self, session: VoiceSession, active: ActiveSessions) -> str | None:
+        if self._draining:
+            return DRAINING
+        store_id, user_id = str(session.store_id), session.user_id
+        if self._max_per_user and user_id is not None:
+            if sum(1 for _, user in active if user == str(user_id)) >= self._max_per_user:
+                return USER_BUSY
+        if self._max_sessions and len(active) >= self._max_sessions:
+            return CAPACITY
+        if self._max_per_store and sum(1 for store, _ in active if store == store_id) >= self._max_per_store:
+            return STORE_BUSY
+        return None
+
+    async def _claim(self, session: VoiceSession) -> str | None:
+        if self._ledger is None:
+            active = [
+                (str(s.store_id), str(s.user_id) if s.user_id is not None else None) for s in self._sessions.values()
+            ]
+            return self._blocker(session, active)
+        if self._draining:
+            return DRAINING
+        # flock and file I/O block; keep them off the event loop.
+        return await asyncio.to_thread(self._ledger.claim, session, lambda active: self._blocker(session, active))
+
+    async def _unclaim(self, session: VoiceSession) -> None:
+        if self._ledger is not None:
+            await asyncio.to_thread(self._ledger.release, session.id)
+
+    async def admit(self, *, store_id: uuid.UUID, user_id: uuid.UUID | None, channel: str) -> VoiceSession:
+        """Register a new session, waiting briefly for a slot; AppError(429) when none frees up, 503 while draining."""
+
+        deadline = time.monotonic() + self._queue_seconds
+        queued = False
+        session = VoiceSession(store_id=store_id, user_id=user_id, channel=channel)
+        async with self._changed:
+            while True:
+                reason = await self._claim(session)
+                retry_in: float | None = None
+                if reason is None:
+                    if self._starts is None:
+                        break
+                    retry_in = await self._starts.take_async()
+                    if retry_in == 0:
+                        break
+                    await self._unclaim(session)
+                    reason = RATE_LIMITED
+                elif self._ledger is not None:
+                    retry_in = _LEDGER_POLL_SECONDS
+                remaining = deadline - time.monotonic()
+                if reason in (USER_BUSY, DRAINING) or remaining <= 0:
+                    self._rejected[reason] += 1
+                    logger.warning(
+                        "voice_session_rejected",
+                        extra={"store_id": str(store_id), "channel": channel, "reason": reason},
+                    )
+                    status_code = 503 if reason == DRAINING else 429
+                    raise AppError(status_code=status_code, code=reason, detail=_DETAILS[reason])
+                if not queued:
+                    queued = True
+                    self._queued_total += 1
+                self._queued += 1
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=min(remaining, retry_in or remaining))
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    self._queued -= 1
+
+            session.started_at = time.monotonic()
+            self._sessions[session.id] = session
+            self._admitted += 1
+        return session
+
+    def attach(self, session: VoiceSession, task: Any) -> None:
+        """Record the session's PipelineTask once it has been built."""
+
+        session.task = task
+
+    async def release(self, session: VoiceSession) -> None:
+        async with self._changed:
+            if self._sessions.pop(session.id, None) is not None:
+                await self._unclaim(session)
+                self._changed.notify_all()
+
+    async def drain(self, *, deadline_seconds: float) -> int:
+        """
+        Stop admitting sessions and wait up to `deadline_seconds` for the active ones to end.
+
+        Sessions still running at the deadline have their PipelineTask cancelled, which runs their
+        normal teardown (cart flush, tool context close). Returns how many were cut off.
+        """
+
+        async with self._changed:
+            self._draining = True
+            # Queued sessions give up now rather than waiting out their queue time.
+            self._changed.notify_all()
+            try:
+                await asyncio.wait_for(self._changed.wait_for(lambda: not self._sessions), timeout=deadline_seconds)
+                return 0
+            except asyncio.TimeoutError:
+                remaining = list(self._sessions.values())
+
+        logger.warning("voice_drain_deadline", extra={"cut_off": len(remaining)})
+        for session in remaining:
+            if session.task is not None:
+                await session.task.cancel()
+        return len(remaining)
+
+    def sessions(self) -> list[VoiceSession]:
+        return list(self._sessions.values())
+
+    def stats(self) -> dict[str, object]:
+        by_store = Counter(str(session.store_id) for session in self._sessions.values())
+        by_channel = Counter(session.channel for session in self._sessions.values())
+        active = len(self._sessions)
+        return {
+            "draining": self._draining,
+            "active": active,
+            "max_sessions": self._max_sessions,
+            "utilization": round(active / self._max_sessions, 4) if self._max_sessions else None,
+            "queued": self._queued,
+            "admitted": self._admitted,
+            "queued_total": self._queued_total,
+            "rejected": dict(sorted(self._rejected.items())),
+            "by_channel": dict(sorted(by_channel.items())),
+            "by_store": dict(sorted(by_store.items())),
+        }
+
+
+_supervisor: SessionSupervisor | None = None
+
+
+def get_session_supervisor() -> SessionSupervisor:
+    global _supervisor
+    if _supervisor is None:
+        _supervisor = SessionSupervisor(
+            max_sessions=settings.voice_max_sessions,
+            max_per_store=settings.voice_max_sessions_per_store,
+            max_per_user=settings.voice_max_sessions_per_user,
+            starts_per_minute=settings.voice_session_starts_per_minute,
+            start_burst=settings.voice_session_start_burst,
+            queue_seconds=settings.voice_admission_queue_seconds,
+            state_dir=settings.voice_session_state_dir,
+        )
+    return _supervisor
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import threading
+import uuid
+from dataclasses import dataclass, field
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any
+
+# Rough chars-per-token for English/JSON; good enough to compare encodings.
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(payload: Any) -> int:
+    text = payload if isinstance(payload, str) else json.dumps(payload, default=str, separators=(",", ":"))
+    return max(1, len(text) // _CHARS_PER_TOKEN)
+
+
+def to_cents(value: Decimal | None) -> int:
+    if value is None:
+        return 0
+    return int((Decimal(value) * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+@dataclass
+class ToolResultStats:
+    calls: int = 0
+    raw_tokens: int = 0
+    compact_tokens: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, *, raw: int, compact: int) -> None:
+        with self._lock:
+            self.calls += 1
+            self.raw_tokens += raw
+            self.compact_tokens += compact
+
+    def as_dict(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "avg_raw_tokens": round(self.raw_tokens / self.calls, 1) if self.calls else 0.0,
+                "avg_compact_tokens": round(self.compact_tokens / self.calls, 1) if self.calls else 0.0,
+                "saved_ratio": round(1 - self.compact_tokens / self.raw_tokens, 4) if self.raw_tokens else 0.0,
+            }
+
+
+tool_result_stats = ToolResultStats()
+
+
+class ToolResultEncoder:
+    """
+    Per-session compact encoding of tool results for the LLM context.
+
+    Order lines get short handles ("L1", "L2", ...) instead of UUIDs, money is integer cents,
+    and mutations report only the lines that changed since the last result.
+    """
+
+    def __init__(self, *, enabled: bool = True, stats: ToolResultStats = tool_result_stats) -> None:
+        self._enabled = enabled
+        self._stats = stats
+        self._handles: dict[uuid.UUID, str] = {}
+        self._ids: dict[str, uuid.UUID] = {}
+        self._menu_items: dict[str, uuid.UUID] = {}
+        self._reported: dict[uuid.UUID, int] = {}
+        self._savings: list[int] = []
+
+    def handle(self, line_id: uuid.UUID) -> str:
+        handle = self._handles.get(line_id)
+        if handle is None:
+            handle = f"L{len(self._handles) + 1}"
+            self._handles[line_id] = handle
+            self._ids[handle] = line_id
+        return handle
+
+    def resolve(self, value: Any) -> uuid.UUID | None:
+        """Map a handle (or a full UUID, for older clients) back to its UUID."""
+
+        if not value:
+            return None
+        text = str(value).strip()
+        if text.upper() in self._ids:
+            return self._ids[text.upper()]
+        try:
+            return uuid.UUID(text)
+        except ValueError:
+            return None
+
+    def resolve_menu_item(self, value: Any) -> uuid.UUID | None:
+        """Map a line handle to that line's menu item (or take a full menu item UUID)."""
+
+        if value and str(value).strip().upper() in self._menu_items:
+            return self._menu_items[str(value).strip().upper()]
+        resolved = self.resolve(value)
+        return None if resolved in self._handles else resolved
+
+    def saved_tokens(self, results: int) -> int:
+        """Tokens saved across the last `results` encoded results, i.e. those still in the prompt."""
+
+        return sum(self._savings[-results:]) if results > 0 else 0
+
+    def _line(self, item: dict[str, Any]) -> dict[str, Any]:
+        handle = self.handle(item["order_item_id"])
+        if item.get("menu_item_id") is not None:
+            self._menu_items[handle] = item["menu_item_id"]
+        return {
+            "id": handle,
+            "name": item["name"],
+            "qty": item["quantity"],
+            "cents": to_cents(item["line_total"]),
+        }
+
+    def _compact(self, result: dict[str, Any], *, full: bool) -> dict[str, Any]:
+        compact: dict[str, Any] = {"ok": result.get("ok", False)}
+        if result.get("message"):
+            compact["msg"] = result["message"]
+        if result.get("not_found"):
+            compact["not_found"] = result["not_found"]
+
+        order = result.get("order")
+        if not order:
+            return compact
+
+        items = order["items"]
+        current = {item["order_item_id"]: item["quantity"] for item in items}
+        if full:
+            compact["lines"] = [self._line(item) for item in items]
+        else:
+            changed = [item for item in items if self._reported.get(item["order_item_id"]) != item["quantity"]]
+            removed = [self.handle(line_id) for line_id in self._reported if line_id not in current]
+            if changed:
+                compact["changed"] = [self._line(item) for item in changed]
+            if removed:
+                compact["removed"] = removed
+            compact["line_count"] = len(items)
+        self._reported = current
+
+        if order["status"] != "draft":
+            compact["status"] = order["status"]
+            compact["order_ref"] = str(order["order_id"])[:8]
+        compact["total_cents"] = to_cents(order["total"])
+        return compact
+
+    def encode(self, result: dict[str, Any], *, full: bool = False) -> dict[str, Any]:
+        """Return what the LLM sees for `result`; records raw vs compact token estimates."""
+
+        compact = self._compact(result, full=full)
+        raw_tokens = estimate_tokens(result)
+        compact_tokens = estimate_tokens(compact)
+        self._stats.record(raw=raw_tokens, compact=compact_tokens)
+        self._savings.append(raw_tokens - compact_tokens if self._enabled else 0)
+        return compact if self._enabled else result
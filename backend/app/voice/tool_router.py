@@ -1,112 +1,160 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import time
 import uuid
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import dataclass, field
+from typing import Any, Callable
 
-from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.models.menu import Menu
-from app.models.menu_item import MenuItem
-from app.models.order import Order
-from app.models.order_item import OrderItem
-from app.services import order_service
-from app.schemas.order.order import OrderCreate
+from app.core.config import settings
+from app.services import menu_index_service
+from app.services.menu_index_service import MenuIndex, MenuIndexEntry
+from app.voice.cart import CartLine, DraftCart, get_draft_cart_store, load_cart
+from app.voice.db_executor import get_voice_db_executor
+from app.voice.tool_results import ToolResultEncoder
+
+logger = logging.getLogger("voice.tools")
+
+
+def _parse_quantity(value: Any) -> int | None:
+    """A whole-number quantity from tool arguments (int, integral float or numeric string), else None."""
+
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value.strip())
+    return None
 
 
 @dataclass
 class VoiceToolContext:
-    db: Session
+    session_factory: Callable[[], Session]
     store_id: uuid.UUID
     user_id: uuid.UUID | None
     channel: str = "voice"
     order_id: uuid.UUID | None = None
+    cart: DraftCart | None = field(default=None, repr=False)
+    results: ToolResultEncoder = field(
+        default_factory=lambda: ToolResultEncoder(enabled=settings.voice_compact_tool_results), repr=False
+    )
+    # Tool calls for one voice session run one at a time, each in its own short-lived Session.
+    db_lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False, compare=False)
 
 
 class VoiceToolRouter:
-    def __init__(self, context: VoiceToolContext) -> None:
+    """
+    Voice ordering tools over the session's in-memory draft cart.
+
+    The database is only touched for menu lookups (mostly served by the in-process index), for
+    loading a resumed order, and for write-behind persistence at checkout.
+    """
+
+    def __init__(self, context: VoiceToolContext, db: Session | None = None) -> None:
         self._context = context
+        self._db = db
 
-    def _find_menu_item_by_name(self, name: str) -> MenuItem | None:
-        query = (
-            select(MenuItem)
-            .join(Menu, Menu.id == MenuItem.menu_id)
-            .where(Menu.store_id == self._context.store_id)
-            .where(MenuItem.name.ilike(name))
-        )
-        return self._context.db.execute(query).scalar_one_or_none()
-
-    def _get_order(self) -> Order | None:
-        if self._context.order_id is None:
-            return None
-        return self._context.db.get(Order, self._context.order_id)
-
-    def _ensure_order(self) -> Order:
-        order = self._get_order()
-        if order is not None:
-            return order
-
-        payload = OrderCreate(
-            store_id=self._context.store_id,
-            user_id=self._context.user_id,
-            channel=self._context.channel,
-            notes=None,
-            items=[],
-        )
-        order = order_service.create_draft_order(self._context.db, payload=payload)
-        self._context.db.flush()
-        self._context.order_id = order.id
-        return order
-
-    def _build_summary(self, order: Order) -> dict[str, Any]:
-        items = self._context.db.execute(select(OrderItem).where(OrderItem.order_id == order.id)).scalars().all()
-        summary_items = []
-        for item in items:
-            menu_item = self._context.db.get(MenuItem, item.menu_item_id)
-            name = menu_item.name if menu_item else "Unknown item"
-            summary_items.append(
-                {
-                    "order_item_id": item.id,
-                    "menu_item_id": item.menu_item_id,
-                    "name": name,
-                    "quantity": item.quantity,
-                    "line_total": item.price_snapshot * item.quantity,
-                }
-            )
-        return {
-            "order_id": order.id,
-            "status": order.status,
-            "subtotal": order.subtotal,
-            "tax": order.tax,
-            "total": order.total,
-            "items": summary_items,
-        }
+    @property
+    def db(self) -> Session:
+        if self._db is None:
+            started = time.perf_counter()
+            self._db = self._context.session_factory()
+            self._db.connection()
+            get_voice_db_executor().record("pool_checkout", elapsed_ms=(time.perf_counter() - started) * 1000)
+        return self._db
 
-    def add_item(self, *, menu_item_id: uuid.UUID | None, item_name: str | None, quantity: int) -> dict[str, Any]:
-        if quantity <= 0:
-            return {"ok": False, "message": "Quantity must be at least 1."}
+    def finish(self, *, commit: bool) -> None:
+        if self._db is None:
+            return
+        try:
+            if commit:
+                self._db.commit()
+            else:
+                self._db.rollback()
+        finally:
+            self._db.close()
+            self._db = None
 
-        order = self._ensure_order()
-        menu_item = None
-        if menu_item_id is not None:
-            menu_item = order_service.get_menu_item_for_store(
-                self._context.db, store_id=self._context.store_id, item_id=menu_item_id
+    def menu_index(self) -> MenuIndex:
+        # A warm index is served from memory; a session is only opened to revalidate or rebuild it.
+        index = menu_index_service.fresh_menu_index(self._context.store_id)
+        if index is not None:
+            return index
+        return menu_index_service.get_menu_index(self.db, store_id=self._context.store_id)
+
+    def _resolve_menu_item(
+        self,
+        *,
+        menu_item_id: uuid.UUID | None,
+        item_name: str | None,
+        index: MenuIndex | None = None,
+    ) -> MenuIndexEntry | None:
+        index = index or self.menu_index()
+        entry = index.entries.get(menu_item_id) if menu_item_id is not None else None
+        if entry is None and item_name:
+            entry = index.lookup(item_name)
+        return entry
+
+    def _find_line(
+        self,
+        cart: DraftCart,
+        *,
+        order_item_id: uuid.UUID | None,
+        menu_item_id: uuid.UUID | None,
+        item_name: str | None,
+        index: MenuIndex | None = None,
+        exclude: set[uuid.UUID] = frozenset(),
+    ) -> CartLine | None:
+        line = cart.find_line(line_id=order_item_id, menu_item_id=menu_item_id, exclude=exclude)
+        if line is None and item_name:
+            entry = self._resolve_menu_item(menu_item_id=None, item_name=item_name, index=index)
+            if entry is not None:
+                line = cart.find_line(menu_item_id=entry.menu_item_id, exclude=exclude)
+        return line
+
+    def _get_cart(self) -> DraftCart | None:
+        if self._context.cart is None and self._context.order_id is not None:
+            cart = load_cart(self.db, order_id=self._context.order_id)
+            if cart is not None:
+                self._context.cart = get_draft_cart_store().track(cart)
+        return self._context.cart
+
+    def _ensure_cart(self) -> DraftCart:
+        cart = self._get_cart()
+        if cart is None:
+            cart = get_draft_cart_store().open(
+                store_id=self._context.store_id,
+                user_id=self._context.user_id,
+                channel=self._context.channel,
             )
-        if menu_item is None and item_name:
-            menu_item = self._find_menu_item_by_name(item_name)
+            self._context.cart = cart
+            self._context.order_id = cart.order_id
+        return cart
+
+    def add_item(self, *, menu_item_id: uuid.UUID | None, item_name: str | None, quantity: Any) -> dict[str, Any]:
+        quantity = _parse_quantity(quantity)
+        if quantity is None or quantity <= 0:
+            return {"ok": False, "message": "Quantity must be a whole number of at least 1."}
 
-        if menu_item is None:
+        entry = self._resolve_menu_item(menu_item_id=menu_item_id, item_name=item_name)
+        if entry is None:
             return {"ok": False, "message": "Menu item not found."}
 
-        order_service.create_order_item(self._context.db, order=order, menu_item=menu_item, quantity=quantity)
-        order_service.recalc_totals(self._context.db, order=order)
-        self._context.db.flush()
+        cart = self._ensure_cart()
+        if cart.status != "draft":
+            return {"ok": False, "message": "Order is not editable."}
+        cart.add_line(menu_item_id=entry.menu_item_id, name=entry.name, unit_price=entry.price, quantity=quantity)
 
         return {
             "ok": True,
-            "message": f"Added {quantity} {menu_item.name}.",
-            "order": self._build_summary(order),
+            "message": f"Added {quantity} {entry.name}.",
+            "order": cart.summary(),
         }
 
     def remove_item(
@@ -116,54 +164,150 @@ class VoiceToolRouter:
         menu_item_id: uuid.UUID | None,
         item_name: str | None,
     ) -> dict[str, Any]:
-        order = self._get_order()
-        if order is None:
+        cart = self._get_cart()
+        if cart is None:
             return {"ok": False, "message": "No active order."}
+        if cart.status != "draft":
+            return {"ok": False, "message": "Order is not editable."}
 
-        item = None
-        if order_item_id is not None:
-            item = self._context.db.execute(
-                select(OrderItem).where(OrderItem.order_id == order.id, OrderItem.id == order_item_id)
-            ).scalar_one_or_none()
-        if item is None and menu_item_id is not None:
-            item = self._context.db.execute(
-                select(OrderItem).where(OrderItem.order_id == order.id, OrderItem.menu_item_id == menu_item_id)
-            ).scalar_one_or_none()
-        if item is None and item_name:
-            menu_item = self._find_menu_item_by_name(item_name)
-            if menu_item is not None:
-                item = self._context.db.execute(
-                    select(OrderItem).where(OrderItem.order_id == order.id, OrderItem.menu_item_id == menu_item.id)
-                ).scalar_one_or_none()
-
-        if item is None:
+        line = self._find_line(cart, order_item_id=order_item_id, menu_item_id=menu_item_id, item_name=item_name)
+        if line is None:
             return {"ok": False, "message": "Item not found in the order."}
 
-        self._context.db.delete(item)
-        order_service.recalc_totals(self._context.db, order=order)
-        self._context.db.flush()
+        cart.remove_line(line.line_id)
 
         return {
             "ok": True,
             "message": "Removed item.",
-            "order": self._build_summary(order),
+            "order": cart.summary(),
         }
 
+    def add_items(self, *, items: list[dict[str, Any]]) -> dict[str, Any]:
+        """Add several lines at once: one index probe, one journal write, one summary."""
+
+        if not items:
+            return {"ok": False, "message": "No items given."}
+        items = [{**item, "quantity": _parse_quantity(item.get("quantity"))} for item in items]
+        if any(item["quantity"] is None or item["quantity"] <= 0 for item in items):
+            return {"ok": False, "message": "Quantity must be a whole number of at least 1."}
+
+        index = self.menu_index()
+        resolved: list[tuple[MenuIndexEntry, int]] = []
+        not_found: list[str] = []
+        for item in items:
+            entry = self._resolve_menu_item(
+                menu_item_id=item.get("menu_item_id"), item_name=item.get("item_name"), index=index
+            )
+            if entry is None:
+                not_found.append(item.get("item_name") or str(item.get("menu_item_id")))
+            else:
+                resolved.append((entry, item["quantity"]))
+        if not resolved:
+            return {"ok": False, "message": "Menu items not found.", "not_found": not_found}
+
+        cart = self._ensure_cart()
+        if cart.status != "draft":
+            return {"ok": False, "message": "Order is not editable."}
+        with cart.batch():
+            for entry, quantity in resolved:
+                cart.add_line(menu_item_id=entry.menu_item_id, name=entry.name, unit_price=entry.price, quantity=quantity)
+
+        added = ", ".join(f"{quantity} {entry.name}" for entry, quantity in resolved)
+        result: dict[str, Any] = {"ok": True, "message": f"Added {added}.", "order": cart.summary()}
+        if not_found:
+            result["not_found"] = not_found
+        return result
+
+    def _apply_line_changes(
+        self,
+        items: list[dict[str, Any]],
+        change: Callable[[DraftCart, CartLine, dict[str, Any]], None],
+        verb: str,
+    ) -> dict[str, Any]:
+        cart = self._get_cart()
+        if cart is None:
+            return {"ok": False, "message": "No active order."}
+        if cart.status != "draft":
+            return {"ok": False, "message": "Order is not editable."}
+        if not items:
+            return {"ok": False, "message": "No items given."}
+
+        index = self.menu_index() if any(item.get("item_name") for item in items) else None
+        matched: list[tuple[CartLine, dict[str, Any]]] = []
+        not_found: list[str] = []
+        for item in items:
+            line = self._find_line(
+                cart,
+                order_item_id=item.get("order_item_id"),
+                menu_item_id=item.get("menu_item_id"),
+                item_name=item.get("item_name"),
+                index=index,
+                exclude={seen.line_id for seen, _ in matched},
+            )
+            if line is None:
+                not_found.append(item.get("item_name") or str(item.get("order_item_id") or item.get("menu_item_id")))
+            else:
+                matched.append((line, item))
+        if not matched:
+            return {"ok": False, "message": "Items not found in the order.", "not_found": not_found}
+
+        with cart.batch():
+            for line, item in matched:
+                change(cart, line, item)
+
+        result: dict[str, Any] = {"ok": True, "message": f"{verb} {len(matched)} item(s).", "order": cart.summary()}
+        if not_found:
+            result["not_found"] = not_found
+        return result
+
+    def remove_items(self, *, items: list[dict[str, Any]]) -> dict[str, Any]:
+        return self._apply_line_changes(items, lambda cart, line, _: cart.remove_line(line.line_id), "Removed")
+
+    def update_quantities(self, *, items: list[dict[str, Any]]) -> dict[str, Any]:
+        items = [{**item, "quantity": _parse_quantity(item.get("quantity"))} for item in items]
+        if any(item["quantity"] is None or item["quantity"] < 0 for item in items):
+            return {"ok": False, "message": "Quantity must be a whole number, 0 or more."}
+
+        def change(cart: DraftCart, line: CartLine, item: dict[str, Any]) -> None:
+            if item["quantity"] == 0:
+                cart.remove_line(line.line_id)
+            else:
+                cart.set_quantity(line.line_id, item["quantity"])
+
+        return self._apply_line_changes(items, change, "Updated")
+
     def get_summary(self) -> dict[str, Any]:
-        order = self._get_order()
-        if order is None:
+        cart = self._get_cart()
+        if cart is None:
             return {"ok": True, "message": "Order is empty.", "order": None}
-        return {"ok": True, "message": "Order summary.", "order": self._build_summary(order)}
+        return {"ok": True, "message": "Order summary.", "order": cart.summary()}
 
     def checkout(self) -> dict[str, Any]:
-        order = self._get_order()
-        if order is None:
+        cart = self._get_cart()
+        if cart is None:
             return {"ok": False, "message": "Order is empty."}
-        if order.status != "draft":
+        if cart.status != "draft":
             return {"ok": False, "message": "Order is not editable."}
 
-        order.status = "submitted"
-        order_service.recalc_totals(self._context.db, order=order)
-        self._context.db.flush()
+        cart.set_status("submitted")
+        # Checkout is the one write the caller waits on: persist before confirming.
+        try:
+            get_draft_cart_store().write_behind(cart, self._context.session_factory)
+        except Exception:
+            # Back to an editable draft, so the caller can simply try again.
+            cart.set_status("draft")
+            logger.exception("voice_checkout_failed", extra={"order_id": str(cart.order_id)})
+            return {"ok": False, "message": "Could not submit the order, please try again."}
+
+        return {"ok": True, "message": "Order submitted.", "order": cart.summary()}
+
+    def close_cart(self) -> None:
+        """Persist anything outstanding and stop tracking the cart; called when the session ends."""
 
-        return {"ok": True, "message": "Order submitted.", "order": self._build_summary(order)}
+        cart = self._context.cart
+        if cart is None:
+            return
+        store = get_draft_cart_store()
+        store.write_behind(cart, self._context.session_factory)
+        store.release(cart)
+        self._context.cart = None
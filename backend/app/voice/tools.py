@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Any, Awaitable, Callable
 
+from app.voice.cart import CartBusyError
+from app.voice.db_executor import get_voice_db_executor
 from app.voice.tool_router import VoiceToolContext, VoiceToolRouter
 
 GEMINI_VOICE_TOOLS_SCHEMA = [
@@ -15,11 +17,11 @@ GEMINI_VOICE_TOOLS_SCHEMA = [
                     "properties": {
                         "menu_item_id": {
                             "type": "string",
-                            "description": "UUID of the menu item to add.",
+                            "description": "Order line id (e.g. L2) to add more of the same item.",
                         },
                         "item_name": {
                             "type": "string",
-                            "description": "Name of the menu item to add if ID is unknown.",
+                            "description": "Name of the menu item to add if there is no line id.",
                         },
                         "quantity": {
                             "type": "integer",
@@ -37,11 +39,11 @@ GEMINI_VOICE_TOOLS_SCHEMA = [
                     "properties": {
                         "order_item_id": {
                             "type": "string",
-                            "description": "UUID of the order item to remove.",
+                            "description": "Order line id (e.g. L2) from an earlier result.",
                         },
                         "menu_item_id": {
                             "type": "string",
-                            "description": "UUID of the menu item to remove from the order.",
+                            "description": "Order line id (e.g. L2) whose item to remove; prefer order_item_id.",
                         },
                         "item_name": {
                             "type": "string",
@@ -51,6 +53,72 @@ GEMINI_VOICE_TOOLS_SCHEMA = [
                     "required": [],
                 },
             },
+            {
+                "name": "add_items",
+                "description": "Add several items to the current order in one call. Prefer this when the customer orders more than one item.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "items": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "menu_item_id": {"type": "string", "description": "Order line id (e.g. L2) to add more of that item."},
+                                    "item_name": {"type": "string", "description": "Menu item name if there is no line id."},
+                                    "quantity": {"type": "integer", "description": "Quantity to add"},
+                                },
+                                "required": ["quantity"],
+                            },
+                        },
+                    },
+                    "required": ["items"],
+                },
+            },
+            {
+                "name": "remove_items",
+                "description": "Remove several items from the current order in one call.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "items": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "order_item_id": {"type": "string", "description": "Order line id (e.g. L2)."},
+                                    "menu_item_id": {"type": "string", "description": "Order line id (e.g. L2) of the item."},
+                                    "item_name": {"type": "string", "description": "Item name if IDs are unknown."},
+                                },
+                            },
+                        },
+                    },
+                    "required": ["items"],
+                },
+            },
+            {
+                "name": "update_quantities",
+                "description": "Change the quantity of items already in the order; quantity 0 removes the item.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "items": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "order_item_id": {"type": "string", "description": "Order line id (e.g. L2)."},
+                                    "menu_item_id": {"type": "string", "description": "Order line id (e.g. L2) of the item."},
+                                    "item_name": {"type": "string", "description": "Item name if IDs are unknown."},
+                                    "quantity": {"type": "integer", "description": "New quantity"},
+                                },
+                                "required": ["quantity"],
+                            },
+                        },
+                    },
+                    "required": ["items"],
+                },
+            },
             {
                 "name": "get_summary",
                 "description": "Get current order summary and totals.",
@@ -74,65 +142,141 @@ def _extract_args(params: Any) -> dict:
     return {}
 
 
+def _extract_items(context: VoiceToolContext, args: dict) -> list[dict[str, Any]]:
+    items = []
+    for raw in args.get("items") or []:
+        if not isinstance(raw, dict):
+            continue
+        item: dict[str, Any] = {
+            "order_item_id": context.results.resolve(raw.get("order_item_id")),
+            "menu_item_id": context.results.resolve_menu_item(raw.get("menu_item_id")),
+            "item_name": raw.get("item_name") or None,
+        }
+        if "quantity" in raw:
+            # Validated by the router, which answers {"ok": False} for null or non-numeric values.
+            item["quantity"] = raw["quantity"]
+        items.append(item)
+    return items
+
+
 def _result_callback(params: Any) -> Callable[[Any], Awaitable[Any]] | None:
     return getattr(params, "result_callback", None)
 
 
-def create_voice_tool_handlers(context: VoiceToolContext) -> dict[str, Callable[[Any], Awaitable[Any]]]:
+def _unit_of_work(context: VoiceToolContext, fn: Callable[..., Any], kwargs: dict[str, Any]) -> Any:
     router = VoiceToolRouter(context)
+    try:
+        result = fn(router, **kwargs)
+    except CartBusyError:
+        router.finish(commit=False)
+        return {"ok": False, "message": "This order is open in another call; try again in a moment."}
+    except Exception:
+        router.finish(commit=False)
+        raise
+    router.finish(commit=True)
+    return result
+
+
+async def run_tool_call(context: VoiceToolContext, name: str, fn: Callable[..., Any], **kwargs: Any) -> Any:
+    """
+    Run `fn(router, **kwargs)` as one unit of work on the voice DB pool.
+
+    A Session is opened only if the call needs the database and is closed before returning;
+    calls for one voice session run one at a time.
+    """
+
+    async with context.db_lock:
+        return await get_voice_db_executor().run(name, _unit_of_work, context, fn, kwargs)
 
+
+async def close_voice_tool_context(context: VoiceToolContext) -> None:
+    """Write the session's cart behind to the database; call once the voice session ends."""
+
+    await run_tool_call(context, "cart_close", VoiceToolRouter.close_cart)
+
+
+def create_voice_tool_handlers(context: VoiceToolContext) -> dict[str, Callable[[Any], Awaitable[Any]]]:
     async def add_item(params: Any):
         args = _extract_args(params)
-        result = router.add_item(
-            menu_item_id=_parse_uuid(args.get("menu_item_id")),
+        result = await run_tool_call(
+            context,
+            "add_item",
+            VoiceToolRouter.add_item,
+            menu_item_id=context.results.resolve_menu_item(args.get("menu_item_id")),
             item_name=(args.get("item_name") or None),
-            quantity=int(args.get("quantity", 1) or 1),
+            quantity=args.get("quantity", 1),
         )
+        payload = context.results.encode(result)
         callback = _result_callback(params)
         if callback:
-            await callback(result)
-        return result
+            await callback(payload)
+        return payload
 
     async def remove_item(params: Any):
         args = _extract_args(params)
-        result = router.remove_item(
-            order_item_id=_parse_uuid(args.get("order_item_id")),
-            menu_item_id=_parse_uuid(args.get("menu_item_id")),
+        result = await run_tool_call(
+            context,
+            "remove_item",
+            VoiceToolRouter.remove_item,
+            order_item_id=context.results.resolve(args.get("order_item_id")),
+            menu_item_id=context.results.resolve_menu_item(args.get("menu_item_id")),
             item_name=(args.get("item_name") or None),
         )
+        payload = context.results.encode(result)
         callback = _result_callback(params)
         if callback:
-            await callback(result)
-        return result
+            await callback(payload)
+        return payload
+
+    async def add_items(params: Any):
+        items = [{"quantity": 1, **item} for item in _extract_items(context, _extract_args(params))]
+        result = await run_tool_call(context, "add_items", VoiceToolRouter.add_items, items=items)
+        payload = context.results.encode(result)
+        callback = _result_callback(params)
+        if callback:
+            await callback(payload)
+        return payload
+
+    async def remove_items(params: Any):
+        items = _extract_items(context, _extract_args(params))
+        result = await run_tool_call(context, "remove_items", VoiceToolRouter.remove_items, items=items)
+        payload = context.results.encode(result)
+        callback = _result_callback(params)
+        if callback:
+            await callback(payload)
+        return payload
+
+    async def update_quantities(params: Any):
+        items = _extract_items(context, _extract_args(params))
+        result = await run_tool_call(context, "update_quantities", VoiceToolRouter.update_quantities, items=items)
+        payload = context.results.encode(result)
+        callback = _result_callback(params)
+        if callback:
+            await callback(payload)
+        return payload
 
     async def get_summary(params: Any):
-        result = router.get_summary()
+        result = await run_tool_call(context, "get_summary", VoiceToolRouter.get_summary)
+        payload = context.results.encode(result, full=True)
         callback = _result_callback(params)
         if callback:
-            await callback(result)
-        return result
+            await callback(payload)
+        return payload
 
     async def checkout(params: Any):
-        result = router.checkout()
+        result = await run_tool_call(context, "checkout", VoiceToolRouter.checkout)
+        payload = context.results.encode(result)
         callback = _result_callback(params)
         if callback:
-            await callback(result)
-        return result
+            await callback(payload)
+        return payload
 
     return {
         "add_item": add_item,
         "remove_item": remove_item,
+        "add_items": add_items,
+        "remove_items": remove_items,
+        "update_quantities": update_quantities,
         "get_summary": get_summary,
         "checkout": checkout,
     }
-
-
-def _parse_uuid(value: Any):
-    if not value:
-        return None
-    try:
-        import uuid
-
-        return uuid.UUID(str(value))
-    except ValueError:
-        return None
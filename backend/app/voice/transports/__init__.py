@@ -1,3 +1,4 @@
+from app.voice.transports.guard import TransportGuard, session_watch, transport_guard_stats
 from app.voice.transports.websocket import create_websocket_transport
 
 try:
@@ -6,4 +7,10 @@ except Exception:
     def create_daily_transport(**kwargs):  # type: ignore[misc]
         raise RuntimeError("Daily transport requires `pip install pipecat-ai[daily]`")
 
-__all__ = ["create_websocket_transport", "create_daily_transport"]
+__all__ = [
+    "create_websocket_transport",
+    "create_daily_transport",
+    "TransportGuard",
+    "session_watch",
+    "transport_guard_stats",
+]
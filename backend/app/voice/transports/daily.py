@@ -1,28 +1,24 @@
 from __future__ import annotations
 
+from typing import Any
+
+from app.voice.vad import create_vad_analyzer
+
 try:
-    from pipecat.audio.vad.silero import SileroVADAnalyzer, VADParams
     from pipecat.transports.base_transport import BaseTransport
     from pipecat.transports.services.daily import DailyTransport, DailyTransportParams
 except Exception:  # pragma: no cover - pipecat raises Exception (not ImportError) when daily is missing
-    SileroVADAnalyzer = None
-    VADParams = None
     DailyTransport = None
     DailyTransportParams = None
     BaseTransport = object
 
 
-def create_daily_transport(*, room_url: str, token: str) -> BaseTransport:
+def create_daily_transport(*, room_url: str, token: str, vad_analyzer: Any | None = None) -> BaseTransport:
     if DailyTransport is None:
         raise RuntimeError("pipecat is required for Daily transport")
 
-    vad_analyzer = SileroVADAnalyzer(
-        params=VADParams(
-            start_secs=0.2,
-            stop_secs=0.8,
-            min_volume=0.6,
-        )
-    )
+    if vad_analyzer is None:
+        vad_analyzer = create_vad_analyzer()
 
     return DailyTransport(
         room_url=room_url,
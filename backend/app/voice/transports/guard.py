@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import uuid
+from collections import Counter
+from typing import Any
+
+from app.voice.config import VoiceRuntimeConfig
+from app.voice.guards import IDLE, MAX_DURATION, PAYLOAD_TOO_LARGE, SessionWatch
+
+try:
+    from pipecat.frames.frames import (
+        CancelFrame,
+        CancelTaskFrame,
+        EndFrame,
+        EndTaskFrame,
+        InputAudioRawFrame,
+        StartFrame,
+    )
+    from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+except ImportError:  # pragma: no cover - optional dependency in tests
+    CancelFrame = None
+    CancelTaskFrame = None
+    EndFrame = None
+    EndTaskFrame = None
+    InputAudioRawFrame = None
+    StartFrame = None
+    FrameDirection = None
+    FrameProcessor = object
+
+logger = logging.getLogger("voice.guard")
+
+_CHECK_INTERVAL_SECONDS = 1.0
+
+# WebSocket close code per limit: 1009 "message too big", 1008 "policy violation".
+WS_CLOSE_CODES = {PAYLOAD_TOO_LARGE: 1009, MAX_DURATION: 1008, IDLE: 1008}
+
+
+class TransportGuardStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._terminated: Counter[str] = Counter()
+
+    def record(self, reason: str) -> None:
+        with self._lock:
+            self._terminated[reason] += 1
+
+    def as_dict(self) -> dict[str, object]:
+        with self._lock:
+            return {"terminated": dict(sorted(self._terminated.items()))}
+
+
+transport_guard_stats = TransportGuardStats()
+
+
+def session_watch(runtime: VoiceRuntimeConfig) -> SessionWatch:
+    return SessionWatch(
+        max_seconds=runtime.ws_max_seconds,
+        max_payload_bytes=runtime.ws_max_payload_kb * 1024,
+        idle_seconds=runtime.ws_idle_seconds,
+    )
+
+
+class TransportGuard(FrameProcessor):
+    """
+    Directly after `transport.input()`: ends the session once it breaks a SessionWatch limit.
+
+    Running out the clock or going idle ends the task gracefully (EndTaskFrame); an oversized
+    frame cancels it outright. Either way the pipeline tears down and releases its provider
+    streams. `reason` tells the caller why, e.g. to pick a WebSocket close code.
+    """
+
+    def __init__(self, *, watch: SessionWatch, store_id: uuid.UUID | None = None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._watch = watch
+        self._store_id = store_id
+        self._monitor: asyncio.Task | None = None
+        self.reason: str | None = None
+
+    async def _terminate(self, reason: str) -> None:
+        if self.reason is not None:
+            return
+        self.reason = reason
+        transport_guard_stats.record(reason)
+        logger.warning(
+            "voice_session_limit",
+            extra={"store_id": str(self._store_id) if self._store_id else None, "reason": reason},
+        )
+        end = CancelTaskFrame() if reason == PAYLOAD_TOO_LARGE else EndTaskFrame()
+        await self.push_frame(end, FrameDirection.UPSTREAM)
+
+    async def _monitor_limits(self) -> None:
+        while self.reason is None:
+            await asyncio.sleep(_CHECK_INTERVAL_SECONDS)
+            reason = self._watch.check()
+            if reason is not None:
+                await self._terminate(reason)
+
+    async def _stop_monitor(self) -> None:
+        if self._monitor is not None:
+            await self.cancel_task(self._monitor)
+            self._monitor = None
+
+    async def process_frame(self, frame: Any, direction: Any) -> None:
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, StartFrame):
+            self._watch.start()
+            self._monitor = self.create_task(self._monitor_limits())
+        elif isinstance(frame, (EndFrame, CancelFrame)):
+            await self._stop_monitor()
+        elif isinstance(frame, InputAudioRawFrame):
+            reason = self._watch.audio(len(frame.audio))
+            if reason is not None:
+                await self._terminate(reason)
+                return
+
+        await self.push_frame(frame, direction)
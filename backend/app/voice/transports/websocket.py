@@ -1,33 +1,29 @@
 from __future__ import annotations
 
+from typing import Any
+
 from fastapi import WebSocket
 
+from app.voice.vad import create_vad_analyzer
+
 try:
-    from pipecat.audio.vad.silero import SileroVADAnalyzer, VADParams
     from pipecat.transports.websocket.fastapi import (
         FastAPIWebsocketParams,
         FastAPIWebsocketTransport,
     )
     from pipecat.transports.base_transport import BaseTransport
 except ImportError:  # pragma: no cover - optional dependency during Phase 2.3
-    SileroVADAnalyzer = None
-    VADParams = None
     FastAPIWebsocketParams = None
     FastAPIWebsocketTransport = None
     BaseTransport = object
 
 
-def create_websocket_transport(websocket: WebSocket) -> BaseTransport:
+def create_websocket_transport(websocket: WebSocket, *, vad_analyzer: Any | None = None) -> BaseTransport:
     if FastAPIWebsocketTransport is None:
         raise RuntimeError("pipecat is required for websocket transport")
 
-    vad_analyzer = SileroVADAnalyzer(
-        params=VADParams(
-            start_secs=0.2,
-            stop_secs=0.8,
-            min_volume=0.6,
-        )
-    )
+    if vad_analyzer is None:
+        vad_analyzer = create_vad_analyzer()
 
     return FastAPIWebsocketTransport(
         websocket=websocket,
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncGenerator
+
+from app.core.config import settings
+
+try:
+    from pipecat.frames.frames import ErrorFrame, TTSAudioRawFrame, TTSStartedFrame, TTSStoppedFrame
+    from pipecat.services.google.tts import GoogleTTSService
+except ImportError:  # pragma: no cover - optional dependency in tests
+    ErrorFrame = None
+    TTSAudioRawFrame = None
+    TTSStartedFrame = None
+    TTSStoppedFrame = None
+    GoogleTTSService = object
+
+# Long, one-off LLM sentences would only churn the cache.
+_MAX_CACHEABLE_CHARS = 200
+
+
+def normalize_phrase(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+class TTSPhraseCache:
+    """Content-addressed PCM cache: a small hot in-memory tier over a size-bounded disk LRU."""
+
+    def __init__(self, *, directory: Path, max_disk_bytes: int, max_hot_bytes: int) -> None:
+        self._directory = directory
+        self._max_disk_bytes = max_disk_bytes
+        self._max_hot_bytes = max_hot_bytes
+        self._lock = threading.Lock()
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+        self._hot: OrderedDict[str, bytes] = OrderedDict()
+        self._hot_bytes = 0
+        self.hot_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+        self._directory.mkdir(parents=True, exist_ok=True)
+        for path in sorted(self._directory.glob("*.pcm"), key=lambda p: p.stat().st_mtime):
+            size = path.stat().st_size
+            self._disk[path.stem] = size
+            self._disk_bytes += size
+
+    @staticmethod
+    def key(text: str, *, voice: str, sample_rate: int) -> str:
+        raw = f"{voice}|{sample_rate}|{normalize_phrase(text)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self._directory / f"{key}.pcm"
+
+    def _remember_hot(self, key: str, audio: bytes) -> None:
+        if len(audio) > self._max_hot_bytes:
+            return
+        if key in self._hot:
+            self._hot.move_to_end(key)
+            return
+        self._hot[key] = audio
+        self._hot_bytes += len(audio)
+        while self._hot_bytes > self._max_hot_bytes:
+            _, evicted = self._hot.popitem(last=False)
+            self._hot_bytes -= len(evicted)
+
+    def get(self, key: str) -> bytes | None:
+        """Cached PCM for `key`; a disk hit reads the file (blocking) and promotes it to the hot tier."""
+
+        with self._lock:
+            audio = self._hot.get(key)
+            if audio is not None:
+                self._hot.move_to_end(key)
+                self.hot_hits += 1
+                self.bytes_saved += len(audio)
+                return audio
+            if key not in self._disk:
+                self.misses += 1
+                return None
+            self._disk.move_to_end(key)
+
+        try:
+            audio = self._path(key).read_bytes()
+        except OSError:
+            with self._lock:
+                self._disk_bytes -= self._disk.pop(key, 0)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+            self.bytes_saved += len(audio)
+            self._remember_hot(key, audio)
+        return audio
+
+    async def fetch(self, key: str) -> bytes | None:
+        """get() for the event loop: hot hits and misses answer inline, disk reads run in a thread."""
+
+        with self._lock:
+            disk_only = key not in self._hot and key in self._disk
+        if not disk_only:
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    def put(self, key: str, audio: bytes) -> None:
+        if not audio or len(audio) > self._max_disk_bytes:
+            return
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_bytes(audio)
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        evicted: list[str] = []
+        with self._lock:
+            self._disk_bytes -= self._disk.pop(key, 0)
+            self._disk[key] = len(audio)
+            self._disk_bytes += len(audio)
+            while self._disk_bytes > self._max_disk_bytes:
+                old_key, size = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+                evicted.append(old_key)
+            self._remember_hot(key, audio)
+
+        for old_key in evicted:
+            self._path(old_key).unlink(missing_ok=True)
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            lookups = self.hot_hits + self.disk_hits + self.misses
+            return {
+                "hot_hits": self.hot_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": round((self.hot_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "bytes_saved": self.bytes_saved,
+                "disk_bytes": self._disk_bytes,
+                "disk_entries": len(self._disk),
+                "hot_bytes": self._hot_bytes,
+            }
+
+
+_cache: TTSPhraseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_tts_phrase_cache() -> TTSPhraseCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TTSPhraseCache(
+                directory=Path(settings.voice_audio_cache_dir) / "tts",
+                max_disk_bytes=settings.voice_tts_cache_max_disk_mb * 1024 * 1024,
+                max_hot_bytes=settings.voice_tts_cache_max_hot_mb * 1024 * 1024,
+            )
+        return _cache
+
+
+class CachedGoogleTTSService(GoogleTTSService):
+    """GoogleTTSService that serves repeated phrases from the shared PCM cache."""
+
+    def __init__(self, *, cache: TTSPhraseCache, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._phrase_cache = cache
+
+    async def run_tts(self, text: str, context_id: str) -> AsyncGenerator[Any, None]:
+        if len(text) > _MAX_CACHEABLE_CHARS:
+            async for frame in super().run_tts(text, context_id):
+                yield frame
+            return
+
+        key = TTSPhraseCache.key(text, voice=self._voice_id, sample_rate=self.sample_rate)
+        audio = await self._phrase_cache.fetch(key)
+        if audio is not None:
+            yield TTSStartedFrame(context_id=context_id)
+            for i in range(0, len(audio), self.chunk_size):
+                yield TTSAudioRawFrame(audio[i : i + self.chunk_size], self.sample_rate, 1, context_id=context_id)
+            yield TTSStoppedFrame(context_id=context_id)
+            return
+
+        chunks: list[bytes] = []
+        failed = False
+        async for frame in super().run_tts(text, context_id):
+            if isinstance(frame, TTSAudioRawFrame):
+                chunks.append(frame.audio)
+            elif isinstance(frame, ErrorFrame):
+                failed = True
+            yield frame
+
+        if chunks and not failed:
+            await asyncio.to_thread(self._phrase_cache.put, key, b"".join(chunks))
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from importlib import resources
+from typing import Any
+
+from app.core.config import settings
+
+try:
+    import numpy as np
+    import onnxruntime
+    from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams
+except Exception:  # pragma: no cover - pipecat[silero] is optional in tests
+    np = None
+    onnxruntime = None
+    VADAnalyzer = object
+    VADParams = None
+
+logger = logging.getLogger("voice.vad")
+
+_MODEL_PACKAGE = "pipecat.audio.vad.data"
+_MODEL_NAME = "silero_vad.onnx"
+# Silero's recurrent state drifts on long streams; pipecat resets it on the same cadence.
+_STATE_RESET_SECONDS = 5.0
+
+
+def _frames_for(sample_rate: int) -> int:
+    return 512 if sample_rate == 16000 else 256
+
+
+def _context_for(sample_rate: int) -> int:
+    return 64 if sample_rate == 16000 else 32
+
+
+@dataclass
+class SileroStreamState:
+    """Per-session recurrent state; the only VAD memory a session owns."""
+
+    state: Any = None
+    context: Any = None
+    sample_rate: int = 0
+    last_reset: float = field(default_factory=time.monotonic)
+
+    def reset(self, sample_rate: int) -> None:
+        self.state = np.zeros((2, 1, 128), dtype="float32")
+        self.context = np.zeros((1, _context_for(sample_rate)), dtype="float32")
+        self.sample_rate = sample_rate
+        self.last_reset = time.monotonic()
+
+
+class SharedSileroModel:
+    """One ONNX inference session shared by every stream in the process."""
+
+    def __init__(self, path: str) -> None:
+        opts = onnxruntime.SessionOptions()
+        opts.inter_op_num_threads = 1
+        opts.intra_op_num_threads = 1
+        self._session = onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"], sess_options=opts)
+        self.batches = 0
+        self.frames = 0
+
+    def infer(self, streams: list[SileroStreamState], audio: list[Any], sample_rate: int) -> list[float]:
+        """Run one batched inference over frames from different streams (same sample rate)."""
+
+        now = time.monotonic()
+        for stream in streams:
+            if stream.sample_rate != sample_rate or now - stream.last_reset >= _STATE_RESET_SECONDS:
+                stream.reset(sample_rate)
+
+        x = np.concatenate(
+            [np.concatenate((stream.context, chunk.reshape(1, -1)), axis=1) for stream, chunk in zip(streams, audio)],
+            axis=0,
+        )
+        state = np.concatenate([stream.state for stream in streams], axis=1)
+        out, new_state = self._session.run(
+            None, {"input": x, "state": state, "sr": np.array(sample_rate, dtype="int64")}
+        )
+
+        context_size = _context_for(sample_rate)
+        for row, stream in enumerate(streams):
+            stream.state = new_state[:, row : row + 1, :]
+            stream.context = x[row : row + 1, -context_size:]
+
+        self.batches += 1
+        self.frames += len(streams)
+        return [float(value) for value in out[:, 0]]
+
+
+class SileroVADBatcher:
+    """Coalesce concurrent per-session VAD frames into batched model calls."""
+
+    def __init__(
+        self, model: SharedSileroModel, *, window_seconds: float, max_batch: int, timeout_seconds: float
+    ) -> None:
+        self._model = model
+        self._window_seconds = window_seconds
+        self._max_batch = max_batch
+        self._timeout_seconds = timeout_seconds
+        self.timeouts = 0
+        self._queue: queue.Queue[tuple[SileroStreamState, Any, int, Future]] = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="silero-vad-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, stream: SileroStreamState, audio: Any, sample_rate: int) -> float:
+        """Confidence for one frame; 0.0 (silence) if the batcher doesn't answer within the timeout."""
+
+        future: Future = Future()
+        self._queue.put((stream, audio, sample_rate, future))
+        try:
+            return future.result(timeout=self._timeout_seconds)
+        except FutureTimeoutError:
+            # A stalled batcher must not stall the audio input; the frame is dropped if still queued.
+            future.cancel()
+            self.timeouts += 1
+            logger.warning("silero_vad_timeout", extra={"timeout_ms": round(self._timeout_seconds * 1000, 1)})
+            return 0.0
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._window_seconds
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            by_rate: dict[int, list[tuple[SileroStreamState, Any, int, Future]]] = {}
+            for request in batch:
+                # Skips requests whose caller already gave up; the rest can no longer be cancelled.
+                if request[3].set_running_or_notify_cancel():
+                    by_rate.setdefault(request[2], []).append(request)
+            for sample_rate, requests in by_rate.items():
+                try:
+                    results = self._model.infer([r[0] for r in requests], [r[1] for r in requests], sample_rate)
+                except Exception as exc:
+                    for request in requests:
+                        request[3].set_exception(exc)
+                    continue
+                for request, confidence in zip(requests, results):
+                    request[3].set_result(confidence)
+
+
+_registry_lock = threading.Lock()
+_shared_model: SharedSileroModel | None = None
+_batcher: SileroVADBatcher | None = None
+
+
+def get_shared_silero_model() -> SharedSileroModel:
+    global _shared_model
+    with _registry_lock:
+        if _shared_model is None:
+            if onnxruntime is None:
+                raise RuntimeError("pipecat[silero] is required for voice activity detection")
+            path = str(resources.files(_MODEL_PACKAGE).joinpath(_MODEL_NAME))
+            _shared_model = SharedSileroModel(path)
+            logger.info("silero_vad_model_loaded", extra={"path": path})
+        return _shared_model
+
+
+def get_silero_batcher() -> SileroVADBatcher | None:
+    global _batcher
+    if settings.voice_vad_batch_window_ms <= 0:
+        return None
+    model = get_shared_silero_model()
+    with _registry_lock:
+        if _batcher is None:
+            _batcher = SileroVADBatcher(
+                model,
+                window_seconds=settings.voice_vad_batch_window_ms / 1000.0,
+                max_batch=settings.voice_vad_max_batch,
+                timeout_seconds=settings.voice_vad_timeout_ms / 1000.0,
+            )
+        return _batcher
+
+
+class SharedSileroVADAnalyzer(VADAnalyzer):
+    """Silero VAD analyzer that borrows the process-wide model instead of loading its own."""
+
+    def __init__(
+        self,
+        *,
+        model: SharedSileroModel,
+        batcher: SileroVADBatcher | None = None,
+        sample_rate: int | None = None,
+        params: Any | None = None,
+    ) -> None:
+        super().__init__(sample_rate=sample_rate, params=params)
+        self._model = model
+        self._batcher = batcher
+        self._stream = SileroStreamState()
+
+    def set_sample_rate(self, sample_rate: int) -> None:
+        if sample_rate not in (8000, 16000):
+            raise ValueError(f"Silero VAD sample rate needs to be 16000 or 8000 (sample rate: {sample_rate})")
+        super().set_sample_rate(sample_rate)
+
+    def num_frames_required(self) -> int:
+        return _frames_for(self.sample_rate)
+
+    def voice_confidence(self, buffer: bytes) -> float:
+        try:
+            audio = np.frombuffer(buffer, np.int16).astype(np.float32) / 32768.0
+            if self._batcher is not None:
+                return self._batcher.submit(self._stream, audio, self.sample_rate)
+            return self._model.infer([self._stream], [audio], self.sample_rate)[0]
+        except Exception:
+            logger.exception("silero_vad_inference_failed")
+            return 0.0
+
+
+def vad_stats() -> dict[str, object]:
+    model = _shared_model
+    if model is None:
+        return {"loaded": False}
+    return {
+        "loaded": True,
+        "batched": _batcher is not None,
+        "timeouts": _batcher.timeouts if _batcher is not None else 0,
+        "batches": model.batches,
+        "frames": model.frames,
+        "avg_batch_size": round(model.frames / model.batches, 2) if model.batches else 0.0,
+    }
+
+
+def create_vad_analyzer() -> Any:
+    if VADParams is None:
+        raise RuntimeError("pipecat[silero] is required for voice activity detection")
+
+    return SharedSileroVADAnalyzer(
+        model=get_shared_silero_model(),
+        batcher=get_silero_batcher(),
+        params=VADParams(
+            start_secs=settings.voice_vad_start_secs,
+            stop_secs=settings.voice_vad_stop_secs,
+            min_volume=settings.voice_vad_min_volume,
+        ),
+    )
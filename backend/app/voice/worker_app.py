@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import uuid
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Query, WebSocket
+
+from app.api.routers.voice.metrics import router as voice_metrics_router
+from app.api.routers.voice.telephony import DailyStartRequest
+from app.core.config import settings
+from app.voice.drain import drain_on_signal, get_voice_drain
+from app.voice.runtime import voice_runtime
+from app.voice.session_runner import run_websocket_session, start_daily_session
+
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI):
+    async with voice_runtime():
+        with drain_on_signal():
+            yield
+
+
+# Served on a private unix socket by VoiceWorkerPool; callers were authenticated by the API process.
+app = FastAPI(title=f"{settings.app_name}-voice-worker", lifespan=_lifespan)
+app.include_router(voice_metrics_router)
+
+
+@app.websocket("/internal/ws")
+async def worker_ws(
+    websocket: WebSocket,
+    store_id: uuid.UUID = Query(...),
+    user_id: uuid.UUID | None = Query(default=None),
+    order_id: uuid.UUID | None = Query(default=None),
+    resume_token: str | None = Query(default=None),
+) -> None:
+    await websocket.accept()
+    await run_websocket_session(
+        websocket, store_id=store_id, user_id=user_id, order_id=order_id, resume_token=resume_token
+    )
+
+
+@app.post("/internal/daily/start")
+async def worker_daily_start(payload: DailyStartRequest) -> dict:
+    await start_daily_session(
+        room_url=payload.room_url,
+        token=payload.token,
+        store_id=payload.store_id,
+        user_id=payload.user_id,
+        order_id=payload.order_id,
+    )
+    return {"status": "starting"}
+
+
+@app.post("/internal/drain")
+def worker_drain() -> dict:
+    drain = get_voice_drain()
+    drain.start()
+    return drain.status()
+
+
+@app.get("/internal/drain")
+def worker_drain_status() -> dict:
+    return get_voice_drain().status()
+
+
+@app.get("/health")
+def health() -> dict:
+    return {"status": "ok"}
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sys
+import time
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlencode
+
+import httpx
+from fastapi import WebSocket
+from websockets.asyncio.client import unix_connect
+from websockets.exceptions import ConnectionClosed, WebSocketException
+
+from app.core.config import settings
+from app.core.errors import AppError
+from app.voice.guards import PAYLOAD_TOO_LARGE
+from app.voice.supervisor import SESSION_LEDGER_FILE
+from app.voice.transports.guard import WS_CLOSE_CODES, transport_guard_stats
+
+logger = logging.getLogger("voice.workers")
+
+_WORKER_APP = "app.voice.worker_app:app"
+_MONITOR_INTERVAL_SECONDS = 1.0
+_STOP_TIMEOUT_SECONDS = 10.0
+# Workers enforce the drain deadline themselves; allow for their final cart checkpoint on top.
+_DRAIN_MARGIN_SECONDS = 15.0
+
+
+def shard_for(key: uuid.UUID | str, size: int) -> int:
+    """Stable shard index for `key`; the same store (or order) always lands on the same worker."""
+
+    return zlib.crc32(str(key).encode("utf-8")) % size
+
+
+@dataclass
+class VoiceWorker:
+    index: int
+    socket_path: str
+    env: dict[str, str] = field(repr=False)
+    process: asyncio.subprocess.Process | None = field(default=None, repr=False)
+    restarts: int = 0
+    sessions: int = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self) -> None:
+        Path(self.socket_path).unlink(missing_ok=True)
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "uvicorn", _WORKER_APP, "--uds", self.socket_path, env=self.env
+        )
+        logger.info("voice_worker_started", extra={"worker": self.index, "pid": self.process.pid})
+
+    async def stop(self) -> None:
+        if not self.alive:
+            return
+        self.process.terminate()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout=_STOP_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "pid": self.process.pid if self.process is not None else None,
+            "alive": self.alive,
+            "restarts": self.restarts,
+            "sessions": self.sessions,
+        }
+
+
+class VoiceWorkerPool:
+    """
+    Voice pipelines run in `size` uvicorn worker processes listening on local unix sockets.
+
+    The API process authenticates callers, picks a worker by shard, and then only relays bytes
+    (WebSocket) or hands the call over (Daily), so audio work never shares its event loop.
+    """
+
+    def __init__(self, *, size: int, socket_dir: str, shard_by: str) -> None:
+        self._socket_dir = Path(socket_dir)
+        self._admission_dir = self._socket_dir / "admission"
+        self._shard_by = shard_by
+        size = max(1, size)
+        self._workers = [
+            VoiceWorker(index=i, socket_path=str(self._socket_dir / f"voice-worker-{i}.sock"), env=self._env(i))
+            for i in range(size)
+        ]
+        self._monitor_task: asyncio.Task | None = None
+
+    def _env(self, index: int) -> dict[str, str]:
+        env = dict(os.environ)
+        env.update(
+            {
+                # A worker runs its pipelines in-process.
+                "VOICE_WORKER_PROCESSES": "0",
+                # Journals are flock'd per process; give each worker its own directory.
+                "VOICE_CART_JOURNAL_DIR": str(Path(settings.voice_cart_journal_dir) / f"worker-{index}"),
+                # One LLM quota across all workers.
+                "VOICE_LLM_RATE_LIMIT_PATH": settings.voice_llm_rate_limit_path
+                or str(self._socket_dir / "llm.bucket"),
+                # Workers admit sessions against one ledger and start bucket, so every cap is host-wide.
+                "VOICE_SESSION_STATE_DIR": str(self._admission_dir),
+            }
+        )
+        return env
+
+    async def start(self) -> None:
+        self._socket_dir.mkdir(parents=True, exist_ok=True)
+        os.chmod(self._socket_dir, 0o700)
+        # Sessions of a previous run are gone; don't let a reused pid keep their slots.
+        (self._admission_dir / SESSION_LEDGER_FILE).unlink(missing_ok=True)
+        for worker in self._workers:
+            await worker.start()
+        self._monitor_task = asyncio.create_task(self._monitor())
+
+    async def _monitor(self) -> None:
+        while True:
+            await asyncio.sleep(_MONITOR_INTERVAL_SECONDS)
+            for worker in self._workers:
+                if worker.process is not None and not worker.alive:
+                    logger.error(
+                        "voice_worker_exited", extra={"worker": worker.index, "code": worker.process.returncode}
+                    )
+                    worker.restarts += 1
+                    worker.sessions = 0
+                    try:
+                        await worker.start()
+                    except Exception:
+                        logger.exception("voice_worker_restart_failed", extra={"worker": worker.index})
+
+    def shard(
+        self, *, store_id: uuid.UUID, order_id: uuid.UUID | None = None, resume_token: str | None = None
+    ) -> VoiceWorker:
+        """The worker for a new session; a dead worker's sessions move to the next one in the ring."""
+
+        if self._shard_by == "session":
+            # Reconnects and resumed orders stick to one worker, where their parked session and journal live.
+            key: uuid.UUID | str = resume_token or order_id or uuid.uuid4()
+        else:
+            key = store_id
+        start = shard_for(key, len(self._workers))
+        for offset in range(len(self._workers)):
+            worker = self._workers[(start + offset) % len(self._workers)]
+            if worker.alive:
+                return worker
+        return self._workers[start]
+
+    async def proxy_websocket(self, websocket: WebSocket, *, worker: VoiceWorker, query: dict[str, Any]) -> None:
+        """Relay an accepted client WebSocket to the worker's session endpoint until either side closes."""
+
+        params = urlencode({key: str(value) for key, value in query.items() if value is not None})
+        try:
+            upstream = await unix_connect(worker.socket_path, f"ws://voice-worker/internal/ws?{params}", max_size=None)
+        except (OSError, asyncio.TimeoutError, WebSocketException):
+            logger.exception("voice_worker_unreachable", extra={"worker": worker.index})
+            await websocket.close(code=1011)
+            return
+
+        max_payload = settings.voice_ws_max_payload_kb * 1024
+
+        async def client_to_worker() -> None:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                data = message.get("bytes")
+                payload = data if data is not None else message.get("text", "")
+                if len(payload) > max_payload:
+                    # Same limit the worker's TransportGuard applies, enforced before the bytes cross processes.
+                    transport_guard_stats.record(PAYLOAD_TOO_LARGE)
+                    await websocket.close(code=WS_CLOSE_CODES[PAYLOAD_TOO_LARGE], reason=PAYLOAD_TOO_LARGE)
+                    return
+                await upstream.send(payload)
+
+        async def worker_to_client() -> None:
+            async for message in upstream:
+                if isinstance(message, bytes):
+                    await websocket.send_bytes(message)
+                else:
+                    await websocket.send_text(message)
+
+        worker.sessions += 1
+        client_relay = asyncio.create_task(client_to_worker())
+        worker_relay = asyncio.create_task(worker_to_client())
+        try:
+            done, pending = await asyncio.wait({client_relay, worker_relay}, return_when=asyncio.FIRST_COMPLETED)
+            for relay in pending:
+                relay.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for relay in done:
+                error = relay.exception()
+                if error is not None and not isinstance(error, ConnectionClosed):
+                    logger.warning("voice_worker_relay_failed", exc_info=error)
+        finally:
+            worker.sessions = max(0, worker.sessions - 1)
+            await upstream.close()
+
+        if client_relay not in done:
+            # The worker ended the session (or refused it): pass its close code and reason on to the caller.
+            code = upstream.close_code if upstream.close_code not in (None, 1005, 1006) else 1011
+            await websocket.close(code=code, reason=upstream.close_reason or None)
+
+    def _client(self, worker: VoiceWorker) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(uds=worker.socket_path), base_url="http://voice-worker", timeout=30.0
+        )
+
+    async def start_daily_call(self, payload: dict[str, Any], *, worker: VoiceWorker) -> None:
+        async with self._client(worker) as client:
+            response = await client.post("/internal/daily/start", json=payload)
+            if response.status_code in (429, 503):
+                # Admission refusals (over capacity, draining) reach the caller as the worker raised them.
+                body = response.json()
+                raise AppError(status_code=429, code=body["code"], detail=body["detail"])
+            response.raise_for_status()
+
+    async def collect(self, path: str, params: dict[str, Any] | None = None) -> dict[str, object]:
+        """GET `path` from every worker, e.g. to merge their metrics."""
+
+        results: dict[str, object] = {}
+        for worker in self._workers:
+            try:
+                async with self._client(worker) as client:
+                    # Workers serve the admin-only metrics routes too; forward the token they expect.
+                    headers = {"X-Voice-Admin-Token": settings.voice_admin_token} if settings.voice_admin_token else None
+                    response = await client.get(path, params=params, headers=headers)
+                    response.raise_for_status()
+                    results[f"worker-{worker.index}"] = response.json()
+            except (httpx.HTTPError, OSError):
+                results[f"worker-{worker.index}"] = {"error": "unavailable", **worker.as_dict()}
+        return results
+
+    async def drain(self, *, deadline_seconds: float) -> dict[str, object]:
+        """Put every worker into drain mode and wait until each has finished draining."""
+
+        async def drain_worker(worker: VoiceWorker) -> object:
+            give_up_at = time.monotonic() + deadline_seconds + _DRAIN_MARGIN_SECONDS
+            try:
+                async with self._client(worker) as client:
+                    response = await client.post("/internal/drain")
+                    response.raise_for_status()
+                    while not response.json()["finished"] and time.monotonic() < give_up_at:
+                        await asyncio.sleep(_MONITOR_INTERVAL_SECONDS)
+                        response = await client.get("/internal/drain")
+                        response.raise_for_status()
+                    return response.json()
+            except (httpx.HTTPError, OSError):
+                return {"error": "unavailable", **worker.as_dict()}
+
+        alive = [worker for worker in self._workers if worker.alive]
+        results = await asyncio.gather(*(drain_worker(worker) for worker in alive))
+        return {f"worker-{worker.index}": result for worker, result in zip(alive, results)}
+
+    def stats(self) -> dict[str, object]:
+        return {f"worker-{worker.index}": worker.as_dict() for worker in self._workers}
+
+    async def close(self) -> None:
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            await asyncio.gather(self._monitor_task, return_exceptions=True)
+        await asyncio.gather(*(worker.stop() for worker in self._workers))
+
+
+_pool: VoiceWorkerPool | None = None
+
+
+def get_voice_worker_pool() -> VoiceWorkerPool | None:
+    """The worker pool, or None when pipelines run in this process (voice_worker_processes == 0)."""
+
+    global _pool
+    if settings.voice_worker_processes <= 0:
+        return None
+    if _pool is None:
+        _pool = VoiceWorkerPool(
+            size=settings.voice_worker_processes,
+            socket_dir=settings.voice_worker_socket_dir,
+            shard_by=settings.voice_worker_shard_by,
+        )
+    return _pool
@@ -9,15 +9,18 @@ from app.db.session import get_db
 from app.main import app
 
 
-def _make_client(*, base_url: str):
+def _make_session_factory():
     engine = create_engine(
         "sqlite+pysqlite:///:memory:",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
-    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
-
     Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+def _make_client(*, base_url: str):
+    TestingSessionLocal = _make_session_factory()
 
     def override_get_db():
         db = TestingSessionLocal()
@@ -47,3 +50,17 @@ def store_client():
             yield c
         finally:
             app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+def session_factory():
+    return _make_session_factory()
+
+
+@pytest.fixture()
+def db_session(session_factory):
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,42 @@
+from app.voice.context_window import ORDER_NOTE_PREFIX, TRIMMED_NOTE, _with_order_note, trim_messages
+from app.voice.tool_results import estimate_tokens
+
+
+def _conversation(turns: int) -> list[dict]:
+    messages = [{"role": "system", "content": "You take food orders."}]
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"turn {i}: I would like another cheeseburger please " * 3})
+        messages.append({"role": "assistant", "tool_calls": [{"id": f"c{i}", "function": {"name": "add_item"}}]})
+        messages.append({"role": "tool", "tool_call_id": f"c{i}", "content": '{"ok":true,"total_cents":500}'})
+        messages.append({"role": "assistant", "content": "Added. Anything else?"})
+    return messages
+
+
+def test_short_conversations_are_untouched():
+    messages = _conversation(2)
+    assert trim_messages(messages, max_tokens=10_000, min_recent=4) == (messages, False)
+
+
+def test_long_conversations_are_trimmed_at_user_turns_within_budget():
+    messages = _conversation(40)
+    trimmed, changed = trim_messages(messages, max_tokens=600, min_recent=4)
+
+    assert changed is True
+    assert estimate_tokens(trimmed) <= 600
+    assert trimmed[0] == {"role": "system", "content": f"{messages[0]['content']}\n\n{TRIMMED_NOTE}"}
+    assert trimmed[1]["role"] == "user"
+    assert trimmed[-4:] == messages[-4:]
+
+    # Re-trimming an already trimmed prompt keeps a single note, and never two user turns in a row.
+    again, _ = trim_messages(trimmed + _conversation(5)[1:], max_tokens=600, min_recent=4)
+    assert again[0]["content"].count(TRIMMED_NOTE) == 1
+    assert all(not (a["role"] == b["role"] == "user") for a, b in zip(again, again[1:]))
+
+
+def test_order_note_rides_on_the_latest_user_message_only():
+    first = _with_order_note(_conversation(2), "Current order: empty.")
+    second = _with_order_note(first + [{"role": "user", "content": "and a coke"}], "Current order: 1x Coke.")
+
+    assert second[0] == _conversation(2)[0]
+    assert second[:-1] == _conversation(2)
+    assert second[-1]["content"] == f"{ORDER_NOTE_PREFIX}Current order: 1x Coke.\nand a coke"
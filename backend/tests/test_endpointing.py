@@ -0,0 +1,74 @@
+import uuid
+from dataclasses import dataclass, replace
+from decimal import Decimal
+
+from app.services.menu_index_service import MenuIndex, MenuIndexEntry
+from app.voice.endpointing import (
+    COMPLETE,
+    INCOMPLETE,
+    NEUTRAL,
+    AdaptiveEndpointing,
+    EndpointingStats,
+    classify_partial,
+)
+
+
+@dataclass
+class _Params:
+    stop_secs: float
+
+    def model_copy(self, *, update: dict) -> "_Params":
+        return replace(self, **update)
+
+
+class _VAD:
+    def __init__(self) -> None:
+        self.params = _Params(stop_secs=0.8)
+
+    def set_params(self, params: _Params) -> None:
+        self.params = params
+
+
+def _menu(*names: str) -> MenuIndex:
+    index = MenuIndex(store_id=uuid.uuid4(), version=())
+    for name in names:
+        index.add(
+            MenuIndexEntry(
+                menu_item_id=uuid.uuid4(), menu_id=uuid.uuid4(), name=name, price=Decimal("1.00"), availability=True
+            )
+        )
+    return index
+
+
+def test_classify_partial_transcripts():
+    menu = _menu("Cheeseburger", "Large Fries")
+
+    assert classify_partial("I'd like a cheeseburger", menu) == COMPLETE
+    assert classify_partial("two large fries", menu) == COMPLETE
+    assert classify_partial("that's it", menu) == COMPLETE
+    assert classify_partial("a cheeseburger and", menu) == INCOMPLETE
+    assert classify_partial("can I get two", menu) == INCOMPLETE
+    assert classify_partial("hmm let me think", menu) == NEUTRAL
+
+
+def test_silence_window_follows_the_transcript_and_learns_per_store():
+    store_id = uuid.uuid4()
+    stats = EndpointingStats(baseline_secs=0.8, min_secs=0.3, max_secs=1.2, target_premature_rate=0.05)
+    vad = _VAD()
+    endpointing = AdaptiveEndpointing(vad_analyzer=vad, store_id=store_id, stats=stats)
+    menu = _menu("Cheeseburger")
+
+    endpointing.transcript("a cheeseburger", menu)
+    assert vad.params.stop_secs == 0.3
+    endpointing.transcript("a cheeseburger and", menu)
+    assert vad.params.stop_secs == 1.2
+
+    endpointing.transcript("a cheeseburger", menu)
+    for _ in range(20):
+        endpointing.user_stopped()
+        endpointing.bot_started()
+    report = stats.as_dict()["stores"][str(store_id)]
+    assert report["avg_saved_ms"] == 500.0
+    assert report["premature_rate"] == 0.0
+    # No caller was cut off in a full window, so the store's default window shrinks.
+    assert stats.default_stop_secs(store_id) < 0.8
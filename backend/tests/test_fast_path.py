@@ -0,0 +1,120 @@
+import uuid
+from decimal import Decimal
+
+from app.services.menu_index_service import MenuIndex, MenuIndexEntry
+from app.voice.fast_path import execute_fast_intent, parse_simple_intent
+
+
+def _index(items=None) -> MenuIndex:
+    index = MenuIndex(store_id=uuid.uuid4(), version=())
+    for name, aliases in items or [
+        ("Large Fries", []),
+        ("Cheeseburger", []),
+        ("Fish and Chips", []),
+        ("Coca-Cola", ["coke"]),
+    ]:
+        index.add(
+            MenuIndexEntry(
+                menu_item_id=uuid.uuid4(),
+                menu_id=uuid.uuid4(),
+                name=name,
+                price=Decimal("2.50"),
+                availability=True,
+            ),
+            aliases=aliases,
+        )
+    return index
+
+
+def _lines(intent):
+    return [(line.entry.name, line.quantity) for line in intent.lines]
+
+
+def test_parses_quantities_and_multiple_items():
+    intent = parse_simple_intent("Two large fries and a coke, please.", _index())
+    assert intent.kind == "add"
+    assert _lines(intent) == [("Large Fries", 2), ("Coca-Cola", 1)]
+    assert intent.confidence >= 0.9
+
+
+def test_item_names_containing_and_are_not_split():
+    intent = parse_simple_intent("can I get fish and chips", _index())
+    assert _lines(intent) == [("Fish and Chips", 1)]
+
+
+def test_remove_and_closing_phrases():
+    index = _index()
+    remove = parse_simple_intent("remove the coke", index)
+    assert remove.kind == "remove"
+    assert _lines(remove) == [("Coca-Cola", 1)]
+    assert parse_simple_intent("No, that's all.", index).kind == "done"
+    assert parse_simple_intent("checkout", index).kind == "checkout"
+
+
+def test_complex_or_unknown_turns_fall_through_to_llm():
+    index = _index()
+    assert parse_simple_intent("a cheeseburger without onions", index) is None
+    assert parse_simple_intent("what drinks do you have?", index) is None
+    assert parse_simple_intent("two tacos", index) is None
+    assert parse_simple_intent("no coke", index) is None
+
+
+def test_partial_name_matches_go_to_the_llm():
+    index = _index([("Fries", []), ("Diet Coke", []), ("Large Fries", []), ("Chicken Sandwich", [])])
+    assert parse_simple_intent("coke", index) is None
+    assert parse_simple_intent("large", index) is None
+    assert parse_simple_intent("I want the sandwich", index) is None
+    assert _lines(parse_simple_intent("fries and a diet coke", index)) == [("Fries", 1), ("Diet Coke", 1)]
+
+
+class _Router:
+    def __init__(self, items):
+        self.items = items
+        self.updates = None
+
+    def get_summary(self):
+        return {"ok": True, "order": {"items": self.items}}
+
+    def update_quantities(self, *, items):
+        self.updates = items
+        return {"ok": True}
+
+
+def test_remove_takes_off_the_stated_quantity_only():
+    index = _index()
+    fries = index.lookup("large fries")
+    line_id = uuid.uuid4()
+    cart = [{"order_item_id": line_id, "menu_item_id": fries.menu_item_id, "name": "Large Fries", "quantity": 3}]
+
+    router = _Router(cart)
+    reply = execute_fast_intent(parse_simple_intent("remove one large fries", index), router)
+    assert router.updates == [{"order_item_id": line_id, "quantity": 2}]
+    assert reply == "Removed 1 Large Fries. Anything else?"
+
+    router = _Router(cart)
+    reply = execute_fast_intent(parse_simple_intent("remove the large fries", index), router)
+    assert router.updates == [{"order_item_id": line_id, "quantity": 0}]
+    assert reply == "Removed 3 Large Fries. Anything else?"
+
+    router = _Router(cart)
+    assert execute_fast_intent(parse_simple_intent("remove five large fries", index), router) is None
+    assert router.updates is None
+
+
+def test_remove_covers_every_line_of_the_item():
+    index = _index()
+    fries = index.lookup("large fries")
+    first, second = uuid.uuid4(), uuid.uuid4()
+    cart = [
+        {"order_item_id": first, "menu_item_id": fries.menu_item_id, "name": "Large Fries", "quantity": 1},
+        {"order_item_id": second, "menu_item_id": fries.menu_item_id, "name": "Large Fries", "quantity": 2},
+    ]
+
+    router = _Router(cart)
+    reply = execute_fast_intent(parse_simple_intent("remove the large fries", index), router)
+    assert router.updates == [{"order_item_id": first, "quantity": 0}, {"order_item_id": second, "quantity": 0}]
+    assert reply == "Removed 3 Large Fries. Anything else?"
+
+    router = _Router(cart)
+    assert execute_fast_intent(parse_simple_intent("remove one large fries", index), router) is None
+    assert router.updates is None
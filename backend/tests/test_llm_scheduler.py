@@ -0,0 +1,58 @@
+import asyncio
+import uuid
+
+from app.voice.guards import SharedTokenBucket, TokenBucket
+from app.voice.llm_scheduler import LLMScheduler
+
+
+def test_queued_requests_alternate_between_stores_and_checkout_goes_first():
+    busy, quiet, checkout = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    async def scenario() -> list[str]:
+        scheduler = LLMScheduler(bucket=TokenBucket(capacity=1, refill_per_second=200.0), slow_wait_ms=10_000)
+        await scheduler.acquire(busy)  # drains the bucket, so everything below queues
+        order: list[str] = []
+
+        async def request(store_id: uuid.UUID, label: str, priority: bool = False) -> None:
+            await scheduler.acquire(store_id, priority=priority)
+            order.append(label)
+
+        tasks = [asyncio.create_task(request(busy, f"busy{i}")) for i in range(3)]
+        tasks.append(asyncio.create_task(request(quiet, "quiet")))
+        tasks.append(asyncio.create_task(request(checkout, "checkout", priority=True)))
+        await asyncio.gather(*tasks)
+
+        stats = scheduler.stats()
+        assert stats["requests"] == 6
+        assert stats["priority_requests"] == 1
+        assert stats["queued"] == 0
+        return order
+
+    order = asyncio.run(scenario())
+    assert order[0] == "checkout"
+    assert order.index("quiet") < order.index("busy1")
+
+
+def test_shared_bucket_state_is_seen_by_every_instance(tmp_path):
+    path = str(tmp_path / "llm.bucket")
+    first = SharedTokenBucket(capacity=2, refill_per_second=0.001, path=path)
+    second = SharedTokenBucket(capacity=2, refill_per_second=0.001, path=path)
+
+    assert first.allow()
+    assert second.allow()
+    assert not first.allow()
+    assert second.wait_time() > 0
+
+
+def test_scheduler_takes_shared_tokens_off_the_event_loop(tmp_path):
+    bucket = SharedTokenBucket(capacity=1, refill_per_second=100.0, path=str(tmp_path / "llm.bucket"))
+
+    async def scenario() -> dict[str, object]:
+        scheduler = LLMScheduler(bucket=bucket, slow_wait_ms=10_000)
+        await asyncio.gather(*(scheduler.acquire(uuid.uuid4()) for _ in range(3)))
+        return scheduler.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["requests"] == 3
+    assert stats["queued"] == 0
+    assert bucket.take() > 0
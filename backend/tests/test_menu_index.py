@@ -0,0 +1,160 @@
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import event
+
+from app.models.menu import Menu
+from app.models.menu_item import MenuItem
+from app.models.store import Store
+from app.schemas.menu.menu import MenuItemUpdate
+from app.services import menu_index_service, menu_service
+from app.services.menu_index_service import MenuIndex, MenuIndexEntry, normalize_name
+
+
+def _index(*names: str, aliases: dict[str, list[str]] | None = None) -> MenuIndex:
+    index = MenuIndex(store_id=uuid.uuid4(), version=())
+    for name in names:
+        index.add(
+            MenuIndexEntry(
+                menu_item_id=uuid.uuid4(),
+                menu_id=uuid.uuid4(),
+                name=name,
+                price=Decimal("1.00"),
+                availability=True,
+            ),
+            aliases=(aliases or {}).get(name),
+        )
+    return index
+
+
+def test_normalize_name_stems_and_drops_fillers():
+    assert normalize_name("Cheeseburgers") == "cheeseburger"
+    assert normalize_name("a Coke") == "coke"
+    assert normalize_name("Large FRIES!") == "large fry"
+    assert normalize_name("Crème Brûlée") == "creme brulee"
+
+
+def test_lookup_exact_plural_alias_and_fuzzy():
+    index = _index(
+        "Cheeseburger",
+        "Margherita Pizza",
+        "Pepperoni Pizza",
+        "Coca-Cola",
+        aliases={"Coca-Cola": ["coke"]},
+    )
+
+    assert index.lookup("cheeseburgers").name == "Cheeseburger"
+    assert index.lookup("a coke").name == "Coca-Cola"
+    assert index.lookup("margherita").name == "Margherita Pizza"
+    assert index.lookup("margarita pizza").name == "Margherita Pizza"
+    assert index.lookup("pizza") is None
+    assert index.lookup("sushi") is None
+
+
+def test_menu_changes_invalidate_cached_index(db_session):
+    store = Store(name="Kitchen", email="k@example.com", password_hash="x")
+    db_session.add(store)
+    db_session.flush()
+    menu = Menu(store_id=store.id, name="Main", active=True, version=1)
+    db_session.add(menu)
+    db_session.flush()
+    item = MenuItem(menu_id=menu.id, name="Fries", price=Decimal("3.00"), availability=True)
+    db_session.add(item)
+    db_session.commit()
+
+    first = menu_index_service.get_menu_index(db_session, store_id=store.id)
+    assert first.lookup("fries").menu_item_id == item.id
+    assert menu_index_service.get_menu_index(db_session, store_id=store.id) is first
+
+    menu_service.update_menu_item(db_session, item=item, payload=MenuItemUpdate(name="Curly Fries"))
+    db_session.commit()
+
+    second = menu_index_service.get_menu_index(db_session, store_id=store.id)
+    assert second is not first
+    assert second.lookup("curly fries").menu_item_id == item.id
+
+
+def test_item_edit_from_another_process_rebuilds_index(session_factory, monkeypatch):
+    setup = session_factory()
+    store = Store(name="Diner", email="d@example.com", password_hash="x")
+    setup.add(store)
+    setup.flush()
+    menu = Menu(store_id=store.id, name="Main", active=True, version=1)
+    setup.add(menu)
+    setup.flush()
+    setup.add(MenuItem(menu_id=menu.id, name="Fries", price=Decimal("3.00"), availability=True))
+    setup.commit()
+    store_id, menu_id = store.id, menu.id
+    setup.close()
+
+    db = session_factory()
+    first = menu_index_service.get_menu_index(db, store_id=store_id)
+    monkeypatch.setattr(menu_index_service.settings, "voice_menu_index_ttl_seconds", 0)
+    assert menu_index_service.get_menu_index(db, store_id=store_id) is first
+
+    # Another process edits the item directly: no invalidation reaches this one and Menu.version stays put.
+    other = session_factory()
+    item = other.query(MenuItem).filter_by(menu_id=menu_id).one()
+    item.name = "Curly Fries"
+    other.commit()
+    other.add(MenuItem(menu_id=menu_id, name="Shake", price=Decimal("4.00"), availability=True))
+    other.commit()
+    other.close()
+
+    second = menu_index_service.get_menu_index(db, store_id=store_id)
+    assert second is not first
+    assert second.lookup("curly fries") is not None
+    assert second.lookup("shake") is not None
+    db.close()
+
+
+def test_compiled_prompt_is_cached_until_the_menu_changes(db_session):
+    from app.voice.prompts import compile_store_prompt
+
+    store = Store(name="Grill", email="g@example.com", password_hash="x")
+    db_session.add(store)
+    db_session.flush()
+    menu = Menu(store_id=store.id, name="Main", active=True, version=1)
+    db_session.add(menu)
+    db_session.flush()
+    burger = MenuItem(
+        menu_id=menu.id,
+        name="Burger",
+        price=Decimal("8.50"),
+        availability=True,
+        tags=["mains"],
+        modifiers={"aliases": ["burg"], "size": ["single", "double"]},
+    )
+    db_session.add_all([burger, MenuItem(menu_id=menu.id, name="Pie", price=Decimal("4.00"), availability=False)])
+    db_session.commit()
+
+    first = compile_store_prompt(db_session, store_id=store.id)
+    assert "Mains:\n- Burger $8.50 (size: single/double)" in first.text
+    assert "Sold out today: Pie" in first.text
+    assert "burg" not in first.text.replace("Burger", "")
+    assert compile_store_prompt(db_session, store_id=store.id) is first
+
+    menu_service.update_menu_item(db_session, item=burger, payload=MenuItemUpdate(price=Decimal("9.00")))
+    db_session.commit()
+
+    second = compile_store_prompt(db_session, store_id=store.id)
+    assert "- Burger $9.00" in second.text
+    assert second.prefix_hash != first.prefix_hash
+
+    # An edit that bypasses menu_service (another process) is picked up by the signature check.
+    burger.price = Decimal("9.50")
+    db_session.commit()
+    assert "- Burger $9.50" in compile_store_prompt(db_session, store_id=store.id).text
+
+    # With a fresh menu index, a cache hit needs no queries at all.
+    menu_index_service.get_menu_index(db_session, store_id=store.id)
+    cached = compile_store_prompt(db_session, store_id=store.id)
+    statements: list[str] = []
+    engine = db_session.get_bind()
+    listener = lambda conn, cursor, statement, *rest: statements.append(statement)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert compile_store_prompt(db_session, store_id=store.id) is cached
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert statements == []
@@ -0,0 +1,51 @@
+from decimal import Decimal
+
+from app.core.config import settings
+from app.models.menu import Menu
+from app.models.menu_item import MenuItem
+from app.models.store import Store
+from app.schemas.order.order import OrderCreate
+from app.services import order_service
+
+
+def _seed(db):
+    store = Store(name="Kitchen", email="k@example.com", password_hash="x")
+    db.add(store)
+    db.flush()
+    menu = Menu(store_id=store.id, name="Main", active=True, version=1)
+    db.add(menu)
+    db.flush()
+    fries = MenuItem(menu_id=menu.id, name="Fries", price=Decimal("3.25"), availability=True)
+    soda = MenuItem(menu_id=menu.id, name="Soda", price=Decimal("1.50"), availability=True)
+    db.add_all([fries, soda])
+    db.flush()
+    order = order_service.create_draft_order(
+        db, payload=OrderCreate(store_id=store.id, user_id=None, channel="voice", notes=None, items=[])
+    )
+    return order, fries, soda
+
+
+def test_totals_follow_inserts_quantity_changes_and_deletes(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "order_totals_verify", True)
+    order, fries, soda = _seed(db_session)
+
+    line = order_service.create_order_item(db_session, order=order, menu_item=fries, quantity=2)
+    order_service.create_order_item(db_session, order=order, menu_item=soda, quantity=1)
+    assert order.total == Decimal("8.00")
+
+    order_service.update_order_item_quantity(db_session, order=order, item=line, quantity=1)
+    assert order.total == Decimal("4.75")
+
+    order_service.delete_order_item(db_session, order=order, item=line)
+    assert order.subtotal == Decimal("1.50")
+    assert order_service.verify_totals(db_session, order=order)
+
+
+def test_verify_totals_corrects_drift(db_session):
+    order, fries, _ = _seed(db_session)
+    order_service.create_order_item(db_session, order=order, menu_item=fries, quantity=1)
+    order.subtotal = Decimal("99.00")
+
+    assert order_service.verify_totals(db_session, order=order) is False
+    assert order.subtotal == Decimal("3.25")
+    assert order.total == Decimal("3.25")
@@ -0,0 +1,23 @@
+from app.voice.sentence_stream import SentenceChunker
+
+
+def _stream(chunker: SentenceChunker, tokens: list[str]) -> list[str]:
+    chunks: list[str] = []
+    for token in tokens:
+        chunks.extend(chunker.feed(token))
+    tail = chunker.flush()
+    return chunks + ([tail] if tail else [])
+
+
+def test_first_chunk_ends_at_a_clause_later_ones_at_sentences():
+    tokens = ["Sure thing", ", I added", " two burgers", " at $8.", "50 each. ", "Anything", " else, ", "or checkout?"]
+    chunks = _stream(SentenceChunker(min_chars=8), tokens)
+
+    assert chunks == ["Sure thing, ", "I added two burgers at $8.50 each. ", "Anything else, or checkout?"]
+    assert "".join(chunks) == "".join(tokens)
+
+
+def test_short_boundaries_wait_for_the_minimum_length():
+    chunks = _stream(SentenceChunker(min_chars=12), ["Ok. ", "Two fries. ", "Anything else?"])
+
+    assert chunks == ["Ok. Two fries. ", "Anything else?"]
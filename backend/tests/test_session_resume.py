@@ -0,0 +1,91 @@
+import asyncio
+import uuid
+
+from app.voice.resume import ParkedSession, SessionRegistry
+
+
+def _parked(store_id, user_id):
+    return ParkedSession(
+        store_id=store_id,
+        user_id=user_id,
+        tool_context=object(),
+        services=object(),
+        llm_context=object(),
+        system_prompt="prompt",
+        allow_interruptions=False,
+    )
+
+
+def test_claim_resumes_only_for_the_same_user_and_store():
+    async def scenario():
+        closed = []
+
+        async def close(context):
+            closed.append(context)
+
+        registry = SessionRegistry(grace_seconds=5, close=close)
+        store_id, user_id = uuid.uuid4(), uuid.uuid4()
+        parked = _parked(store_id, user_id)
+        assert registry.park("token-abcdefghijkl", parked)
+
+        assert await registry.claim("token-abcdefghijkl", store_id=store_id, user_id=uuid.uuid4()) is None
+        assert await registry.claim("token-abcdefghijkl", store_id=store_id, user_id=user_id) is parked
+        assert await registry.claim("token-abcdefghijkl", store_id=store_id, user_id=user_id) is None
+
+        stats = registry.stats()
+        assert stats["resumed"] == 1 and stats["misses"] == 2 and stats["parked"] == 0
+        assert closed == []
+
+    asyncio.run(scenario())
+
+
+def test_unclaimed_session_expires_and_closes():
+    async def scenario():
+        closed = []
+
+        async def close(context):
+            closed.append(context)
+
+        registry = SessionRegistry(grace_seconds=0.05, close=close)
+        parked = _parked(uuid.uuid4(), None)
+        registry.park("token-abcdefghijkl", parked)
+        await asyncio.sleep(0.1)
+        await registry.close()
+
+        assert closed == [parked.tool_context]
+        assert registry.stats()["expired"] == 1
+        assert await registry.claim("token-abcdefghijkl", store_id=parked.store_id, user_id=None) is None
+
+    asyncio.run(scenario())
+
+
+def test_reconnect_supersedes_the_stale_pipeline():
+    async def scenario():
+        async def close(context):
+            pass
+
+        registry = SessionRegistry(grace_seconds=5, close=close)
+        store_id = uuid.uuid4()
+        parked = _parked(store_id, None)
+
+        class _StaleTask:
+            async def cancel(self):
+                # What the old session does once its pipeline ends: park, then stop being active.
+                registry.park("token-abcdefghijkl", parked)
+                registry.deactivate("token-abcdefghijkl", stale)
+
+        stale = _StaleTask()
+        registry.activate("token-abcdefghijkl", stale, store_id=store_id, user_id=None)
+        # Someone else presenting the token can't end the live session.
+        assert await registry.claim("token-abcdefghijkl", store_id=store_id, user_id=uuid.uuid4()) is None
+        assert await registry.claim("token-abcdefghijkl", store_id=store_id, user_id=None) is parked
+
+    asyncio.run(scenario())
+
+
+def test_zero_grace_disables_parking():
+    async def scenario():
+        registry = SessionRegistry(grace_seconds=0)
+        assert not registry.park("token-abcdefghijkl", _parked(uuid.uuid4(), None))
+
+    asyncio.run(scenario())
@@ -0,0 +1,116 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.core.errors import AppError
+from app.voice.supervisor import SessionSupervisor
+
+
+def _supervisor(**overrides):
+    limits = dict(
+        max_sessions=2,
+        max_per_store=2,
+        max_per_user=1,
+        starts_per_minute=6000.0,
+        start_burst=10,
+        queue_seconds=0.0,
+    )
+    limits.update(overrides)
+    return SessionSupervisor(**limits)
+
+
+def test_rejects_past_user_and_global_caps():
+    async def scenario():
+        supervisor = _supervisor()
+        store_id, user_id = uuid.uuid4(), uuid.uuid4()
+        first = await supervisor.admit(store_id=store_id, user_id=user_id, channel="voice")
+        with pytest.raises(AppError) as user_busy:
+            await supervisor.admit(store_id=store_id, user_id=user_id, channel="voice")
+        await supervisor.admit(store_id=uuid.uuid4(), user_id=None, channel="phone")
+        with pytest.raises(AppError) as full:
+            await supervisor.admit(store_id=uuid.uuid4(), user_id=None, channel="phone")
+
+        assert user_busy.value.status_code == 429 and user_busy.value.code == "voice_user_busy"
+        assert full.value.code == "voice_capacity"
+        stats = supervisor.stats()
+        assert stats["active"] == 2 and stats["utilization"] == 1.0
+        assert stats["rejected"] == {"voice_capacity": 1, "voice_user_busy": 1}
+
+        await supervisor.release(first)
+        assert supervisor.stats()["active"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_queued_session_takes_the_released_slot():
+    async def scenario():
+        supervisor = _supervisor(max_sessions=1, queue_seconds=1.0)
+        held = await supervisor.admit(store_id=uuid.uuid4(), user_id=None, channel="voice")
+        waiting = asyncio.create_task(supervisor.admit(store_id=uuid.uuid4(), user_id=None, channel="voice"))
+        await asyncio.sleep(0.01)
+        assert supervisor.stats()["queued"] == 1
+
+        await supervisor.release(held)
+        admitted = await asyncio.wait_for(waiting, timeout=1.0)
+        assert [session.id for session in supervisor.sessions()] == [admitted.id]
+
+    asyncio.run(scenario())
+
+
+def test_drain_refuses_new_sessions_and_cancels_stragglers():
+    class _Task:
+        cancelled = False
+
+        async def cancel(self):
+            self.cancelled = True
+
+    async def scenario():
+        supervisor = _supervisor(max_sessions=0, max_per_user=0)
+        finishing = await supervisor.admit(store_id=uuid.uuid4(), user_id=None, channel="voice")
+        stuck = await supervisor.admit(store_id=uuid.uuid4(), user_id=None, channel="phone")
+        stuck_task = _Task()
+        supervisor.attach(stuck, stuck_task)
+
+        drain = asyncio.create_task(supervisor.drain(deadline_seconds=0.2))
+        await asyncio.sleep(0.01)
+        with pytest.raises(AppError) as refused:
+            await supervisor.admit(store_id=uuid.uuid4(), user_id=None, channel="voice")
+        await supervisor.release(finishing)
+
+        assert refused.value.status_code == 503 and refused.value.code == "voice_draining"
+        assert await drain == 1
+        assert stuck_task.cancelled
+
+    asyncio.run(scenario())
+
+
+def test_zero_start_rate_disables_pacing():
+    async def scenario():
+        supervisor = _supervisor(max_sessions=0, max_per_store=0, max_per_user=0, starts_per_minute=0, start_burst=1)
+        for _ in range(5):
+            await supervisor.admit(store_id=uuid.uuid4(), user_id=None, channel="voice")
+        assert supervisor.stats()["active"] == 5
+
+    asyncio.run(scenario())
+
+
+def test_workers_sharing_a_state_dir_share_the_caps(tmp_path):
+    async def scenario():
+        # Two supervisors stand in for two worker processes on one host.
+        first = _supervisor(max_sessions=2, max_per_store=1, state_dir=str(tmp_path))
+        second = _supervisor(max_sessions=2, max_per_store=1, state_dir=str(tmp_path))
+        store_id = uuid.uuid4()
+        held = await first.admit(store_id=store_id, user_id=None, channel="voice")
+        with pytest.raises(AppError) as store_busy:
+            await second.admit(store_id=store_id, user_id=None, channel="voice")
+        await second.admit(store_id=uuid.uuid4(), user_id=None, channel="voice")
+        with pytest.raises(AppError) as full:
+            await first.admit(store_id=uuid.uuid4(), user_id=None, channel="voice")
+
+        assert store_busy.value.code == "voice_store_busy"
+        assert full.value.code == "voice_capacity"
+        await first.release(held)
+        await second.admit(store_id=store_id, user_id=None, channel="voice")
+
+    asyncio.run(scenario())
@@ -0,0 +1,29 @@
+import time
+from datetime import timedelta
+
+from app.voice.guards import IDLE, MAX_DURATION, PAYLOAD_TOO_LARGE, SessionWatch
+
+
+def test_session_watch_flags_each_limit():
+    watch = SessionWatch(max_seconds=60, max_payload_bytes=1024, idle_seconds=5)
+    assert watch.check() is None
+    watch.start()
+
+    assert watch.audio(640) is None
+    assert watch.audio(4096) == PAYLOAD_TOO_LARGE
+    assert watch.check() is None
+
+    watch.last_audio = time.monotonic() - 6
+    assert watch.check() == IDLE
+
+    watch.audio(640)
+    watch.started_at -= timedelta(seconds=61)
+    assert watch.check() == MAX_DURATION
+
+
+def test_zero_disables_a_limit():
+    watch = SessionWatch(max_seconds=0, max_payload_bytes=0, idle_seconds=0)
+    watch.start()
+    watch.last_audio = time.monotonic() - 3600
+    assert watch.audio(10_000_000) is None
+    assert watch.check() is None
@@ -0,0 +1,51 @@
+import asyncio
+
+from app.voice.tts_cache import TTSPhraseCache
+
+
+def test_key_normalizes_text_but_not_voice_or_rate():
+    key = TTSPhraseCache.key("Order  submitted.", voice="v1", sample_rate=24000)
+    assert key == TTSPhraseCache.key(" order submitted. ", voice="v1", sample_rate=24000)
+    assert key != TTSPhraseCache.key("Order submitted.", voice="v2", sample_rate=24000)
+    assert key != TTSPhraseCache.key("Order submitted.", voice="v1", sample_rate=16000)
+
+
+def test_disk_tier_survives_restart_and_reports_savings(tmp_path):
+    cache = TTSPhraseCache(directory=tmp_path, max_disk_bytes=1024, max_hot_bytes=0)
+    key = TTSPhraseCache.key("Added 2 Margherita Pizza.", voice="v", sample_rate=24000)
+    assert cache.get(key) is None
+
+    cache.put(key, b"\x01\x02" * 100)
+
+    reopened = TTSPhraseCache(directory=tmp_path, max_disk_bytes=1024, max_hot_bytes=0)
+    assert bytes(reopened.get(key)) == b"\x01\x02" * 100
+    stats = reopened.stats()
+    assert stats["disk_hits"] == 1
+    assert stats["bytes_saved"] == 200
+    assert stats["hit_ratio"] == 1.0
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = TTSPhraseCache(directory=tmp_path, max_disk_bytes=250, max_hot_bytes=0)
+    cache.put("a", b"a" * 100)
+    cache.put("b", b"b" * 100)
+    assert cache.get("a") is not None
+
+    cache.put("c", b"c" * 100)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert not (tmp_path / "b.pcm").exists()
+    assert cache.stats()["disk_bytes"] == 200
+
+
+def test_fetch_reads_disk_hits_and_promotes_them(tmp_path):
+    cache = TTSPhraseCache(directory=tmp_path, max_disk_bytes=1024, max_hot_bytes=1024)
+    cache.put("a", b"a" * 100)
+    reopened = TTSPhraseCache(directory=tmp_path, max_disk_bytes=1024, max_hot_bytes=1024)
+
+    assert asyncio.run(reopened.fetch("a")) == b"a" * 100
+    assert asyncio.run(reopened.fetch("a")) == b"a" * 100
+    assert asyncio.run(reopened.fetch("missing")) is None
+    stats = reopened.stats()
+    assert (stats["disk_hits"], stats["hot_hits"], stats["misses"]) == (1, 1, 1)
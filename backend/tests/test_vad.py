@@ -0,0 +1,23 @@
+import threading
+
+from app.voice.vad import SileroStreamState, SileroVADBatcher
+
+
+class _StalledModel:
+    def __init__(self) -> None:
+        self.release = threading.Event()
+
+    def infer(self, streams, audio, sample_rate):
+        self.release.wait(timeout=5)
+        return [0.9 for _ in streams]
+
+
+def test_stalled_batcher_reports_silence_after_the_timeout():
+    model = _StalledModel()
+    batcher = SileroVADBatcher(model, window_seconds=0.001, max_batch=8, timeout_seconds=0.05)
+
+    assert batcher.submit(SileroStreamState(), [0.0], 16000) == 0.0
+    assert batcher.timeouts == 1
+
+    model.release.set()
+    assert batcher.submit(SileroStreamState(), [0.0], 16000) == 0.9
@@ -0,0 +1,38 @@
+import asyncio
+import threading
+
+from app.voice.db_executor import VoiceDBExecutor
+
+
+def test_runs_calls_off_the_event_loop_and_records_timing():
+    executor = VoiceDBExecutor(max_workers=2, slow_call_ms=10_000)
+
+    async def main():
+        loop_thread = threading.get_ident()
+        worker_thread = await executor.run("probe", threading.get_ident)
+        return loop_thread, worker_thread
+
+    loop_thread, worker_thread = asyncio.run(main())
+    executor.shutdown()
+
+    assert worker_thread != loop_thread
+    stats = executor.stats()["probe"]
+    assert stats["calls"] == 1
+    assert stats["errors"] == 0
+
+
+def test_failed_calls_are_counted_and_reraised():
+    executor = VoiceDBExecutor(max_workers=1, slow_call_ms=10_000)
+
+    def boom():
+        raise RuntimeError("db down")
+
+    async def main():
+        try:
+            await executor.run("boom", boom)
+        except RuntimeError as exc:
+            return str(exc)
+
+    assert asyncio.run(main()) == "db down"
+    executor.shutdown()
+    assert executor.stats()["boom"]["errors"] == 1
@@ -0,0 +1,34 @@
+import uuid
+
+from app.core.config import settings
+from app.models.store import Store
+from app.voice.config import store_allows_interruptions
+from app.voice.interruptions import BargeInTracker, InterruptionStats
+
+
+def test_barge_in_records_the_unplayed_reply_audio(monkeypatch):
+    store_id = uuid.uuid4()
+    stats = InterruptionStats()
+    tracker = BargeInTracker(store_id=store_id, stats=stats)
+    clock = iter([100.0, 101.5])
+    monkeypatch.setattr("app.voice.interruptions.time.monotonic", lambda: next(clock))
+
+    tracker.audio_generated(4.0)
+    tracker.bot_started()
+    assert tracker.interrupted() == 2.5
+    assert tracker.interrupted() is None
+
+    report = stats.as_dict()["stores"][str(store_id)]
+    assert report["utterances"] == 1
+    assert report["interruptions"] == 1
+    assert report["interrupted_audio_seconds"] == 2.5
+    assert report["avg_latency_saved_ms"] == 2500.0
+
+
+def test_store_setting_overrides_the_default(monkeypatch):
+    monkeypatch.setattr(settings, "voice_allow_interruptions", False)
+    assert store_allows_interruptions(None) is False
+    assert store_allows_interruptions(Store(name="A", email="a@example.com", password_hash="x")) is False
+    assert store_allows_interruptions(
+        Store(name="B", email="b@example.com", password_hash="x", voice_allow_interruptions=True)
+    ) is True
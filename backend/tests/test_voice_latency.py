@@ -0,0 +1,51 @@
+import uuid
+
+from app.voice.latency import TurnLatencyStats, TurnLatencyTracker, percentile
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_turn_breakdown_and_percentiles_per_store():
+    store_id = uuid.uuid4()
+    stats = TurnLatencyStats(window=100)
+    tracker = TurnLatencyTracker(store_id=store_id, stats=stats)
+    clock = _Clock()
+    tracker._now = clock
+
+    tracker.user_stopped()
+    for clock.now, event in [(0.2, "stt_final"), (0.6, "llm_first_token"), (0.9, "tts_first_audio")]:
+        tracker.mark(event)
+    clock.now = 0.7
+    tracker.user_stopped()  # a late VAD blip once the bot is answering doesn't restart the turn
+    clock.now = 0.95
+    stages = tracker.bot_started()
+
+    assert stages == {
+        "stt": 200.0,
+        "llm_first_token": 400.0,
+        "tts_first_audio": 300.0,
+        "output": 50.0,
+        "total": 950.0,
+    }
+    assert tracker.bot_started() is None
+
+    report = stats.as_dict(store_id)[str(store_id)]
+    assert report["total"] == {"count": 1, "p50_ms": 950.0, "p95_ms": 950.0, "p99_ms": 950.0}
+    assert percentile(sorted(float(i) for i in range(1, 101)), 95) == 95.0
+
+
+def test_metrics_endpoints_require_the_admin_token(store_client, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "voice_admin_token", "s3cret")
+
+    assert store_client.get("/voice/metrics").status_code == 403
+    assert store_client.get("/voice/metrics/latency").status_code == 403
+    assert store_client.get("/voice/metrics/latency", headers={"X-Voice-Admin-Token": "wrong"}).status_code == 403
+    assert store_client.get("/voice/metrics/latency", headers={"X-Voice-Admin-Token": "s3cret"}).status_code == 200
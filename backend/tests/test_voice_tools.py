@@ -0,0 +1,288 @@
+import asyncio
+import json
+import uuid
+from contextlib import contextmanager
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from app.models.menu import Menu
+from app.models.menu_item import MenuItem
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.store import Store
+from app.voice import cart as cart_module
+from app.voice.cart import DraftCartStore, persist_cart
+from app.voice.context_window import ContextWindowProcessor, ContextWindowStats
+from app.voice.tool_results import ToolResultEncoder, ToolResultStats, estimate_tokens
+from app.voice.tool_router import VoiceToolContext
+from app.voice.tools import close_voice_tool_context, create_voice_tool_handlers
+
+
+@pytest.fixture(autouse=True)
+def cart_store(tmp_path, monkeypatch):
+    store = DraftCartStore(journal_dir=tmp_path / "carts", checkpoint_seconds=0)
+    monkeypatch.setattr(cart_module, "_store", store)
+    return store
+
+
+def _seed_store(session_factory, *names: str) -> uuid.UUID:
+    with session_factory() as db:
+        store = Store(name="Kitchen", email=f"{uuid.uuid4()}@example.com", password_hash="x")
+        db.add(store)
+        db.flush()
+        menu = Menu(store_id=store.id, name="Main", active=True, version=1)
+        db.add(menu)
+        db.flush()
+        for name in names or ("Fries",):
+            db.add(MenuItem(menu_id=menu.id, name=name, price=Decimal("3.00"), availability=True))
+        db.commit()
+        return store.id
+
+
+@contextmanager
+def _count_statements(session_factory):
+    engine = session_factory.kw["bind"]
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_cart_is_served_from_memory_and_written_behind(session_factory, cart_store):
+    store_id = _seed_store(session_factory)
+    context = VoiceToolContext(session_factory=session_factory, store_id=store_id, user_id=None)
+    handlers = create_voice_tool_handlers(context)
+
+    result = asyncio.run(handlers["add_item"]({"item_name": "fries", "quantity": 2}))
+
+    assert result["ok"] is True
+    assert result["total_cents"] == 600
+    order_id = context.order_id
+    with session_factory() as db:
+        assert db.get(Order, order_id) is None
+
+    asyncio.run(close_voice_tool_context(context))
+
+    with session_factory() as db:
+        order = db.get(Order, order_id)
+        assert order.subtotal == Decimal("6.00")
+        assert [item.quantity for item in db.query(OrderItem).filter_by(order_id=order.id)] == [2]
+    assert not list((cart_store._journal_dir).glob("*.jsonl"))
+
+
+def test_warm_index_tool_calls_do_not_check_out_a_connection(session_factory, cart_store):
+    store_id = _seed_store(session_factory, "Fries", "Soda")
+    context = VoiceToolContext(session_factory=session_factory, store_id=store_id, user_id=None)
+    handlers = create_voice_tool_handlers(context)
+    asyncio.run(handlers["add_item"]({"item_name": "fries", "quantity": 1}))
+
+    checkouts: list[object] = []
+    engine = session_factory.kw["bind"]
+    listener = lambda *args: checkouts.append(args)  # noqa: E731
+    event.listen(engine, "checkout", listener)
+    try:
+        added = asyncio.run(handlers["add_item"]({"item_name": "soda", "quantity": 2}))
+        updated = asyncio.run(handlers["update_quantities"]({"items": [{"item_name": "fries", "quantity": 3}]}))
+    finally:
+        event.remove(engine, "checkout", listener)
+
+    assert added["ok"] is True and updated["ok"] is True
+    assert checkouts == []
+
+
+def test_journal_is_replayed_after_a_crash(session_factory, cart_store):
+    store_id = _seed_store(session_factory, "Fries", "Soda")
+    context = VoiceToolContext(session_factory=session_factory, store_id=store_id, user_id=None)
+    handlers = create_voice_tool_handlers(context)
+
+    async def conversation():
+        await handlers["add_item"]({"item_name": "fries", "quantity": 1})
+        await handlers["add_item"]({"item_name": "soda", "quantity": 3})
+        await handlers["remove_item"]({"item_name": "fries"})
+
+    asyncio.run(conversation())
+    # Simulate the worker dying: the journal's lock goes away without a write-behind.
+    context.cart.journal.close(delete=False)
+
+    assert cart_store.replay(session_factory) == 1
+    with session_factory() as db:
+        order = db.get(Order, context.order_id)
+        assert order.total == Decimal("9.00")
+        assert [item.quantity for item in db.query(OrderItem).filter_by(order_id=order.id)] == [3]
+
+
+def test_tool_calls_issue_a_constant_number_of_statements(session_factory):
+    names = [f"Item {i}" for i in range(11)]
+    store_id = _seed_store(session_factory, *names)
+
+    async def statements_per_call(cart_size: int) -> dict[str, int]:
+        context = VoiceToolContext(session_factory=session_factory, store_id=store_id, user_id=None)
+        handlers = create_voice_tool_handlers(context)
+        for name in names[:cart_size]:
+            await handlers["add_item"]({"item_name": name, "quantity": 1})
+
+        counts = {}
+        for tool, args in [
+            ("get_summary", {}),
+            ("add_item", {"item_name": names[-1], "quantity": 1}),
+            ("remove_item", {"item_name": names[-1]}),
+            ("checkout", {}),
+        ]:
+            with _count_statements(session_factory) as statements:
+                await handlers[tool](args)
+            counts[tool] = len(statements)
+        return counts
+
+    small = asyncio.run(statements_per_call(1))
+    large = asyncio.run(statements_per_call(10))
+
+    assert small == large
+    assert small["get_summary"] == 0
+
+
+def test_batch_tools_update_many_lines_in_one_call(session_factory, cart_store):
+    store_id = _seed_store(session_factory, "Burger", "Large Fries", "Coke")
+    context = VoiceToolContext(session_factory=session_factory, store_id=store_id, user_id=None)
+    handlers = create_voice_tool_handlers(context)
+
+    async def conversation():
+        added = await handlers["add_items"](
+            {"items": [{"item_name": "burgers", "quantity": 2}, {"item_name": "large fries"}, {"item_name": "sushi"}]}
+        )
+        updated = await handlers["update_quantities"](
+            {"items": [{"item_name": "burger", "quantity": 3}, {"item_name": "large fries", "quantity": 0}]}
+        )
+        return added, updated
+
+    added, updated = asyncio.run(conversation())
+
+    assert added["ok"] is True
+    assert added["not_found"] == ["sushi"]
+    assert added["changed"] == [
+        {"id": "L1", "name": "Burger", "qty": 2, "cents": 600},
+        {"id": "L2", "name": "Large Fries", "qty": 1, "cents": 300},
+    ]
+    assert updated["changed"] == [{"id": "L1", "name": "Burger", "qty": 3, "cents": 900}]
+    assert updated["removed"] == ["L2"]
+    assert updated["total_cents"] == 900
+
+
+def test_compact_results_are_smaller_and_accept_handles(session_factory, cart_store):
+    names = [f"Item {i}" for i in range(8)]
+    store_id = _seed_store(session_factory, *names)
+    context = VoiceToolContext(session_factory=session_factory, store_id=store_id, user_id=None)
+    handlers = create_voice_tool_handlers(context)
+    raw_context = VoiceToolContext(session_factory=session_factory, store_id=store_id, user_id=None)
+    raw_context.results = ToolResultEncoder(enabled=False, stats=ToolResultStats())
+    raw_handlers = create_voice_tool_handlers(raw_context)
+
+    async def conversation(tools):
+        results = [await tools["add_item"]({"item_name": name, "quantity": 1}) for name in names]
+        results.append(await tools["get_summary"]({}))
+        return results
+
+    compact = asyncio.run(conversation(handlers))
+    raw = asyncio.run(conversation(raw_handlers))
+
+    compact_tokens = sum(estimate_tokens(result) for result in compact)
+    raw_tokens = sum(estimate_tokens(result) for result in raw)
+    assert compact_tokens * 3 < raw_tokens
+
+    removed = asyncio.run(handlers["remove_item"]({"order_item_id": "l3"}))
+    assert removed["removed"] == ["L3"]
+
+    more = asyncio.run(handlers["add_item"]({"menu_item_id": "L1", "quantity": 2}))
+    assert [line["name"] for line in more["changed"]] == ["Item 0"]
+
+
+def test_prompt_tokens_per_turn_are_reported_with_and_without_compaction(session_factory, cart_store):
+    class _Context:
+        def __init__(self) -> None:
+            self.messages = [{"role": "system", "content": "x"}]
+
+        def get_messages(self):
+            return self.messages
+
+        def set_messages(self, messages):
+            self.messages = messages
+
+    store_id = _seed_store(session_factory, *[f"Item {i}" for i in range(6)])
+    context = VoiceToolContext(session_factory=session_factory, store_id=store_id, user_id=None)
+    handlers = create_voice_tool_handlers(context)
+    stats = ContextWindowStats()
+    window = ContextWindowProcessor(
+        system_prompt="You take orders.", tool_context=context, max_tokens=10_000, min_recent_messages=4, stats=stats
+    )
+    llm_context = _Context()
+    for i in range(6):
+        result = asyncio.run(handlers["add_item"]({"item_name": f"Item {i}", "quantity": 1}))
+        llm_context.messages.append({"role": "tool", "tool_call_id": f"c{i}", "content": json.dumps(result)})
+        window.manage(llm_context)
+
+    report = stats.as_dict()
+    assert report["turns"] == 6
+    assert report["avg_uncompacted_prompt_tokens"] > report["avg_prompt_tokens"]
+    assert report["compaction_saved_ratio"] > 0
+
+
+def test_malformed_quantities_are_rejected_not_raised(session_factory, cart_store):
+    store_id = _seed_store(session_factory, "Fries")
+    context = VoiceToolContext(session_factory=session_factory, store_id=store_id, user_id=None)
+    handlers = create_voice_tool_handlers(context)
+
+    async def conversation():
+        return [
+            await handlers["add_item"]({"item_name": "fries", "quantity": "two"}),
+            await handlers["add_item"]({"item_name": "fries", "quantity": None}),
+            await handlers["add_items"]({"items": [{"item_name": "fries", "quantity": 1.5}]}),
+            await handlers["add_item"]({"item_name": "fries", "quantity": "2"}),
+            await handlers["update_quantities"]({"items": [{"order_item_id": "L1"}]}),
+            await handlers["update_quantities"]({"items": [{"order_item_id": "L1", "quantity": "lots"}]}),
+        ]
+
+    bad_string, null, fraction, numeric_string, missing, bad_update = asyncio.run(conversation())
+
+    assert [r["ok"] for r in (bad_string, null, fraction, missing, bad_update)] == [False] * 5
+    assert numeric_string["ok"] is True
+    assert numeric_string["changed"][0]["qty"] == 2
+
+
+def test_failed_checkout_leaves_the_order_editable(session_factory, cart_store, monkeypatch):
+    store_id = _seed_store(session_factory, "Fries")
+    context = VoiceToolContext(session_factory=session_factory, store_id=store_id, user_id=None)
+    handlers = create_voice_tool_handlers(context)
+    asyncio.run(handlers["add_item"]({"item_name": "fries", "quantity": 1}))
+
+    def failing_write(cart, factory):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(cart_store, "write_behind", failing_write)
+    failed = asyncio.run(handlers["checkout"]({}))
+    assert failed["ok"] is False
+    assert context.cart.status == "draft"
+
+    monkeypatch.undo()
+    assert asyncio.run(handlers["checkout"]({}))["ok"] is True
+
+
+def test_order_held_by_another_session_is_a_tool_error(session_factory, cart_store):
+    store_id = _seed_store(session_factory, "Fries")
+    first = VoiceToolContext(session_factory=session_factory, store_id=store_id, user_id=None)
+    asyncio.run(create_voice_tool_handlers(first)["add_item"]({"item_name": "fries", "quantity": 1}))
+    with session_factory() as db:
+        persist_cart(db, first.cart)
+        db.commit()
+
+    second = VoiceToolContext(session_factory=session_factory, store_id=store_id, user_id=None, order_id=first.order_id)
+    result = asyncio.run(create_voice_tool_handlers(second)["get_summary"]({}))
+
+    assert result["ok"] is False
+    assert second.cart is None
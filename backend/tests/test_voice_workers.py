@@ -0,0 +1,39 @@
+import uuid
+
+from app.voice.workers import VoiceWorkerPool, shard_for
+
+
+class _Process:
+    def __init__(self, returncode):
+        self.returncode = returncode
+        self.pid = 1
+
+
+def test_shard_for_is_stable_and_in_range():
+    store_id = uuid.uuid4()
+    assert shard_for(store_id, 4) == shard_for(str(store_id), 4)
+    assert all(0 <= shard_for(uuid.uuid4(), 3) < 3 for _ in range(50))
+
+
+def test_shard_skips_dead_workers(tmp_path):
+    pool = VoiceWorkerPool(size=3, socket_dir=str(tmp_path), shard_by="store")
+    store_id = uuid.uuid4()
+    home = pool.shard(store_id=store_id)
+    for worker in pool._workers:
+        worker.process = _Process(None)
+
+    assert pool.shard(store_id=store_id) is home
+    home.process = _Process(1)
+    fallback = pool.shard(store_id=store_id)
+    assert fallback is not home
+    assert fallback.alive
+    assert fallback.index == (home.index + 1) % 3
+
+
+def test_session_sharding_keeps_an_order_on_one_worker(tmp_path):
+    pool = VoiceWorkerPool(size=4, socket_dir=str(tmp_path), shard_by="session")
+    for worker in pool._workers:
+        worker.process = _Process(None)
+    order_id = uuid.uuid4()
+
+    assert pool.shard(store_id=uuid.uuid4(), order_id=order_id) is pool.shard(store_id=uuid.uuid4(), order_id=order_id)